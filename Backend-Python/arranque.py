@@ -0,0 +1,77 @@
+"""
+Arranque del servicio y estado para /health/ready.
+
+Al arrancar se verifica el esquema (init_db: una consulta si la versión
+registrada coincide) y luego, en segundo plano, se abren las conexiones del pool
+(DB_POOL_WARM). El servicio se informa listo cuando las dos etapas terminaron y
+la BD responde; hasta entonces /health/ready responde 503 para que el balanceador
+no le envíe tráfico.
+"""
+import asyncio
+import logging
+import time
+from typing import Dict, Optional
+
+from sqlalchemy import text
+from starlette.concurrency import run_in_threadpool
+
+from database import DB_ASYNC, calentar_pool, calentar_pool_async, engine, init_db
+from particiones import particionada
+
+logger = logging.getLogger(__name__)
+
+_inicio = time.perf_counter()
+_estado: Dict[str, Optional[float]] = {
+    # Segundos desde la importación del módulo hasta el fin de cada etapa
+    "esquema": None,
+    "pool": None,
+}
+_error: Optional[str] = None
+_tarea: Optional[asyncio.Task] = None
+
+
+async def _calentar():
+    global _error
+    try:
+        if DB_ASYNC:
+            await calentar_pool_async()
+        # Las cargas y los streams usan siempre el engine síncrono
+        await run_in_threadpool(calentar_pool)
+        _estado["pool"] = time.perf_counter() - _inicio
+    except Exception as e:
+        _error = f"No se pudo calentar el pool: {e}"
+        logger.error(_error)
+
+
+async def preparar():
+    """Verifica el esquema y lanza el calentamiento del pool en segundo plano."""
+    global _tarea
+    creado = await run_in_threadpool(init_db)
+    _estado["esquema"] = time.perf_counter() - _inicio
+    logger.info("Esquema %s (%.2fs desde el arranque)", "creado o actualizado" if creado else "al día", _estado["esquema"])
+    # La búsqueda rutea por partición sin consultar el catálogo en cada request
+    if await run_in_threadpool(particionada):
+        logger.info("Tabla voluntarios particionada por región")
+    _tarea = asyncio.create_task(_calentar())
+
+
+def _ping():
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+
+async def estado_listo() -> Dict:
+    """Estado de arranque; listo es True con el esquema verificado, el pool caliente y la BD respondiendo."""
+    listo = all(v is not None for v in _estado.values())
+    error = _error
+    if listo:
+        try:
+            await run_in_threadpool(_ping)
+        except Exception as e:
+            listo, error = False, f"BD no disponible: {e}"
+    return {
+        "listo": listo,
+        "esquema_s": round(_estado["esquema"], 3) if _estado["esquema"] is not None else None,
+        "pool_s": round(_estado["pool"], 3) if _estado["pool"] is not None else None,
+        "error": error,
+    }
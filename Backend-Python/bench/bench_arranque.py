@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark del arranque en frío del servicio.
+
+Cada medición corre en un intérprete nuevo (como un worker recién creado) y mide:
+- import: import main (rutas, modelos, scoring por registro)
+- listo: desde el inicio del proceso hasta que /health/ready responde 200
+  (import + startup: verificación de esquema + pool caliente)
+- primera_carga: el import diferido del stack de carga (data_loader,
+  carga_multiple) que paga el primer upload
+
+con DB_SCHEMA_CHECK=siempre (create_all en cada arranque, el comportamiento
+anterior) y DB_SCHEMA_CHECK=version (una consulta si el esquema está al día).
+"ansioso" importa además el stack de carga junto con main, como antes.
+
+Usa una SQLite temporal, o la base de DATABASE_URL si se indica --database-url
+(en PostgreSQL la diferencia de create_all es mayor: revisa cada tabla e índice).
+
+Uso:
+    python bench/bench_arranque.py
+    python bench/bench_arranque.py --repeticiones 10 --database-url postgresql://.../teleton_bench
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_MEDICION = r"""
+import json, sys, time, warnings
+inicio = time.perf_counter()
+warnings.filterwarnings("ignore")
+sys.path.insert(0, {backend!r})
+import main
+if {ansioso}:
+    import carga_multiple, data_loader
+importado = time.perf_counter()
+
+from fastapi.testclient import TestClient
+with TestClient(main.app) as client:
+    while client.get("/health/ready").status_code != 200:
+        time.sleep(0.005)
+    listo = time.perf_counter()
+
+antes = time.perf_counter()
+import carga_multiple, data_loader
+primera_carga = time.perf_counter() - antes
+
+print(json.dumps({{
+    "import": importado - inicio,
+    "listo": listo - inicio,
+    "primera_carga": primera_carga,
+}}))
+"""
+
+
+def medir(database_url: str, schema_check: str, ansioso: bool) -> dict:
+    env = dict(os.environ, DATABASE_URL=database_url, DB_SCHEMA_CHECK=schema_check)
+    codigo = _MEDICION.format(backend=BACKEND, ansioso=ansioso)
+    salida = subprocess.run([sys.executable, "-c", codigo], env=env, cwd=BACKEND, capture_output=True, text=True, check=True)
+    return json.loads(salida.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--database-url", default=None)
+    args = parser.parse_args()
+
+    database_url = args.database_url or f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='bench_arranque_'), 'bench.db')}"
+    # Primer arranque: crea el esquema y registra su versión
+    medir(database_url, "siempre", False)
+
+    variantes = [
+        ("ansioso + siempre", "siempre", True),
+        ("diferido + siempre", "siempre", False),
+        ("diferido + version", "version", False),
+    ]
+    print(f"Mediana de {args.repeticiones} arranques en frío (segundos)")
+    print(f"  {'variante':<22} {'import':>8} {'listo':>8} {'1a carga':>9}")
+    for nombre, schema_check, ansioso in variantes:
+        tiempos = [medir(database_url, schema_check, ansioso) for _ in range(args.repeticiones)]
+        mediana = {k: statistics.median(t[k] for t in tiempos) for k in ["import", "listo", "primera_carga"]}
+        print(f"  {nombre:<22} {mediana['import']:8.3f} {mediana['listo']:8.3f} {mediana['primera_carga']:9.3f}")
+
+
+if __name__ == "__main__":
+    main()
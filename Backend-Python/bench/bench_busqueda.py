@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la búsqueda por texto (busqueda.py) en PostgreSQL: latencia de
+/api/voluntarios/search (misma consulta) con el backend ilike y con el backend trgm.
+
+Que los filtros del backend trgm usen los índices GIN pg_trgm de schema.sql y no
+distingan acentos se verifica en tests/test_busqueda.py.
+
+Requiere una base PostgreSQL de pruebas con schema.sql aplicado:
+    DATABASE_URL=postgresql://.../teleton_bench python bench/bench_busqueda.py --rows 1000000
+
+Con --rows inserta filas sintéticas ('bench N') hasta llegar a esa cantidad.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import text  # noqa: E402
+
+import busqueda  # noqa: E402
+from database import SessionLocal, Voluntario, engine  # noqa: E402
+from models import VoluntarioSearch  # noqa: E402
+
+# (filtro, término sin acentos, valor con acentos que debe encontrar)
+CASOS = [
+    ("region", "valparaiso", "Valparaíso"),
+    ("area_estudio", "psicologia", "Psicología"),
+    ("programa_asignado", "programa 37", "Programa 37"),
+]
+
+POBLAR_SQL = """
+INSERT INTO voluntarios (
+    nombre, edad, rango_etario, region, area_estudio, estado, tiene_capacitacion,
+    programa_asignado, fecha_rechazo_count, score_riesgo_baja, flag_brecha_cap
+)
+SELECT
+    'bench ' || i,
+    18 + (i % 60),
+    NULL,
+    (ARRAY['Metropolitana', 'Valparaíso', 'Biobío', 'Maule', 'Araucanía', 'Los Lagos',
+           'Ñuble', 'Los Ríos', 'Aysén', 'Tarapacá', 'Atacama', 'Coquimbo', 'Antofagasta',
+           'Magallanes', 'Arica y Parinacota', 'O''Higgins'])[1 + (i % 16)],
+    (ARRAY['Salud', 'Educación', 'Ingeniería', 'Psicología', 'Derecho', 'Administración',
+           'Ciencias Sociales', 'Kinesiología'])[1 + (i / 7 % 8)],
+    (ARRAY['Activo', 'Receso', 'Sin Asignación', 'Inactivo'])[1 + (i / 3 % 4)],
+    i % 2 = 0,
+    'Programa ' || (i % 500),
+    i % 4,
+    (i * 37) % 101,
+    FALSE
+FROM generate_series(:desde, :hasta) AS i
+ON CONFLICT (nombre, region) DO NOTHING
+"""
+
+
+def poblar(rows: int):
+    with engine.begin() as conn:
+        actuales = conn.execute(text("SELECT count(*) FROM voluntarios")).scalar()
+        if actuales >= rows:
+            return
+        print(f"Insertando {rows - actuales} filas sintéticas...")
+        ultimo = conn.execute(text("SELECT count(*) FROM voluntarios WHERE nombre LIKE 'bench %'")).scalar()
+        conn.execute(text(POBLAR_SQL), {"desde": ultimo + 1, "hasta": ultimo + rows - actuales})
+        conn.execute(text("ANALYZE voluntarios"))
+
+
+def medir(repeticiones: int):
+    db = SessionLocal()
+    try:
+        for backend in ["ilike", "trgm"]:
+            busqueda.SEARCH_BACKEND = backend
+            for columna, termino, _ in CASOS:
+                query = busqueda.aplicar_filtros(db.query(Voluntario), VoluntarioSearch(**{columna: termino}))
+                query = query.order_by(Voluntario.id).limit(1000)
+                tiempos = []
+                for _ in range(repeticiones):
+                    inicio = time.perf_counter()
+                    query.all()
+                    tiempos.append((time.perf_counter() - inicio) * 1000)
+                    db.expunge_all()
+                p95 = sorted(tiempos)[int(len(tiempos) * 0.95) - 1]
+                print(f"{backend:5s} {columna:17s} p50 {statistics.median(tiempos):8.1f} ms  p95 {p95:8.1f} ms")
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=None)
+    parser.add_argument("--repeticiones", type=int, default=20)
+    args = parser.parse_args()
+
+    if engine.dialect.name != "postgresql":
+        print("❌ Este benchmark requiere PostgreSQL (DATABASE_URL)")
+        sys.exit(1)
+
+    if args.rows:
+        poblar(args.rows)
+    medir(args.repeticiones)
+
+
+if __name__ == "__main__":
+    main()
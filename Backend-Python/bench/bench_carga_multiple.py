@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la carga de un ZIP con varios archivos (carga_multiple.py):
+lectura y limpieza en serie (UPLOAD_PROCESOS=1) contra el pool de procesos.
+
+Genera un ZIP con --archivos CSV/XLSX sintéticos de --rows filas cada uno y un
+libro con una hoja por archivo (la primera sin la columna estado, que se completa
+con el default), y carga cada uno sobre una base SQLite temporal.
+La mejora depende de los núcleos disponibles: con un solo núcleo ambas variantes
+tardan lo mismo.
+
+Uso:
+    python bench/bench_carga_multiple.py
+    python bench/bench_carga_multiple.py --archivos 16 --rows 20000 --procesos 8
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import zipfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+_tmp_dir = tempfile.mkdtemp(prefix="bench_carga_multiple_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp_dir, 'bench.db')}"
+
+import pandas as pd  # noqa: E402
+
+import carga_multiple  # noqa: E402
+from database import Base, SessionLocal, engine  # noqa: E402
+from generador import COLUMNAS, encabezados, generar_archivo, generar_filas  # noqa: E402
+
+
+def generar_zip(path: str, archivos: int, rows: int) -> str:
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for i in range(archivos):
+            ext = ".xlsx" if i % 4 == 3 else ".csv"
+            archivo = os.path.join(_tmp_dir, f"region_{i}{ext}")
+            generar_archivo(archivo, rows, seed=i)
+            zf.write(archivo, f"coordinacion/region_{i}{ext}")
+            os.unlink(archivo)
+    return path
+
+
+def generar_libro(path: str, hojas: int, rows: int) -> str:
+    import random
+
+    with pd.ExcelWriter(path, engine="openpyxl") as writer:
+        for i in range(hojas):
+            cabecera = encabezados(random.Random(i))
+            df = pd.DataFrame(generar_filas(rows, seed=i), columns=cabecera)
+            if i == 0:
+                df = df.drop(columns=cabecera[COLUMNAS.index("estado")])
+            df.to_excel(writer, sheet_name=f"Region {i}", index=False)
+    return path
+
+
+def cargar(path: str, procesos: int):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    carga_multiple.UPLOAD_PROCESOS = procesos
+    db = SessionLocal()
+    try:
+        inicio = time.perf_counter()
+        procesados, insertados, actualizados, errores, reporte = carga_multiple.upload_multiple(path, db)
+        segundos = time.perf_counter() - inicio
+    finally:
+        db.close()
+    assert not errores, errores
+    duplicadas = sum(r["duplicadas"] for r in reporte)
+    print(
+        f"  {procesos:>2} procesos  {segundos:7.2f}s  {procesados / segundos:9.0f} filas/s  "
+        f"({len(reporte)} fuentes, {insertados} insertados, {duplicadas} duplicadas entre fuentes)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--archivos", type=int, default=8)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--procesos", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    print(f"Generando {args.archivos} archivos de {args.rows} filas en {_tmp_dir}...")
+    zip_path = generar_zip(os.path.join(_tmp_dir, "coordinacion.zip"), args.archivos, args.rows)
+    libro_path = generar_libro(os.path.join(_tmp_dir, "regiones.xlsx"), args.archivos, args.rows)
+
+    for nombre, path in (("ZIP", zip_path), ("Libro con varias hojas", libro_path)):
+        print(nombre)
+        cargar(path, 1)
+        if args.procesos > 1:
+            cargar(path, args.procesos)
+
+    # Cierra el pool antes de salir
+    if carga_multiple._pool is not None:
+        carga_multiple._pool.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Prueba de carga: throughput de la API con requests concurrentes.
+
+Lanza --requests GET contra un servidor en ejecución con --concurrencia clientes
+simultáneos, repartidos entre búsqueda, listado, detalle y RPA. Para comparar
+modos se levanta el servidor con cada configuración y se repite la medición:
+
+    DB_ASYNC=false CACHE_TTL_SECONDS=0 uvicorn main:app --port 8000
+    python bench/bench_concurrencia.py --url http://localhost:8000
+
+    DB_ASYNC=true CACHE_TTL_SECONDS=0 uvicorn main:app --port 8000
+    python bench/bench_concurrencia.py --url http://localhost:8000
+
+CACHE_TTL_SECONDS=0 desactiva el cache para medir el acceso a la BD.
+"""
+import argparse
+import http.client
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+RUTAS = [
+    "/api/voluntarios/search?region=metropolitana&limit=100",
+    "/api/voluntarios/search?min_score_riesgo=75&brecha_pendiente=true&limit=100",
+    "/api/voluntarios/?limit=100",
+    "/api/voluntarios/1",
+    "/api/rpa/accion_urgente",
+]
+
+_local = threading.local()
+
+
+def _request(url, ruta: str):
+    conexion = getattr(_local, "conexion", None)
+    if conexion is None:
+        conexion = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=60)
+        _local.conexion = conexion
+    inicio = time.perf_counter()
+    conexion.request("GET", ruta)
+    respuesta = conexion.getresponse()
+    respuesta.read()
+    return respuesta.status, time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrencia", type=int, default=50)
+    args = parser.parse_args()
+
+    url = urlparse(args.url)
+    rutas = [RUTAS[i % len(RUTAS)] for i in range(args.requests)]
+
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrencia) as executor:
+        resultados = list(executor.map(lambda ruta: _request(url, ruta), rutas))
+    total = time.perf_counter() - inicio
+
+    latencias = sorted(r[1] * 1000 for r in resultados)
+    errores = sum(1 for status, _ in resultados if status >= 500)
+    print(f"{args.requests} requests, concurrencia {args.concurrencia}: {total:.2f}s")
+    print(f"  throughput {args.requests / total:8.1f} req/s")
+    print(f"  latencia p50 {statistics.median(latencias):8.1f} ms  p95 {latencias[int(len(latencias) * 0.95) - 1]:8.1f} ms")
+    print(f"  errores 5xx {errores}")
+
+
+if __name__ == "__main__":
+    main()
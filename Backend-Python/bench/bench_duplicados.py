@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la detección de casi duplicados (duplicados.py).
+
+Genera voluntarios sintéticos repartidos por región e inyecta variantes de una
+fracción de ellos (sin acentos, mayúsculas, espacios de más, una letra
+cambiada). Compara el índice MinHash/LSH contra la comparación de todos contra
+todos dentro de cada región: tiempo y proporción de los pares de la fuerza
+bruta que encuentra el índice (recall). La fuerza bruta solo se corre hasta
+--max-fuerza-bruta filas.
+
+Uso:
+    python bench/bench_duplicados.py
+    python bench/bench_duplicados.py --sizes 1000 5000 100000 --max-fuerza-bruta 5000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import unicodedata
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from generador import APELLIDOS, NOMBRES, REGIONES, _elegir  # noqa: E402
+from duplicados import DUPLICADOS_UMBRAL, IndiceDuplicados, jaccard, normalizar_texto, trigramas  # noqa: E402
+
+PROPORCION_VARIANTES = 0.05
+
+
+def _sin_acentos(texto: str) -> str:
+    return "".join(c for c in unicodedata.normalize("NFKD", texto) if not unicodedata.combining(c))
+
+
+def _variante(rnd: random.Random, nombre: str) -> str:
+    tipo = rnd.randrange(4)
+    if tipo == 0:
+        return _sin_acentos(nombre)
+    if tipo == 1:
+        return nombre.upper() + " "
+    if tipo == 2:
+        return "  ".join(nombre.split())
+    i = rnd.randrange(len(nombre))
+    return nombre[:i] + rnd.choice("aeiourslnz") + nombre[i + 1:]
+
+
+def generar(n: int, seed: int):
+    rnd = random.Random(seed)
+    regiones = _elegir(rnd, REGIONES, n)
+    filas = []
+    for i in range(n):
+        if i and rnd.random() < PROPORCION_VARIANTES:
+            nombre, region = filas[rnd.randrange(i)]
+            filas.append((_variante(rnd, nombre), region))
+        else:
+            nombre = f"{rnd.choice(NOMBRES)} {rnd.choice(NOMBRES)} {rnd.choice(APELLIDOS)} {rnd.choice(APELLIDOS)}"
+            filas.append((nombre, regiones[i]))
+    return filas
+
+
+def fuerza_bruta(filas, umbral: float):
+    por_region = {}
+    for i, (nombre, region) in enumerate(filas):
+        por_region.setdefault(normalizar_texto(region), []).append((i, normalizar_texto(nombre)))
+    pares = set()
+    for bloque in por_region.values():
+        gramas = [(i, clave, trigramas(clave)) for i, clave in bloque]
+        for x in range(len(gramas)):
+            for y in range(x + 1, len(gramas)):
+                (i, ci, gi), (j, cj, gj) = gramas[x], gramas[y]
+                if ci == cj or jaccard(gi, gj) >= umbral:
+                    pares.add((i, j))
+    return pares
+
+
+def lsh(filas, umbral: float):
+    indice = IndiceDuplicados(umbral)
+    indice.agregar_lote((nombre, region, i) for i, (nombre, region) in enumerate(filas))
+    return {(par.a.id, par.b.id) for par in indice.pares()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 50000])
+    parser.add_argument("--max-fuerza-bruta", type=int, default=5000)
+    parser.add_argument("--umbral", type=float, default=DUPLICADOS_UMBRAL)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    for n in args.sizes:
+        filas = generar(n, args.seed)
+
+        inicio = time.perf_counter()
+        encontrados = lsh(filas, args.umbral)
+        segundos_lsh = time.perf_counter() - inicio
+        linea = f"{n:>8} filas  LSH {segundos_lsh:7.2f}s  {len(encontrados):>6} pares"
+
+        if n <= args.max_fuerza_bruta:
+            inicio = time.perf_counter()
+            esperados = fuerza_bruta(filas, args.umbral)
+            segundos_bruta = time.perf_counter() - inicio
+            recall = len(encontrados & esperados) / len(esperados) if esperados else 1.0
+            linea += (
+                f"  |  fuerza bruta {segundos_bruta:7.2f}s  {len(esperados):>6} pares"
+                f"  (x{segundos_bruta / segundos_lsh:5.1f}, recall {recall:.3f})"
+            )
+        print(linea)
+
+
+if __name__ == "__main__":
+    main()
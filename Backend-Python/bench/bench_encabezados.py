@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la resolución de encabezados (encabezados.py) contra el
+normalize_column_name original, que recorría COLUMN_MAPPING y armaba la lista de
+variantes en minúsculas por cada columna.
+
+Usa encabezados desordenados del generador sintético. Mide el resolvedor sin
+cache (primera carga de una plantilla) y con cache (cargas repetidas de la
+misma plantilla), e informa cuántos encabezados quedan sin resolver en cada caso.
+
+Uso:
+    python bench/bench_encabezados.py
+    python bench/bench_encabezados.py --plantillas 200 --repeticiones 50
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from generador import COLUMNAS, encabezados  # noqa: E402
+from encabezados import COLUMN_MAPPING, resolver_encabezados  # noqa: E402
+
+# Variantes que el mapeo original no reconoce
+EXTRAS = {
+    "area_estudio": ["Área de Estudio", "AREA-ESTUDIO"],
+    "region": ["REGIÓN ", "Región"],
+    "programa_asignado": ["Programa Asignado.", "programa  asignado"],
+    "razon_no_continuar": ["Razón", "RAZÓN"],
+}
+
+
+def normalize_column_name_original(col_name: str) -> str:
+    col_lower = str(col_name).strip().lower().replace(" ", "_")
+    for standard_name, variants in COLUMN_MAPPING.items():
+        if col_lower in [v.lower() for v in variants]:
+            return standard_name
+    return col_lower
+
+
+def generar_plantillas(n: int, seed: int):
+    rnd = random.Random(seed)
+    plantillas = []
+    for _ in range(n):
+        plantilla = encabezados(rnd)
+        for i, columna in enumerate(COLUMNAS):
+            if columna in EXTRAS and rnd.random() < 0.5:
+                plantilla[i] = rnd.choice(EXTRAS[columna])
+        plantillas.append(tuple(plantilla))
+    return plantillas
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--plantillas", type=int, default=100)
+    parser.add_argument("--repeticiones", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    plantillas = generar_plantillas(args.plantillas, args.seed)
+    cargas = plantillas * args.repeticiones
+
+    inicio = time.perf_counter()
+    sin_resolver_original = 0
+    for plantilla in cargas:
+        resultado = [normalize_column_name_original(c) for c in plantilla]
+        sin_resolver_original += sum(r not in COLUMN_MAPPING for r in resultado)
+    original = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    sin_resolver = 0
+    for plantilla in plantillas:
+        resolver_encabezados.cache_clear()
+        sin_resolver += sum(r.metodo == "sin_mapeo" for r in resolver_encabezados(plantilla))
+    sin_cache = (time.perf_counter() - inicio) / len(plantillas)
+
+    resolver_encabezados.cache_clear()
+    inicio = time.perf_counter()
+    for plantilla in cargas:
+        resolver_encabezados(plantilla)
+    con_cache = time.perf_counter() - inicio
+
+    columnas = len(plantillas) * len(COLUMNAS)
+    print(f"{len(cargas)} cargas de {len(plantillas)} plantillas ({len(COLUMNAS)} columnas)")
+    print(f"  original        {original / len(cargas) * 1e6:8.1f} µs/carga  "
+          f"sin resolver {sin_resolver_original / args.repeticiones:.0f}/{columnas}")
+    print(f"  sin cache       {sin_cache * 1e6:8.1f} µs/carga  sin resolver {sin_resolver}/{columnas}")
+    print(f"  con cache       {con_cache / len(cargas) * 1e6:8.1f} µs/carga  (x{original / con_cache:.1f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Benchmark de los snapshots columnares (columnar.py).
+
+Exportación: descarga la tabla completa de --rows filas con TestClient como
+- json: paginando /api/voluntarios/ con after_id de a 1000
+- ndjson: /api/voluntarios/?formato=ndjson en streaming
+- parquet: /api/voluntarios/export.parquet en streaming
+e informa tiempo y bytes transferidos.
+
+Carga: lee y limpia (load_file + map_columns + clean_data) el mismo snapshot
+como CSV, Parquet y Arrow IPC y compara los tiempos. Verifica que los tipos de
+edad, tiene_capacitacion y fecha_rechazo_count lleguen intactos desde Parquet.
+
+Uso:
+    python bench/bench_parquet.py
+    python bench/bench_parquet.py --rows 100000 --repeticiones 3
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+_tmp_dir = tempfile.mkdtemp(prefix="bench_parquet_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp_dir, 'bench.db')}"
+
+warnings.filterwarnings("ignore")
+
+import pyarrow as pa  # noqa: E402
+import pyarrow.parquet as pq  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from data_loader import clean_data, load_file, map_columns, upload_data  # noqa: E402
+from database import Base, SessionLocal, engine  # noqa: E402
+from generador import generar_archivo  # noqa: E402
+from main import app  # noqa: E402
+
+
+def poblar(rows: int):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    path = generar_archivo(os.path.join(_tmp_dir, "voluntarios.csv"), int(rows * 1.05) + 10, headers_limpios=True)
+    db = SessionLocal()
+    try:
+        upload_data(path, db=db, bulk=True)
+    finally:
+        db.close()
+
+
+def exportar_json(client: TestClient) -> int:
+    total, cursor = 0, None
+    while True:
+        params = {"limit": 1000}
+        if cursor is not None:
+            params["after_id"] = cursor
+        respuesta = client.get("/api/voluntarios/", params=params)
+        total += len(respuesta.content)
+        cursor = respuesta.headers.get("X-Next-Cursor")
+        if not cursor:
+            return total
+
+
+def exportar_ndjson(client: TestClient) -> int:
+    return len(client.get("/api/voluntarios/", params={"formato": "ndjson"}).content)
+
+
+def exportar_parquet(client: TestClient) -> int:
+    contenido = client.get("/api/voluntarios/export.parquet").content
+    with open(os.path.join(_tmp_dir, "snapshot.parquet"), "wb") as f:
+        f.write(contenido)
+    return len(contenido)
+
+
+def medir(funcion, repeticiones: int):
+    tiempos, resultado = [], None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos), resultado
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    args = parser.parse_args()
+
+    poblar(args.rows)
+    client = TestClient(app)
+
+    print(f"Exportación de la tabla completa, mediana de {args.repeticiones}")
+    for nombre, funcion in [("json", exportar_json), ("ndjson", exportar_ndjson), ("parquet", exportar_parquet)]:
+        segundos, bytes_ = medir(lambda: funcion(client), args.repeticiones)
+        print(f"  {nombre:<8} {segundos * 1000:8.0f} ms  {bytes_ / 1e6:7.2f} MB")
+
+    # Mismo snapshot en los tres formatos de carga
+    tabla = pq.read_table(os.path.join(_tmp_dir, "snapshot.parquet"))
+    rutas = {
+        "csv": os.path.join(_tmp_dir, "snapshot.csv"),
+        "parquet": os.path.join(_tmp_dir, "snapshot.parquet"),
+        "arrow": os.path.join(_tmp_dir, "snapshot.arrow"),
+    }
+    tabla.to_pandas().to_csv(rutas["csv"], index=False)
+    with pa.OSFile(rutas["arrow"], "wb") as salida:
+        with pa.ipc.new_file(salida, tabla.schema) as writer:
+            writer.write_table(tabla)
+
+    df = clean_data(map_columns(load_file(rutas["parquet"])))
+    tipos = {c: str(df[c].dtype) for c in ["edad", "tiene_capacitacion", "fecha_rechazo_count"]}
+    assert tipos == {"edad": "int64", "tiene_capacitacion": "bool", "fecha_rechazo_count": "int64"}, tipos
+
+    print(f"\nLectura y limpieza de {tabla.num_rows} filas, mediana de {args.repeticiones}")
+    base = None
+    for nombre, ruta in rutas.items():
+        segundos, df = medir(lambda: clean_data(map_columns(load_file(ruta))), args.repeticiones)
+        base = base or segundos
+        print(f"  {nombre:<8} {segundos * 1000:8.0f} ms  (x{base / segundos:4.1f})  {os.path.getsize(ruta) / 1e6:7.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Benchmark del particionamiento por región (particiones.py) en PostgreSQL.
+
+Arma dos copias de voluntarios con las mismas --rows filas sintéticas (regiones
+con el peso de generador.REGIONES, Metropolitana ~40%) en dos schemas de la base
+de pruebas:
+- bench_plana: la tabla sin particionar, con los índices de schema.sql
+- bench_particionada: la misma tabla convertida con particionar.py
+
+y compara las consultas de la API con las dos (mediana de --repeticiones, caché
+de la BD caliente), con la cantidad de particiones que recorre cada plan:
+- búsqueda por región (término parcial ruteado a region IN (...)), con y sin más filtros
+- RPA de una región
+- agregado de una región (conteo y score promedio)
+- búsqueda sin región y lectura por id sin región (lo que el particionamiento
+  no ayuda: la segunda revisa el índice de cada partición)
+Al final mide REINDEX y ANALYZE de una región chica contra la tabla completa.
+
+Requiere una base PostgreSQL de pruebas (13+):
+    DATABASE_URL=postgresql://.../teleton_bench python bench/bench_particiones.py
+    DATABASE_URL=postgresql://.../teleton_bench python bench/bench_particiones.py --rows 1000000 --recrear
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import func, select, text  # noqa: E402
+from sqlalchemy.schema import CreateTable  # noqa: E402
+
+from busqueda import aplicar_filtros  # noqa: E402
+from database import Voluntario, engine  # noqa: E402
+from exportar import select_voluntarios  # noqa: E402
+from generador import REGIONES  # noqa: E402
+from models import VoluntarioSearch  # noqa: E402
+from particionar import particionar  # noqa: E402
+from particiones import listar_particiones, nombre_particion  # noqa: E402
+from rpa_cola import COLUMNAS_RPA  # noqa: E402
+
+PLANA = "bench_plana"
+PARTICIONADA = "bench_particionada"
+
+# Índices btree de schema.sql (los trigram dependen de extensiones opcionales)
+INDICES = [
+    "CREATE INDEX idx_voluntarios_region ON voluntarios(region)",
+    "CREATE INDEX idx_voluntarios_estado ON voluntarios(estado)",
+    "CREATE INDEX idx_voluntarios_score_riesgo ON voluntarios(score_riesgo_baja)",
+    "CREATE INDEX idx_voluntarios_flag_brecha ON voluntarios(flag_brecha_cap)",
+    "CREATE INDEX idx_voluntarios_area_estudio ON voluntarios(area_estudio)",
+    "CREATE UNIQUE INDEX uq_voluntarios_nombre_region ON voluntarios(nombre, region)",
+    "CREATE INDEX idx_voluntarios_rpa_urgente ON voluntarios(id) WHERE score_riesgo_baja > 75 OR flag_brecha_cap = TRUE",
+]
+
+POBLAR_SQL = """
+INSERT INTO voluntarios (
+    nombre, edad, rango_etario, region, area_estudio, estado, tiene_capacitacion,
+    programa_asignado, fecha_rechazo_count, score_riesgo_baja, flag_brecha_cap
+)
+SELECT
+    'bench ' || i,
+    18 + (i % 60),
+    NULL,
+    (CAST(:ranuras AS text[]))[1 + (i::bigint * 7919) % 1000],
+    (ARRAY['Salud', 'Educación', 'Ingeniería', 'Psicología', 'Derecho', 'Administración',
+           'Ciencias Sociales', 'Comunicaciones'])[1 + (i / 7 % 8)],
+    (ARRAY['Activo', 'Activo', 'Activo', 'Receso', 'Sin Asignación', 'Inactivo'])[1 + (i / 3 % 6)],
+    i % 2 = 0,
+    (ARRAY['OTL', 'Abre', 'Servicios', NULL])[1 + (i / 11 % 4)],
+    i % 4,
+    (i * 37) % 101,
+    i % 9 = 0
+FROM generate_series(:desde, :hasta) AS i
+"""
+
+
+def ranuras_regiones() -> list:
+    """1000 ranuras con cada región repetida según su peso en REGIONES."""
+    total = sum(REGIONES.values())
+    ranuras = []
+    for region, peso in REGIONES.items():
+        ranuras += [region] * round(1000 * peso / total)
+    return (ranuras + ["Metropolitana"] * 1000)[:1000]
+
+
+def en_schema(conn, schema: str):
+    conn.execute(text(f"SET search_path TO {schema}, public"))
+
+
+def poblar(schema: str, rows: int, recrear: bool):
+    with engine.begin() as conn:
+        existe = conn.execute(text("SELECT to_regclass(:t)"), {"t": f"{schema}.voluntarios"}).scalar()
+        if existe and not recrear:
+            actuales = conn.execute(text(f"SELECT count(*) FROM {schema}.voluntarios")).scalar()
+            if actuales == rows:
+                return False
+        conn.execute(text(f"DROP SCHEMA IF EXISTS {schema} CASCADE"))
+        conn.execute(text(f"CREATE SCHEMA {schema}"))
+        en_schema(conn, schema)
+        conn.execute(CreateTable(Voluntario.__table__))
+
+    print(f"{schema}: insertando {rows} filas...")
+    ranuras = ranuras_regiones()
+    bloque = 500000
+    for desde in range(1, rows + 1, bloque):
+        with engine.begin() as conn:
+            en_schema(conn, schema)
+            conn.execute(text(POBLAR_SQL), {"ranuras": ranuras, "desde": desde, "hasta": min(desde + bloque - 1, rows)})
+
+    with engine.begin() as conn:
+        en_schema(conn, schema)
+        for indice in INDICES:
+            conn.execute(text(indice))
+        conn.execute(text("ANALYZE voluntarios"))
+    return True
+
+
+def relaciones_del_plan(nodo: dict):
+    if "Relation Name" in nodo:
+        yield nodo["Relation Name"]
+    for hijo in nodo.get("Plans", []):
+        yield from relaciones_del_plan(hijo)
+
+
+def medir(schema: str, query, repeticiones: int):
+    """Mediana en ms, filas y relaciones recorridas de query en schema."""
+    with engine.connect() as conn:
+        en_schema(conn, schema)
+        plan = conn.execute(text("EXPLAIN (FORMAT JSON) " + str(query.compile(engine, compile_kwargs={"literal_binds": True})).replace("%%", "%"))).scalar()
+        relaciones = set(relaciones_del_plan(plan[0]["Plan"]))
+        conn.execute(query).all()  # calentamiento
+        tiempos = []
+        for _ in range(repeticiones):
+            inicio = time.perf_counter()
+            filas = len(conn.execute(query).all())
+            tiempos.append(time.perf_counter() - inicio)
+    return statistics.median(tiempos) * 1000, filas, len(relaciones)
+
+
+def regiones_que_contienen(particiones: list, termino: str) -> list:
+    """Lo que resuelve busqueda.resolver_regiones (con el backend ilike), desde las particiones."""
+    return sorted(r for p in particiones for r in p["regiones"] if termino.lower() in r.lower())
+
+
+def cronometrar(schema: str, sentencia: str) -> float:
+    # REINDEX y ANALYZE fuera de una transacción, como en mantenimiento_particiones.py
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        en_schema(conn, schema)
+        inicio = time.perf_counter()
+        conn.execute(text(sentencia))
+        return time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5000000)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--recrear", action="store_true", help="Vuelve a generar las dos tablas")
+    args = parser.parse_args()
+
+    if engine.dialect.name != "postgresql":
+        print("❌ El benchmark requiere DATABASE_URL de una base PostgreSQL de pruebas")
+        sys.exit(1)
+
+    poblar(PLANA, args.rows, args.recrear)
+    if poblar(PARTICIONADA, args.rows, args.recrear):
+        inicio = time.perf_counter()
+        with engine.begin() as conn:
+            en_schema(conn, PARTICIONADA)
+            resultado = particionar(conn)
+        print(f"{PARTICIONADA}: particionar.py en {time.perf_counter() - inicio:.1f}s ({len(resultado['particiones'])} particiones)")
+
+    with engine.connect() as conn:
+        en_schema(conn, PARTICIONADA)
+        particiones = listar_particiones(conn)
+
+    def busqueda(termino=None, rutear=False, **filtros):
+        search = VoluntarioSearch(region=termino, **filtros)
+        regiones = regiones_que_contienen(particiones, termino) if rutear and termino else None
+        return aplicar_filtros(select_voluntarios(), search, regiones).order_by(Voluntario.id)
+
+    def rpa(region):
+        return select(*COLUMNAS_RPA).where(
+            (Voluntario.score_riesgo_baja > 75) | (Voluntario.flag_brecha_cap == True),
+            Voluntario.region == region
+        )
+
+    def agregado(region):
+        return select(func.count(), func.avg(Voluntario.score_riesgo_baja)).where(Voluntario.region == region)
+
+    casos = [
+        ("búsqueda region=aysen (1000)", lambda r: busqueda("aysén", r).limit(1000)),
+        ("búsqueda region=los + Activo", lambda r: busqueda("los", r, estado="Activo")),
+        ("búsqueda region=maule + score>=80", lambda r: busqueda("maule", r, min_score_riesgo=80)),
+        ("RPA región Ñuble", lambda r: rpa("Ñuble")),
+        ("agregado región Valparaíso", lambda r: agregado("Valparaíso")),
+        ("búsqueda estado=Receso (1000)", lambda r: busqueda(estado="Receso").limit(1000)),
+        ("lectura por id (sin región)", lambda r: select_voluntarios().where(Voluntario.id == args.rows // 2)),
+    ]
+
+    print(f"\n{args.rows} filas, {len(particiones)} particiones; mediana de {args.repeticiones} (ms)")
+    print(f"  {'consulta':<36} {'plana':>9} {'particionada':>13} {'x':>6} {'filas':>8} {'particiones':>12}")
+    for nombre, construir in casos:
+        plana_ms, filas, _ = medir(PLANA, construir(False), args.repeticiones)
+        part_ms, filas_part, recorridas = medir(PARTICIONADA, construir(True), args.repeticiones)
+        assert filas == filas_part, (nombre, filas, filas_part)
+        print(f"  {nombre:<36} {plana_ms:9.1f} {part_ms:13.1f} {plana_ms / part_ms:6.1f} {filas:8} {recorridas:>5}/{len(particiones)}")
+
+    chica = min((p for p in particiones if not p["default"]), key=lambda p: p["filas"])
+    region = chica["regiones"][0]
+    print(f"\nMantenimiento: tabla completa vs solo la partición de {region} ({chica['filas']} filas)")
+    for tarea, sentencia in [("REINDEX", "REINDEX TABLE {}"), ("ANALYZE", "ANALYZE {}")]:
+        completa = cronometrar(PLANA, sentencia.format("voluntarios"))
+        particion = cronometrar(PARTICIONADA, sentencia.format(nombre_particion(region)))
+        print(f"  {tarea:<8} {completa:8.2f}s  {particion:8.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark de registro: N llamadas a /api/voluntarios/registro vs lotes en
+/api/voluntarios/registro/batch.
+
+Se ejecuta contra un servidor en ejecución. Cada corrida usa nombres nuevos
+para no chocar con registros anteriores:
+
+    uvicorn main:app --port 8000
+    python bench/bench_registro_batch.py --url http://localhost:8000 --voluntarios 2000 --lote 500
+"""
+import argparse
+import http.client
+import json
+import random
+import time
+import uuid
+from urllib.parse import urlparse
+
+REGIONES = ["Metropolitana", "Valparaíso", "Biobío", "Maule", "Araucanía", "Los Lagos"]
+AREAS = ["Salud", "Educación", "Ingeniería", "Ciencias Sociales", "Administración"]
+ESTADOS = ["Activo", "Receso", "Sin Asignación", "Inactivo"]
+PROGRAMAS = ["OTL", "Abre", "Servicios", None]
+
+
+def generar_voluntarios(n: int, prefijo: str, seed: int = 42) -> list:
+    rnd = random.Random(seed)
+    return [
+        {
+            "nombre": f"{prefijo} {i}",
+            "edad": rnd.randint(18, 75),
+            "region": rnd.choice(REGIONES),
+            "area_estudio": rnd.choice(AREAS),
+            "estado": rnd.choice(ESTADOS),
+            "tiene_capacitacion": rnd.random() < 0.5,
+            "programa_asignado": rnd.choice(PROGRAMAS),
+            "fecha_rechazo_count": rnd.randint(0, 3),
+        }
+        for i in range(n)
+    ]
+
+
+def _post(conexion: http.client.HTTPConnection, ruta: str, datos) -> dict:
+    conexion.request("POST", ruta, body=json.dumps(datos), headers={"Content-Type": "application/json"})
+    respuesta = conexion.getresponse()
+    cuerpo = respuesta.read()
+    if respuesta.status != 200:
+        raise RuntimeError(f"{ruta}: HTTP {respuesta.status} {cuerpo[:200]!r}")
+    return json.loads(cuerpo)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--voluntarios", type=int, default=2000)
+    parser.add_argument("--lote", type=int, default=500)
+    args = parser.parse_args()
+
+    url = urlparse(args.url)
+    conexion = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=300)
+    corrida = uuid.uuid4().hex[:8]
+
+    voluntarios = generar_voluntarios(args.voluntarios, f"Bench individual {corrida}")
+    inicio = time.perf_counter()
+    for voluntario in voluntarios:
+        _post(conexion, "/api/voluntarios/registro", voluntario)
+    individual = time.perf_counter() - inicio
+
+    voluntarios = generar_voluntarios(args.voluntarios, f"Bench lote {corrida}")
+    registrados = 0
+    inicio = time.perf_counter()
+    for i in range(0, len(voluntarios), args.lote):
+        registrados += _post(conexion, "/api/voluntarios/registro/batch", voluntarios[i:i + args.lote])["total_registrados"]
+    lote = time.perf_counter() - inicio
+
+    print(f"{args.voluntarios} voluntarios")
+    print(f"  individual        {individual:8.2f}s  {args.voluntarios / individual:10.1f} reg/s")
+    print(f"  lotes de {args.lote:<6}   {lote:8.2f}s  {args.voluntarios / lote:10.1f} reg/s  ({registrados} registrados)")
+    print(f"  speedup           {individual / lote:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
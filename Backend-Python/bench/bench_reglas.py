@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Benchmark del motor de reglas (reglas.py) contra la función de score escrita a
+mano que reemplazó.
+
+Verifica primero que, con las reglas de reglas_score.json, el motor por registro
+y por columnas den exactamente el mismo score que la función original, y luego
+mide las tres variantes.
+
+Uso:
+    python bench/bench_reglas.py
+    python bench/bench_reglas.py --sizes 10000 100000 1000000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd  # noqa: E402
+
+from bench_scoring import generar_registros  # noqa: E402
+from reglas import cargar_motor  # noqa: E402
+
+
+def score_original(voluntario_data: dict) -> int:
+    """calcular_score_riesgo antes del motor de reglas (versión 1, ramas fijas)."""
+    score = 0
+
+    razon = str(voluntario_data.get("razon_no_continuar", "")).lower()
+    if "falta de tiempo" in razon or "tiempo" in razon:
+        score += 40
+
+    rango_etario = str(voluntario_data.get("rango_etario", ""))
+    if "18-29" in rango_etario:
+        score += 35
+
+    estado = str(voluntario_data.get("estado", ""))
+    if estado in ["Receso", "Sin Asignación"]:
+        score += 25
+
+    fecha_rechazo_count = int(voluntario_data.get("fecha_rechazo_count", 0))
+    if fecha_rechazo_count >= 2:
+        score += 20
+
+    programa_asignado = voluntario_data.get("programa_asignado")
+    if not programa_asignado or programa_asignado.strip() == "":
+        score += 15
+
+    return min(score, 100)
+
+
+def verificar_equivalencia(motor, casos: int, seed: int):
+    registros = generar_registros(casos, seed)
+    for registro in registros:
+        assert motor.score(registro) == score_original(registro), registro
+
+    completos = generar_registros(casos, seed + 1, con_ausentes=False)
+    assert list(motor.score_batch(pd.DataFrame(completos))) == [score_original(r) for r in completos]
+    print(f"Equivalencia verificada con {casos} registros aleatorios (reglas versión {motor.version})")
+
+
+def medir(motor, n: int, seed: int):
+    registros = generar_registros(n, seed, con_ausentes=False)
+    df = pd.DataFrame(registros)
+
+    inicio = time.perf_counter()
+    for r in registros:
+        score_original(r)
+    original = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    for r in registros:
+        motor.score(r)
+    por_registro = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    motor.score_batch(df)
+    batch = time.perf_counter() - inicio
+
+    print(
+        f"{n:>9} filas  original {original:8.3f}s  motor por registro {por_registro:8.3f}s "
+        f"(x{original / por_registro:4.2f})  motor batch {batch:8.3f}s (x{original / batch:6.1f})"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--casos", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--reglas", help="Archivo de reglas (por defecto REGLAS_SCORE_PATH)")
+    args = parser.parse_args()
+
+    motor = cargar_motor(args.reglas)
+    verificar_equivalencia(motor, args.casos, args.seed)
+    for n in args.sizes:
+        medir(motor, n, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark del scoring por dict vs por columnas (inteligencia_predictiva).
+
+La equivalencia de calcular_score_riesgo_batch y calcular_flag_brecha_batch con
+las funciones por dict se verifica en tests/test_scoring.py.
+
+Uso:
+    python bench/bench_scoring.py
+    python bench/bench_scoring.py --sizes 10000 100000 1000000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd  # noqa: E402
+
+from inteligencia_predictiva import (  # noqa: E402
+    calcular_flag_brecha,
+    calcular_flag_brecha_batch,
+    calcular_score_riesgo,
+    calcular_score_riesgo_batch,
+)
+
+VALORES = {
+    "razon_no_continuar": [None, "", "Falta de Tiempo", "falta de TIEMPO", "tiempo", "Cambio de ciudad", "Tiempos"],
+    "rango_etario": [None, "", "18-29 años", "30-39 años", "40-49 años", "60+ años", "18-29"],
+    "estado": [None, "Activo", "Receso", "Sin Asignación", "Inactivo", "receso"],
+    "fecha_rechazo_count": [0, 1, 2, 3, 5],
+    "programa_asignado": [None, "", "   ", "OTL", "Abre", "Servicios"],
+    "area_estudio": [None, "", "Salud", "SALUD", "salud ", "Educación"],
+    "tiene_capacitacion": [None, True, False, 0, 1],
+}
+
+
+def generar_registros(n: int, seed: int, con_ausentes: bool = True):
+    rnd = random.Random(seed)
+    registros = []
+    for _ in range(n):
+        registro = {}
+        for columna, valores in VALORES.items():
+            if con_ausentes and rnd.random() < 0.05:
+                continue
+            registro[columna] = rnd.choice(valores)
+        registros.append(registro)
+    return registros
+
+
+def medir(n: int, seed: int):
+    registros = generar_registros(n, seed, con_ausentes=False)
+    df = pd.DataFrame(registros)
+
+    inicio = time.perf_counter()
+    for r in registros:
+        calcular_score_riesgo(r)
+        calcular_flag_brecha(r)
+    por_dict = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    calcular_score_riesgo_batch(df)
+    calcular_flag_brecha_batch(df)
+    batch = time.perf_counter() - inicio
+
+    print(f"{n:>9} filas  por dict {por_dict:8.3f}s  batch {batch:8.3f}s  x{por_dict / batch:6.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    for n in args.sizes:
+        medir(n, args.seed)
+
+
+if __name__ == "__main__":
+    main()
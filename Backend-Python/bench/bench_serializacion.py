@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la serialización de listados de voluntarios (exportar.respuesta_json).
+
+Sirve el mismo resultado de --rows filas desde endpoints de prueba con cada
+variante y mide el tiempo de respuesta completo (consulta + serialización) con
+TestClient:
+
+- orm: objetos ORM validados con from_attributes contra List[VoluntarioResponse]
+  (los listados antes de seleccionar columnas)
+- response_model: dicts de select_voluntarios() validados contra
+  List[VoluntarioResponse] (RESPUESTA_JSON_RAPIDA=false)
+- pydantic: dicts codificados con TypeAdapter.dump_json, sin validar
+- orjson: dicts codificados con orjson, sin validar (RESPUESTA_JSON_RAPIDA=true)
+
+Verifica además que todas las variantes devuelvan el mismo JSON.
+
+Uso:
+    python bench/bench_serializacion.py
+    python bench/bench_serializacion.py --rows 10000 --repeticiones 20
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import warnings
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+_tmp_dir = tempfile.mkdtemp(prefix="bench_serializacion_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmp_dir, 'bench.db')}"
+
+from typing import List  # noqa: E402
+
+warnings.filterwarnings("ignore")
+
+from fastapi import Depends, FastAPI  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import select  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+import exportar  # noqa: E402
+from data_loader import upload_data  # noqa: E402
+from database import Base, SessionLocal, Voluntario, engine, get_db  # noqa: E402
+from generador import generar_archivo  # noqa: E402
+from models import VoluntarioResponse  # noqa: E402
+
+app = FastAPI()
+LIMITE = {"filas": 0}
+
+
+@app.get("/orm", response_model=List[VoluntarioResponse])
+def orm(db: Session = Depends(get_db)):
+    return db.execute(select(Voluntario).order_by(Voluntario.id).limit(LIMITE["filas"])).scalars().all()
+
+
+@app.get("/response_model", response_model=List[VoluntarioResponse])
+def response_model(db: Session = Depends(get_db)):
+    return exportar.filas(db.execute(exportar.select_voluntarios().order_by(Voluntario.id).limit(LIMITE["filas"])))
+
+
+@app.get("/pydantic", response_model=List[VoluntarioResponse])
+def pydantic(db: Session = Depends(get_db)):
+    filas = exportar.filas(db.execute(exportar.select_voluntarios().order_by(Voluntario.id).limit(LIMITE["filas"])))
+    return exportar.Response(content=exportar._json_adapter.dump_json(filas), media_type="application/json")
+
+
+@app.get("/orjson", response_model=List[VoluntarioResponse])
+def orjson(db: Session = Depends(get_db)):
+    return exportar.respuesta_json(
+        exportar.filas(db.execute(exportar.select_voluntarios().order_by(Voluntario.id).limit(LIMITE["filas"])))
+    )
+
+
+def poblar(rows: int):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    # Filas de más por las que clean_data descarta y los duplicados que se consolidan
+    path = generar_archivo(os.path.join(_tmp_dir, "voluntarios.csv"), int(rows * 1.05) + 10, headers_limpios=True)
+    db = SessionLocal()
+    try:
+        upload_data(path, db=db, bulk=True)
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeticiones", type=int, default=20)
+    args = parser.parse_args()
+
+    poblar(args.rows)
+    LIMITE["filas"] = args.rows
+    client = TestClient(app)
+
+    variantes = ["orm", "response_model", "pydantic"] + (["orjson"] if exportar.orjson is not None else [])
+    referencia = client.get("/orm").json()
+    assert len(referencia) == args.rows, len(referencia)
+    for variante in variantes[1:]:
+        assert client.get(f"/{variante}").json() == referencia, variante
+
+    print(f"{args.rows} filas, mediana de {args.repeticiones} requests")
+    base = None
+    for variante in variantes:
+        tiempos = []
+        for _ in range(args.repeticiones):
+            inicio = time.perf_counter()
+            client.get(f"/{variante}")
+            tiempos.append(time.perf_counter() - inicio)
+        mediana = statistics.median(tiempos)
+        base = base or mediana
+        print(f"  {variante:<15} {mediana * 1000:8.1f} ms  (x{base / mediana:4.1f})")
+
+
+if __name__ == "__main__":
+    main()
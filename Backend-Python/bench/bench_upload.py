@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark de upload_data: carga fila por fila vs carga masiva (bulk).
+
+Uso:
+    python bench/bench_upload.py --rows 20000
+    DATABASE_URL=postgresql://... python bench/bench_upload.py --rows 200000
+
+Sin DATABASE_URL se usa una base SQLite temporal.
+"""
+import argparse
+import csv
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_tmp_dir = tempfile.mkdtemp()
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(_tmp_dir, 'bench.db')}")
+
+from database import Base, SessionLocal, Voluntario, engine  # noqa: E402
+from data_loader import upload_data  # noqa: E402
+
+REGIONES = ["Metropolitana", "Valparaíso", "Biobío", "Maule", "Araucanía", "Los Lagos"]
+AREAS = ["Salud", "Educación", "Ingeniería", "Ciencias Sociales", "Administración"]
+ESTADOS = ["Activo", "Receso", "Sin Asignación", "Inactivo"]
+PROGRAMAS = ["OTL", "Abre", "Servicios", ""]
+RAZONES = ["", "", "Falta de Tiempo", "Cambio de ciudad", "Motivos personales"]
+
+
+def generar_csv(path: str, rows: int, seed: int = 42):
+    rnd = random.Random(seed)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow([
+            "nombre", "edad", "region", "area_estudio", "estado", "razon_no_continuar",
+            "tiene_capacitacion", "programa_asignado", "fecha_rechazo_count"
+        ])
+        for i in range(rows):
+            writer.writerow([
+                f"Voluntario {i}",
+                rnd.randint(18, 75),
+                rnd.choice(REGIONES),
+                rnd.choice(AREAS),
+                rnd.choice(ESTADOS),
+                rnd.choice(RAZONES),
+                rnd.choice(["true", "false"]),
+                rnd.choice(PROGRAMAS),
+                rnd.randint(0, 3),
+            ])
+
+
+def medir(path: str, bulk: bool):
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    resultados = []
+    for fase in ["insercion", "actualizacion"]:
+        db = SessionLocal()
+        try:
+            inicio = time.perf_counter()
+            processed, inserted, updated, errors = upload_data(path, db=db, bulk=bulk)
+            segundos = time.perf_counter() - inicio
+        finally:
+            db.close()
+        resultados.append((fase, segundos, processed, inserted, updated, len(errors)))
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    path = os.path.join(_tmp_dir, "voluntarios.csv")
+    generar_csv(path, args.rows, args.seed)
+    print(f"Base de datos: {engine.url.render_as_string(hide_password=True)}")
+    print(f"Filas: {args.rows}")
+
+    for modo, bulk in [("fila", False), ("bulk", True)]:
+        for fase, segundos, processed, inserted, updated, n_errors in medir(path, bulk):
+            print(
+                f"{modo:5s} {fase:13s} {segundos:8.2f}s {processed / segundos:10.0f} filas/s "
+                f"(insertados={inserted}, actualizados={updated}, errores={n_errors})"
+            )
+
+
+if __name__ == "__main__":
+    main()
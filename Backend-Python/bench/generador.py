@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Generador reproducible de voluntarios sintéticos para benchmarks.
+
+Con la misma semilla produce siempre el mismo archivo. Las distribuciones de
+region, area_estudio y estado imitan la base real (Metropolitana concentra
+cerca del 40%, la mayoría de los voluntarios está Activo) y los datos traen el
+ruido habitual de las planillas: encabezados con variantes de COLUMN_MAPPING en
+distinto orden, mayúsculas y espacios; edades faltantes o menores de 18;
+capacitación como Sí/No/1/0; estados en blanco (que la carga completa con el
+default "Activo"); y nombres repetidos en la misma región (que la carga consolida
+como actualizaciones).
+
+Uso:
+    python bench/generador.py --rows 100000 --salida /tmp/voluntarios.csv
+    python bench/generador.py --rows 10000 --salida /tmp/voluntarios.xlsx --headers-limpios
+"""
+import argparse
+import csv
+import os
+import random
+import sys
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# data_loader importa database; el generador no usa la BD
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from data_loader import COLUMN_MAPPING  # noqa: E402
+
+# Peso aproximado de cada región en la base de voluntarios
+REGIONES = {
+    "Metropolitana": 40, "Valparaíso": 10, "Biobío": 9, "Maule": 6, "Araucanía": 6,
+    "O'Higgins": 5, "Los Lagos": 5, "Coquimbo": 4.5, "Antofagasta": 3.5, "Ñuble": 2.8,
+    "Los Ríos": 2, "Tarapacá": 2, "Atacama": 1.6, "Arica y Parinacota": 1.3,
+    "Magallanes": 0.9, "Aysén": 0.5,
+}
+AREAS = {
+    "Salud": 28, "Educación": 22, "Ciencias Sociales": 14, "Administración": 12,
+    "Ingeniería": 10, "Comunicaciones": 6, "Derecho": 4, "": 4,
+}
+ESTADOS = {"Activo": 60, "Receso": 15, "Sin Asignación": 13, "Inactivo": 10, "": 2}
+PROGRAMAS = {"OTL": 35, "Abre": 25, "Servicios": 20, "": 20}
+RAZONES = {"": 70, "Falta de Tiempo": 12, "Cambio de ciudad": 6, "Motivos personales": 7, "Estudios": 5}
+CAPACITACION = {"true": 30, "false": 30, "Sí": 10, "No": 10, "1": 8, "0": 8, "": 4}
+
+NOMBRES = [
+    "Camila", "Valentina", "Javiera", "Fernanda", "Constanza", "Catalina", "Francisca", "Daniela",
+    "Sofía", "Antonia", "Matías", "Benjamín", "Sebastián", "Nicolás", "Diego", "Felipe",
+    "Joaquín", "Tomás", "Vicente", "Cristóbal", "José", "Juan", "María", "Ignacio",
+]
+APELLIDOS = [
+    "González", "Muñoz", "Rojas", "Díaz", "Pérez", "Soto", "Contreras", "Silva", "Martínez",
+    "Sepúlveda", "Morales", "Rodríguez", "López", "Fuentes", "Hernández", "Torres", "Araya",
+    "Flores", "Espinoza", "Valenzuela", "Castillo", "Tapia", "Reyes", "Gutiérrez",
+]
+
+# Orden de columnas de las planillas; rango_etario se omite para que lo calcule la carga
+COLUMNAS = [
+    "nombre", "edad", "region", "area_estudio", "estado", "razon_no_continuar",
+    "tiene_capacitacion", "programa_asignado", "fecha_rechazo_count",
+]
+
+# Proporción de filas que repiten nombre y región de una fila anterior
+PROPORCION_DUPLICADOS = 0.02
+# Proporción de filas con edad faltante o menor de 18 (descartadas por clean_data)
+PROPORCION_EDAD_INVALIDA = 0.01
+
+
+def _elegir(rnd: random.Random, pesos: Dict[str, float], n: int) -> List[str]:
+    return rnd.choices(list(pesos), weights=list(pesos.values()), k=n)
+
+
+def encabezados(rnd: random.Random, limpios: bool = False) -> List[str]:
+    """Encabezado por columna: una variante de COLUMN_MAPPING con mayúsculas y espacios al azar."""
+    if limpios:
+        return list(COLUMNAS)
+    resultado = []
+    for columna in COLUMNAS:
+        variante = rnd.choice(COLUMN_MAPPING[columna])
+        variante = rnd.choice([variante, variante.upper(), variante.title(), variante.lower()])
+        resultado.append(" " * rnd.randint(0, 1) + variante + " " * rnd.randint(0, 2))
+    return resultado
+
+
+def generar_filas(rows: int, seed: int = 42) -> List[list]:
+    """Filas en el orden de COLUMNAS, reproducibles para la misma semilla."""
+    rnd = random.Random(seed)
+    regiones = _elegir(rnd, REGIONES, rows)
+    areas = _elegir(rnd, AREAS, rows)
+    estados = _elegir(rnd, ESTADOS, rows)
+    programas = _elegir(rnd, PROGRAMAS, rows)
+    razones = _elegir(rnd, RAZONES, rows)
+    capacitacion = _elegir(rnd, CAPACITACION, rows)
+
+    filas = []
+    for i in range(rows):
+        if i and rnd.random() < PROPORCION_DUPLICADOS:
+            j = rnd.randrange(i)
+            nombre, region = filas[j][0], filas[j][2]
+        else:
+            nombre = f"{rnd.choice(NOMBRES)} {rnd.choice(APELLIDOS)} {rnd.choice(APELLIDOS)} {i}"
+            region = regiones[i]
+
+        if rnd.random() < PROPORCION_EDAD_INVALIDA:
+            edad = rnd.choice(["", rnd.randint(14, 17)])
+        else:
+            # Mayoría joven: la edad sigue una triangular con moda en 24
+            edad = int(rnd.triangular(18, 80, 24))
+
+        filas.append([
+            nombre,
+            edad,
+            region,
+            areas[i],
+            estados[i],
+            razones[i],
+            capacitacion[i],
+            programas[i],
+            min(int(rnd.expovariate(1.2)), 5),
+        ])
+    return filas
+
+
+def generar_archivo(path: str, rows: int, seed: int = 42, headers_limpios: bool = False) -> str:
+    """Escribe el archivo (CSV o XLSX según la extensión) y retorna su ruta."""
+    rnd = random.Random(seed)
+    cabecera = encabezados(rnd, headers_limpios)
+    filas = generar_filas(rows, seed)
+
+    if path.endswith(".xlsx"):
+        from openpyxl import Workbook
+
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet("Voluntarios")
+        ws.append(cabecera)
+        for fila in filas:
+            ws.append(fila)
+        wb.save(path)
+    else:
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(cabecera)
+            writer.writerows(filas)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--salida", default="voluntarios_sinteticos.csv")
+    parser.add_argument("--headers-limpios", action="store_true", help="Encabezados con los nombres de la BD")
+    args = parser.parse_args()
+
+    generar_archivo(args.salida, args.rows, args.seed, args.headers_limpios)
+    print(f"✅ {args.rows} filas en {args.salida}")
+
+
+if __name__ == "__main__":
+    main()
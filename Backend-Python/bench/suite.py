@@ -0,0 +1,237 @@
+#!/usr/bin/env python3
+"""
+Suite de benchmarks reproducible del backend.
+
+Para cada tamaño genera voluntarios sintéticos con bench/generador.py (misma
+semilla, mismo archivo), recrea las tablas y ejecuta los escenarios:
+
+    upload    upload_data del archivo generado (bulk, streaming o fila)
+    scoring   scoring por columnas sobre el DataFrame limpio
+    search    /api/voluntarios/search con varias combinaciones de filtros
+    rpa       /api/rpa/accion_urgente
+    listado   /api/voluntarios/ recorriendo páginas con after_id
+
+Los endpoints se llaman en proceso (TestClient) con el cache desactivado. Sin
+DATABASE_URL se usa una base SQLite temporal; con DATABASE_URL usar una base
+dedicada, porque la suite borra y recrea las tablas.
+
+Uso:
+    python bench/suite.py --rows 1000 10000 100000 --salida base.json
+    DATABASE_URL=postgresql://.../teleton_bench python bench/suite.py --rows 1000000 --salida pg.json
+
+Comparación entre dos corridas (exit 1 si hay regresiones sobre el umbral):
+    python bench/suite.py comparar base.json nuevo.json --umbral 0.15
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Métricas que se comparan entre corridas: True si un valor mayor es mejor
+METRICAS_COMPARADAS = {"filas_por_segundo": True, "p50_ms": False, "p95_ms": False}
+
+ESCENARIOS = ["upload", "scoring", "search", "rpa", "listado"]
+
+BUSQUEDAS = [
+    "/api/voluntarios/search?region=metropolitana&limit=100",
+    "/api/voluntarios/search?min_score_riesgo=75&brecha_pendiente=true&limit=100",
+    "/api/voluntarios/search?area_estudio=salud&estado=Activo&limit=100",
+    "/api/voluntarios/search?programa_asignado=otl&min_score_riesgo=50&limit=100",
+]
+
+
+def _latencias(segundos: list) -> dict:
+    ms = sorted(s * 1000 for s in segundos)
+    return {
+        "requests": len(ms),
+        "p50_ms": round(statistics.median(ms), 3),
+        "p95_ms": round(ms[max(0, int(len(ms) * 0.95) - 1)], 3),
+        "requests_por_segundo": round(len(ms) / (sum(ms) / 1000), 1),
+    }
+
+
+def _medir_requests(client, rutas: list, repeticiones: int) -> dict:
+    for ruta in rutas:
+        client.get(ruta)  # calentamiento
+    segundos = []
+    for _ in range(repeticiones):
+        for ruta in rutas:
+            inicio = time.perf_counter()
+            respuesta = client.get(ruta)
+            segundos.append(time.perf_counter() - inicio)
+            if respuesta.status_code != 200:
+                raise RuntimeError(f"{ruta}: HTTP {respuesta.status_code}")
+    return _latencias(segundos)
+
+
+def ejecutar(rows: int, seed: int, modo_upload: str, repeticiones: int, escenarios: list) -> dict:
+    from fastapi.testclient import TestClient
+
+    from generador import generar_archivo
+    from data_loader import clean_data, load_file, map_columns, upload_data
+    from database import Base, SessionLocal, engine
+    from inteligencia_predictiva import aplicar_inteligencia_predictiva_df
+    from main import app
+
+    path = generar_archivo(os.path.join(tempfile.mkdtemp(), "voluntarios.csv"), rows, seed)
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    resultados = {}
+
+    # La carga se ejecuta siempre: los demás escenarios consultan sus filas
+    db = SessionLocal()
+    try:
+        inicio = time.perf_counter()
+        processed, inserted, updated, errors = upload_data(
+            path, db=db, bulk=modo_upload == "bulk", streaming=modo_upload == "streaming"
+        )
+        segundos = time.perf_counter() - inicio
+    finally:
+        db.close()
+    if "upload" in escenarios:
+        resultados["upload"] = {
+            "modo": modo_upload,
+            "segundos": round(segundos, 3),
+            "filas_por_segundo": round(processed / segundos, 1),
+            "insertados": inserted,
+            "actualizados": updated,
+            "errores": len(errors),
+        }
+
+    if "scoring" in escenarios:
+        df = clean_data(map_columns(load_file(path)))
+        inicio = time.perf_counter()
+        aplicar_inteligencia_predictiva_df(df)
+        segundos = time.perf_counter() - inicio
+        resultados["scoring"] = {"segundos": round(segundos, 4), "filas_por_segundo": round(len(df) / segundos, 1)}
+
+    with TestClient(app) as client:
+        if "search" in escenarios:
+            resultados["search"] = _medir_requests(client, BUSQUEDAS, repeticiones)
+        if "rpa" in escenarios:
+            resultados["rpa"] = _medir_requests(client, ["/api/rpa/accion_urgente"], repeticiones)
+        if "listado" in escenarios:
+            # Páginas sucesivas con el cursor del header, hasta 'repeticiones' páginas
+            segundos, ruta = [], "/api/voluntarios/?limit=1000"
+            for _ in range(repeticiones):
+                inicio = time.perf_counter()
+                respuesta = client.get(ruta)
+                segundos.append(time.perf_counter() - inicio)
+                cursor = respuesta.headers.get("X-Next-Cursor")
+                if not cursor:
+                    break
+                ruta = f"/api/voluntarios/?limit=1000&after_id={cursor}"
+            resultados["listado"] = _latencias(segundos)
+
+    return resultados
+
+
+def _commit_actual() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def correr(args):
+    from database import engine
+
+    corrida = {
+        "meta": {
+            "fecha": datetime.now().isoformat(timespec="seconds"),
+            "commit": _commit_actual(),
+            "seed": args.seed,
+            "modo_upload": args.modo_upload,
+            "repeticiones": args.repeticiones,
+            "base_de_datos": engine.dialect.name,
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+        },
+        "resultados": {},
+    }
+    for rows in args.rows:
+        print(f"▶ {rows} filas", file=sys.stderr)
+        for escenario, metricas in ejecutar(rows, args.seed, args.modo_upload, args.repeticiones, args.escenarios).items():
+            corrida["resultados"][f"{escenario}@{rows}"] = metricas
+            print(f"  {escenario:8s} {metricas}", file=sys.stderr)
+
+    salida = json.dumps(corrida, indent=2, ensure_ascii=False)
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as f:
+            f.write(salida)
+        print(f"✅ Resultados en {args.salida}", file=sys.stderr)
+    else:
+        print(salida)
+
+
+def comparar(base: dict, nuevo: dict, umbral: float) -> list:
+    """Retorna [(clave, métrica, base, nuevo, cambio relativo, es_regresion)] de las métricas comunes."""
+    filas = []
+    for clave, metricas in nuevo["resultados"].items():
+        anteriores = base["resultados"].get(clave)
+        if not anteriores:
+            continue
+        for metrica, valor in metricas.items():
+            anterior = anteriores.get(metrica)
+            if metrica not in METRICAS_COMPARADAS or not anterior:
+                continue
+            cambio = (valor - anterior) / anterior
+            empeora = -cambio if METRICAS_COMPARADAS[metrica] else cambio
+            filas.append((clave, metrica, anterior, valor, cambio, empeora > umbral))
+    return filas
+
+
+def correr_comparacion(args):
+    with open(args.base, encoding="utf-8") as f:
+        base = json.load(f)
+    with open(args.nuevo, encoding="utf-8") as f:
+        nuevo = json.load(f)
+
+    filas = comparar(base, nuevo, args.umbral)
+    print(f"{'escenario':18s} {'métrica':22s} {'base':>12s} {'nuevo':>12s} {'cambio':>8s}")
+    for clave, metrica, anterior, valor, cambio, regresion in filas:
+        marca = "  ❌ REGRESIÓN" if regresion else ""
+        print(f"{clave:18s} {metrica:22s} {anterior:12.3f} {valor:12.3f} {cambio:+8.1%}{marca}")
+
+    regresiones = sum(1 for fila in filas if fila[-1])
+    if regresiones:
+        print(f"❌ {regresiones} regresiones sobre el umbral de {args.umbral:.0%}")
+        sys.exit(1)
+    print(f"✅ Sin regresiones sobre el umbral de {args.umbral:.0%}")
+
+
+def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "comparar":
+        parser = argparse.ArgumentParser(prog="suite.py comparar", description="Compara dos corridas de la suite")
+        parser.add_argument("base")
+        parser.add_argument("nuevo")
+        parser.add_argument("--umbral", type=float, default=0.15, help="Empeoramiento relativo tolerado (0.15 = 15%%)")
+        correr_comparacion(parser.parse_args(sys.argv[2:]))
+        return
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--modo-upload", choices=["bulk", "streaming", "fila"], default="bulk")
+    parser.add_argument("--repeticiones", type=int, default=20)
+    parser.add_argument("--escenarios", nargs="+", choices=ESCENARIOS, default=ESCENARIOS)
+    parser.add_argument("--salida", help="Archivo JSON de resultados (por defecto stdout)")
+    args = parser.parse_args()
+
+    os.environ.setdefault("DATABASE_URL", f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}")
+    os.environ["CACHE_TTL_SECONDS"] = "0"
+    correr(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Filtros del motor de búsqueda de voluntarios.
+
+Los filtros de texto (region, area_estudio, programa_asignado) buscan el término
+en cualquier parte del valor. Con SEARCH_BACKEND=trgm se comparan sin acentos
+(f_unaccent) y PostgreSQL puede resolverlos con los índices GIN pg_trgm de
+schema.sql; con el backend ilike por defecto se usa ILIKE directo, que no usa
+índices con comodín inicial y distingue acentos.
+
+Con la tabla particionada por región (particiones.py) el filtro region no le
+sirve a PostgreSQL para descartar particiones, porque no es una igualdad.
+resolver_regiones traduce el término a las regiones exactas que lo contienen
+(consultando voluntarios_resumen, que tiene una fila por región con datos) y
+aplicar_filtros agrega region IN (...): la consulta solo recorre esas particiones.
+"""
+import os
+from typing import List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database import Voluntario, VoluntariosResumen
+from models import VoluntarioSearch
+from particiones import particionada
+
+SEARCH_BACKEND = os.getenv("SEARCH_BACKEND", "ilike")
+
+
+def filtro_texto(columna, termino: str):
+    """Condición 'columna contiene termino' según el backend de búsqueda."""
+    patron = f"%{termino}%"
+    if SEARCH_BACKEND == "trgm":
+        return func.f_unaccent(columna).ilike(func.f_unaccent(patron))
+    return columna.ilike(patron)
+
+
+async def resolver_regiones(db: AsyncSession, termino: Optional[str]) -> Optional[List[str]]:
+    """
+    Regiones exactas que contienen termino, para rutear la búsqueda a sus
+    particiones. None si la tabla no está particionada o no hay filtro de región.
+    """
+    if not termino or not particionada():
+        return None
+    query = (
+        select(VoluntariosResumen.region)
+        .where(VoluntariosResumen.total > 0, filtro_texto(VoluntariosResumen.region, termino))
+        .distinct()
+    )
+    return sorted((await db.execute(query)).scalars())
+
+
+def aplicar_filtros(query, filtros: VoluntarioSearch, regiones: Optional[List[str]] = None):
+    """
+    Aplica los filtros de búsqueda a un Query o Select sobre Voluntario. regiones
+    (de resolver_regiones) limita la consulta a las particiones de esas regiones.
+    """
+    if filtros.min_score_riesgo is not None:
+        query = query.filter(Voluntario.score_riesgo_baja >= filtros.min_score_riesgo)
+    if filtros.region:
+        query = query.filter(filtro_texto(Voluntario.region, filtros.region))
+        if regiones is not None:
+            query = query.filter(Voluntario.region.in_(regiones))
+    if filtros.area_estudio:
+        query = query.filter(filtro_texto(Voluntario.area_estudio, filtros.area_estudio))
+    if filtros.brecha_pendiente is not None:
+        query = query.filter(Voluntario.flag_brecha_cap == filtros.brecha_pendiente)
+    if filtros.estado:
+        query = query.filter(Voluntario.estado == filtros.estado)
+    if filtros.programa_asignado:
+        query = query.filter(filtro_texto(Voluntario.programa_asignado, filtros.programa_asignado))
+    return query
@@ -0,0 +1,98 @@
+"""
+Cache en memoria de resultados de consultas, con TTL, desalojo LRU e invalidación
+por generación.
+
+Las claves incluyen la generación vigente al momento de la consulta. Cada
+escritura (registro, PUT, carga masiva) llama a invalidar(), que descarta las
+entradas e incrementa la generación. Un resultado calculado mientras ocurría
+una escritura lleva la generación antigua y no se guarda.
+
+La invalidación es local al proceso; con varios workers, las escrituras de otro
+proceso se ven a más tardar al vencer el TTL.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+# 0 desactiva el cache
+CACHE_TTL_SECONDS = float(os.getenv("CACHE_TTL_SECONDS", 30))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", 1024))
+# Límite de filas sumando todas las entradas (cada lista cuenta por su largo)
+CACHE_MAX_ROWS = int(os.getenv("CACHE_MAX_ROWS", 100000))
+
+
+class QueryCache:
+    def __init__(self, ttl: float, max_entries: int, max_rows: int):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_rows = max_rows
+        self.generacion = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._filas = 0
+        self._datos: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    async def obtener_o_calcular(self, namespace: str, params: Hashable, calcular: Callable[[], Awaitable[Any]]) -> Any:
+        """Retorna el valor en cache para (namespace, params) o espera calcular() y lo guarda."""
+        if self.ttl <= 0:
+            return await calcular()
+
+        with self._lock:
+            clave = (namespace, self.generacion, params)
+            entrada = self._datos.get(clave)
+            if entrada is not None and entrada[0] > time.monotonic():
+                self._datos.move_to_end(clave)
+                self.hits += 1
+                return entrada[2]
+            self.misses += 1
+
+        valor = await calcular()
+        self._guardar(clave, valor)
+        return valor
+
+    def _guardar(self, clave: Hashable, valor: Any):
+        filas = len(valor) if isinstance(valor, (list, tuple)) else 1
+        if filas > self.max_rows:
+            return
+
+        with self._lock:
+            if clave[1] != self.generacion:
+                return
+            anterior = self._datos.pop(clave, None)
+            if anterior is not None:
+                self._filas -= anterior[1]
+            self._datos[clave] = (time.monotonic() + self.ttl, filas, valor)
+            self._filas += filas
+
+            while len(self._datos) > self.max_entries or self._filas > self.max_rows:
+                _, (_, filas_desalojadas, _) = self._datos.popitem(last=False)
+                self._filas -= filas_desalojadas
+                self.evictions += 1
+
+    def invalidar(self):
+        """Invalida todas las entradas; se llama después de cada escritura confirmada."""
+        with self._lock:
+            self.generacion += 1
+            self._datos.clear()
+            self._filas = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / total, 4) if total else None,
+                "evictions": self.evictions,
+                "entradas": len(self._datos),
+                "filas": self._filas,
+                "generacion": self.generacion,
+                "ttl_seconds": self.ttl,
+            }
+
+
+query_cache = QueryCache(CACHE_TTL_SECONDS, CACHE_MAX_ENTRIES, CACHE_MAX_ROWS)
@@ -0,0 +1,202 @@
+"""
+Carga de varios archivos u hojas en una sola operación.
+
+Acepta un ZIP con archivos CSV/XLSX/XLS/Parquet/Arrow o un libro con una hoja por región. Cada
+archivo u hoja se lee, mapea y limpia en paralelo en un pool de procesos; los
+resultados se unen en un único conjunto deduplicado por (nombre, region) (gana
+la última aparición, en el orden del ZIP y de las hojas) que se puntúa y se
+escribe con un solo upsert masivo en una transacción.
+
+El reporte indica, por archivo y hoja, las filas leídas, las válidas, las que
+quedaron en la carga y las descartadas por repetirse en otra fuente.
+"""
+import multiprocessing
+import os
+import shutil
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+from sqlalchemy.orm import Session
+
+from columnar import EXTENSIONES_COLUMNARES
+from data_loader import ERROR_GENERAL, Progreso, _upload_bulk, clean_data, load_file, map_columns
+from metricas import etapa
+
+# Procesos para leer y limpiar las fuentes; con 1 se procesan en el mismo proceso
+UPLOAD_PROCESOS = int(os.getenv("UPLOAD_PROCESOS", os.cpu_count() or 1))
+# Tope del contenido descomprimido de un ZIP
+UPLOAD_ZIP_MAX_MB = int(os.getenv("UPLOAD_ZIP_MAX_MB", 500))
+
+EXTENSIONES = {".csv", ".xlsx", ".xls"} | EXTENSIONES_COLUMNARES
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+# (ruta en disco, nombre a informar, hoja o None para CSV)
+Fuente = Tuple[str, str, Optional[str]]
+
+
+def _obtener_pool() -> ProcessPoolExecutor:
+    """Pool compartido entre cargas; "spawn" evita heredar threads y conexiones del servidor."""
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=UPLOAD_PROCESOS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _pool
+
+
+def _hojas(path: str) -> List[str]:
+    with pd.ExcelFile(path) as libro:
+        return [str(h) for h in libro.sheet_names]
+
+
+def _fuentes_archivo(path: str, nombre: str, todas_las_hojas: bool) -> List[Fuente]:
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv" or ext in EXTENSIONES_COLUMNARES:
+        return [(path, nombre, None)]
+    if todas_las_hojas:
+        return [(path, nombre, hoja) for hoja in _hojas(path)]
+    return [(path, nombre, _hojas(path)[0])]
+
+
+def _extraer_zip(path: str, destino: str) -> Tuple[List[Tuple[str, str]], List[str]]:
+    """
+    Extrae los archivos soportados del ZIP en destino, con nombres propios (no se
+    usan las rutas del ZIP). Retorna ([(ruta, nombre en el ZIP)], errores).
+    """
+    archivos, errores = [], []
+    with zipfile.ZipFile(path) as zf:
+        miembros = [
+            m for m in zf.infolist()
+            if not m.is_dir() and not os.path.basename(m.filename).startswith((".", "~$"))
+            and "__MACOSX/" not in m.filename
+        ]
+        if sum(m.file_size for m in miembros) > UPLOAD_ZIP_MAX_MB * 1024 * 1024:
+            raise ValueError(f"El contenido del ZIP supera {UPLOAD_ZIP_MAX_MB} MB")
+
+        for i, miembro in enumerate(sorted(miembros, key=lambda m: m.filename)):
+            ext = os.path.splitext(miembro.filename)[1].lower()
+            if ext not in EXTENSIONES:
+                errores.append(f"{miembro.filename}: formato no soportado, se omite")
+                continue
+            ruta = os.path.join(destino, f"{i}{ext}")
+            with zf.open(miembro) as origen, open(ruta, "wb") as salida:
+                shutil.copyfileobj(origen, salida)
+            archivos.append((ruta, miembro.filename))
+    return archivos, errores
+
+
+def _procesar_fuente(fuente: Fuente) -> Tuple[Optional[pd.DataFrame], Dict]:
+    """Lee, mapea y limpia una fuente. Corre en los procesos del pool."""
+    path, nombre, hoja = fuente
+    reporte = {"archivo": nombre, "hoja": hoja, "filas_leidas": 0, "filas_validas": 0,
+               "filas_cargadas": 0, "duplicadas": 0, "error": None}
+    try:
+        df = pd.read_excel(path, sheet_name=hoja) if hoja is not None else load_file(path)
+        reporte["filas_leidas"] = len(df)
+        df = clean_data(map_columns(df))
+    except Exception as e:
+        reporte["error"] = str(e)
+        return None, reporte
+    reporte["filas_validas"] = len(df)
+    return df, reporte
+
+
+def _procesar(fuentes: List[Fuente]) -> List[Tuple[Optional[pd.DataFrame], Dict]]:
+    if UPLOAD_PROCESOS <= 1 or len(fuentes) <= 1:
+        return [_procesar_fuente(f) for f in fuentes]
+    return list(_obtener_pool().map(_procesar_fuente, fuentes))
+
+
+def unir_deduplicado(resultados: List[Tuple[Optional[pd.DataFrame], Dict]]) -> pd.DataFrame:
+    """
+    Une los DataFrames en orden y deja una fila por (nombre, region), la última.
+    Completa filas_cargadas y duplicadas en el reporte de cada fuente.
+    """
+    partes = []
+    for posicion, (df, _) in enumerate(resultados):
+        if df is not None and len(df):
+            partes.append(df.assign(_fuente=posicion))
+    if not partes:
+        return pd.DataFrame()
+
+    df = pd.concat(partes, ignore_index=True)
+    df = df.drop_duplicates(subset=["nombre", "region"], keep="last")
+
+    cargadas = df["_fuente"].value_counts()
+    for posicion, (_, reporte) in enumerate(resultados):
+        reporte["filas_cargadas"] = int(cargadas.get(posicion, 0))
+        reporte["duplicadas"] = reporte["filas_validas"] - reporte["filas_cargadas"]
+    return df.drop(columns="_fuente")
+
+
+def upload_multiple(
+    file_path: str,
+    db: Session,
+    nombre: str = None,
+    todas_las_hojas: bool = True,
+    progreso: Optional[Progreso] = None
+) -> Tuple[int, int, int, List[str], List[Dict]]:
+    """
+    Carga un ZIP o un libro XLSX con varias hojas en una sola transacción.
+
+    Args:
+        file_path: Ruta al ZIP, XLSX/XLS o CSV
+        db: Sesión de base de datos
+        nombre: Nombre del archivo a informar en el reporte (por defecto, el de file_path)
+        todas_las_hojas: Lee todas las hojas de cada libro; si no, solo la primera
+        progreso: Callback de avance, como en upload_data
+
+    Returns:
+        Tuple con (records_processed, records_inserted, records_updated, errors,
+                   reporte por archivo y hoja)
+    """
+    nombre = nombre or os.path.basename(file_path)
+    errors: List[str] = []
+    reporte: List[Dict] = []
+
+    try:
+        with tempfile.TemporaryDirectory(prefix="carga_multiple_") as tmp_dir:
+            with etapa("load_file"):
+                if os.path.splitext(file_path)[1].lower() == ".zip":
+                    archivos, errors = _extraer_zip(file_path, tmp_dir)
+                else:
+                    archivos = [(file_path, nombre)]
+
+                fuentes: List[Fuente] = []
+                for ruta, nombre_archivo in archivos:
+                    try:
+                        fuentes.extend(_fuentes_archivo(ruta, nombre_archivo, todas_las_hojas))
+                    except Exception as e:
+                        errors.append(f"{nombre_archivo}: {str(e)}")
+
+            with etapa("parse_paralelo"):
+                resultados = _procesar(fuentes)
+
+        reporte = [r for _, r in resultados]
+        for r in reporte:
+            if r["error"]:
+                hoja = f" / {r['hoja']}" if r["hoja"] else ""
+                errors.append(f"{r['archivo']}{hoja}: {r['error']}")
+
+        with etapa("merge"):
+            df = unir_deduplicado(resultados)
+        if df.empty:
+            return 0, 0, 0, errors, reporte
+
+        records_inserted, records_updated, bulk_errors = _upload_bulk(df, db, progreso)
+        with etapa("commit"):
+            db.commit()
+    except Exception as e:
+        errors.append(f"{ERROR_GENERAL}: {str(e)}")
+        db.rollback()
+        # Nada quedó en la base: el reporte no debe informar filas cargadas
+        for r in reporte:
+            r["filas_cargadas"] = 0
+        return 0, 0, 0, errors, reporte
+
+    return len(df), records_inserted, records_updated, errors + bulk_errors, reporte
@@ -0,0 +1,161 @@
+"""
+Snapshots columnares de voluntarios: exportación Parquet en streaming y lectura
+de Parquet / Arrow IPC en la carga.
+
+La exportación lee la tabla con un cursor del lado del servidor (yield_per),
+arma un RecordBatch de Arrow por bloque y lo escribe como row group de Parquet;
+cada row group se envía al cliente apenas se escribe, así la memoria no depende
+del tamaño de la tabla. Los tipos salen de las columnas de Voluntario (enteros,
+booleanos y timestamps se conservan), por lo que recargar un snapshot no pasa
+por la conversión de texto de CSV/XLSX.
+
+pyarrow y pandas se importan al usarse: sin pyarrow la API funciona igual, salvo
+estos formatos.
+"""
+from __future__ import annotations
+
+import io
+import os
+from typing import TYPE_CHECKING, Iterator, List
+
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Boolean, DateTime, Integer, Select, select
+
+from database import SessionLocal, Voluntario
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# Filas por bloque del cursor y por row group del Parquet exportado
+PARQUET_BATCH_SIZE = int(os.getenv("PARQUET_BATCH_SIZE", 10000))
+# Compresión del Parquet exportado (zstd, snappy, gzip, none)
+PARQUET_COMPRESSION = os.getenv("PARQUET_COMPRESSION", "zstd")
+
+EXTENSIONES_PARQUET = {".parquet"}
+EXTENSIONES_ARROW = {".arrow", ".feather", ".ipc"}
+EXTENSIONES_COLUMNARES = EXTENSIONES_PARQUET | EXTENSIONES_ARROW
+
+COLUMNAS_SNAPSHOT = list(Voluntario.__table__.columns)
+
+
+def esquema_arrow():
+    """Esquema Arrow con los tipos de las columnas de Voluntario."""
+    import pyarrow as pa
+
+    campos = []
+    for columna in COLUMNAS_SNAPSHOT:
+        if isinstance(columna.type, Boolean):
+            tipo = pa.bool_()
+        elif isinstance(columna.type, Integer):
+            tipo = pa.int64()
+        elif isinstance(columna.type, DateTime):
+            tipo = pa.timestamp("us")
+        else:
+            tipo = pa.string()
+        campos.append(pa.field(columna.key, tipo, nullable=columna.nullable))
+    return pa.schema(campos)
+
+
+def select_snapshot() -> Select:
+    return select(*COLUMNAS_SNAPSHOT).order_by(Voluntario.id)
+
+
+class _SalidaStreaming(io.RawIOBase):
+    """Archivo de solo escritura que acumula lo escrito hasta vaciarlo; tell() sigue la posición total."""
+
+    def __init__(self):
+        self._partes: List[bytes] = []
+        self._posicion = 0
+
+    def writable(self):
+        return True
+
+    def write(self, datos):
+        datos = bytes(datos)
+        self._partes.append(datos)
+        self._posicion += len(datos)
+        return len(datos)
+
+    def tell(self):
+        return self._posicion
+
+    def vaciar(self) -> bytes:
+        datos = b"".join(self._partes)
+        self._partes = []
+        return datos
+
+
+def _parquet(query: Select) -> Iterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    esquema = esquema_arrow()
+    salida = _SalidaStreaming()
+    writer = pq.ParquetWriter(salida, esquema, compression=PARQUET_COMPRESSION)
+    # Sesión propia: el generador sigue corriendo después de que el handler retorna
+    db = SessionLocal()
+    try:
+        result = db.execute(query.execution_options(yield_per=PARQUET_BATCH_SIZE))
+        for bloque in result.partitions():
+            columnas = list(zip(*bloque))
+            batch = pa.RecordBatch.from_arrays(
+                [pa.array(valores, type=campo.type) for valores, campo in zip(columnas, esquema)],
+                schema=esquema
+            )
+            writer.write_batch(batch, row_group_size=len(bloque))
+            yield salida.vaciar()
+        writer.close()
+        yield salida.vaciar()
+    finally:
+        db.close()
+
+
+def stream_parquet(query: Select = None) -> StreamingResponse:
+    """Exporta la tabla (o query, con las columnas de COLUMNAS_SNAPSHOT) como Parquet en streaming."""
+    return StreamingResponse(
+        _parquet(query if query is not None else select_snapshot()),
+        media_type="application/vnd.apache.parquet",
+        headers={"Content-Disposition": 'attachment; filename="voluntarios.parquet"'}
+    )
+
+
+def leer_columnar(file_path: str) -> pd.DataFrame:
+    """Lee un Parquet o un Arrow IPC (archivo o stream) con memory map."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext in EXTENSIONES_PARQUET:
+        tabla = pq.read_table(file_path, memory_map=True)
+    else:
+        with pa.memory_map(file_path) as fuente:
+            try:
+                tabla = pa.ipc.open_file(fuente).read_all()
+            except pa.ArrowInvalid:
+                fuente.seek(0)
+                tabla = pa.ipc.open_stream(fuente).read_all()
+    return tabla.to_pandas()
+
+
+def bloques_columnar(file_path: str, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    """Lee un Parquet o Arrow IPC por bloques de hasta chunk_rows filas."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext in EXTENSIONES_PARQUET:
+        archivo = pq.ParquetFile(file_path, memory_map=True)
+        for batch in archivo.iter_batches(batch_size=chunk_rows):
+            yield batch.to_pandas()
+        return
+
+    with pa.memory_map(file_path) as fuente:
+        try:
+            lector = pa.ipc.open_file(fuente)
+            batches = (lector.get_batch(i) for i in range(lector.num_record_batches))
+        except pa.ArrowInvalid:
+            fuente.seek(0)
+            batches = pa.ipc.open_stream(fuente)
+        for batch in batches:
+            for inicio in range(0, batch.num_rows, chunk_rows):
+                yield batch.slice(inicio, chunk_rows).to_pandas()
@@ -1,36 +1,63 @@
 import pandas as pd
 import os
-from typing import Dict, List, Tuple
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from sqlalchemy import tuple_
 from sqlalchemy.orm import Session
-from database import Voluntario
-from inteligencia_predictiva import aplicar_inteligencia_predictiva
-
-# Mapeo de columnas comunes a nombres de BD
-COLUMN_MAPPING = {
-    "nombre": ["nombre", "name", "Nombre", "NOMBRE"],
-    "edad": ["edad", "age", "Edad", "EDAD"],
-    "rango_etario": ["rango_etario", "rango etario", "Rango Etario", "rango"],
-    "region": ["region", "región", "Region", "REGION"],
-    "area_estudio": ["area_estudio", "area estudio", "AreaEstudio", "Especialidad", "area", "Area"],
-    "estado": ["estado", "Estado", "ESTADO", "status"],
-    "razon_no_continuar": ["razon_no_continuar", "razon", "Razon", "motivo"],
-    "tiene_capacitacion": ["tiene_capacitacion", "capacitacion", "Capacitacion", "capacitado"],
-    "programa_asignado": ["programa_asignado", "programa", "Programa", "programa asignado"],
-    "fecha_rechazo_count": ["fecha_rechazo_count", "rechazos", "Rechazos", "rechazo_count"]
+from columnar import EXTENSIONES_COLUMNARES, bloques_columnar, leer_columnar
+from database import SessionLocal, Voluntario, insert_on_conflict
+from duplicados import DEDUP_INGESTA, IndiceDuplicados, consolidar_duplicados
+from encabezados import COLUMN_MAPPING, mapeo_columnas, resolver
+from inteligencia_predictiva import aplicar_inteligencia_predictiva, aplicar_inteligencia_predictiva_df
+from metricas import etapa, observar_etapa
+from particiones import agrupar_por_region, asegurar_particiones, particionada
+
+# Columnas de Voluntario que se escriben en la carga masiva
+COLUMNAS_VOLUNTARIO = [
+    "nombre", "edad", "rango_etario", "region", "area_estudio", "estado",
+    "razon_no_continuar", "tiene_capacitacion", "programa_asignado",
+    "fecha_rechazo_count", "score_riesgo_baja", "flag_brecha_cap", "reglas_version"
+]
+
+# Columnas que genera la BD: un snapshot exportado (columnar.py) las trae, pero
+# la carga no debe escribirlas (chocarían con los id existentes)
+COLUMNAS_GENERADAS = ["id", "created_at", "updated_at"]
+
+# Defaults de columna de Voluntario (estado "Activo", contadores en 0, flags en
+# False). El INSERT masivo lleva todas las columnas, así que el default del ORM no
+# se aplica: las que faltan en el archivo o vienen vacías se completan con estos.
+DEFAULTS_VOLUNTARIO = {
+    col: Voluntario.__table__.c[col].default.arg
+    for col in COLUMNAS_VOLUNTARIO
+    if Voluntario.__table__.c[col].default is not None
 }
 
+# Filas por sentencia INSERT ... ON CONFLICT en la carga masiva
+BULK_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", 1000))
+
+# Filas por bloque leído del archivo en la carga en streaming
+STREAM_CHUNK_ROWS = int(os.getenv("UPLOAD_STREAM_CHUNK_ROWS", 10000))
+
+# Con la tabla particionada, hilos del upsert en paralelo: una región (partición)
+# por tarea, cada una en su propia transacción. 0 o 1: una sola transacción.
+UPLOAD_PARALELO_PARTICIONES = int(os.getenv("UPLOAD_PARALELO_PARTICIONES", 0))
+
+# Prefijo del error que hace fallar la carga completa (rollback, nada escrito)
+ERROR_GENERAL = "Error general"
+
+# Callback de avance: (records_processed, records_inserted, records_updated, errors)
+# con los valores acumulados hasta el momento
+Progreso = Callable[[int, int, int, List[str]], None]
+
 def normalize_column_name(col_name: str) -> str:
     """Normaliza el nombre de columna a formato estándar."""
-    col_lower = str(col_name).strip().lower().replace(" ", "_")
-    
-    for standard_name, variants in COLUMN_MAPPING.items():
-        if col_lower in [v.lower() for v in variants]:
-            return standard_name
-    
-    return col_lower
+    return resolver(col_name).columna
 
 def load_file(file_path: str) -> pd.DataFrame:
-    """Carga un archivo CSV o XLSX y retorna un DataFrame."""
+    """Carga un archivo CSV, XLSX, Parquet o Arrow IPC y retorna un DataFrame."""
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"Archivo no encontrado: {file_path}")
     
@@ -40,24 +67,73 @@ def load_file(file_path: str) -> pd.DataFrame:
         df = pd.read_csv(file_path, encoding="utf-8")
     elif file_ext in [".xlsx", ".xls"]:
         df = pd.read_excel(file_path)
+    elif file_ext in EXTENSIONES_COLUMNARES:
+        df = leer_columnar(file_path)
     else:
         raise ValueError(f"Formato de archivo no soportado: {file_ext}")
     
     return df
 
-def map_columns(df: pd.DataFrame) -> pd.DataFrame:
-    """Mapea las columnas del DataFrame a los nombres estándar de la BD."""
-    column_mapping = {}
+def _xlsx_chunks(file_path: str, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    """Lee la primera hoja de un XLSX en modo read-only de openpyxl, por bloques de filas."""
+    from openpyxl import load_workbook
     
-    for col in df.columns:
-        standard_name = normalize_column_name(col)
-        if standard_name != col:
-            column_mapping[col] = standard_name
+    workbook = load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = [str(c) if c is not None else f"Unnamed: {i}" for i, c in enumerate(header)]
+        
+        n_columns = len(columns)
+        bloque = []
+        for row in rows:
+            # En modo read-only las filas pueden venir más cortas que el encabezado
+            bloque.append(tuple(row[:n_columns]) + (None,) * (n_columns - len(row)))
+            if len(bloque) >= chunk_rows:
+                yield pd.DataFrame(bloque, columns=columns)
+                bloque = []
+        if bloque:
+            yield pd.DataFrame(bloque, columns=columns)
+    finally:
+        workbook.close()
+
+def load_file_chunks(file_path: str, chunk_rows: int = None) -> Iterator[pd.DataFrame]:
+    """
+    Carga un archivo CSV, XLSX, Parquet o Arrow IPC por bloques de chunk_rows filas,
+    sin leerlo completo en memoria. Los .xls (formato antiguo) no admiten lectura por bloques y se
+    cargan completos en un único bloque.
+    """
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(f"Archivo no encontrado: {file_path}")
+    
+    chunk_rows = chunk_rows or STREAM_CHUNK_ROWS
+    file_ext = os.path.splitext(file_path)[1].lower()
+    
+    if file_ext == ".csv":
+        with pd.read_csv(file_path, encoding="utf-8", chunksize=chunk_rows) as reader:
+            yield from reader
+    elif file_ext == ".xlsx":
+        yield from _xlsx_chunks(file_path, chunk_rows)
+    elif file_ext == ".xls":
+        yield load_file(file_path)
+    elif file_ext in EXTENSIONES_COLUMNARES:
+        yield from bloques_columnar(file_path, chunk_rows)
+    else:
+        raise ValueError(f"Formato de archivo no soportado: {file_ext}")
+
+def map_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Mapea las columnas del DataFrame a los nombres estándar de la BD y descarta las
+    COLUMNAS_GENERADAS. La resolución se cachea por firma de encabezado (ver encabezados.py).
+    """
+    column_mapping = mapeo_columnas(list(df.columns))
     
     if column_mapping:
         df = df.rename(columns=column_mapping)
     
-    return df
+    return df.drop(columns=COLUMNAS_GENERADAS, errors="ignore")
 
 def clean_data(df: pd.DataFrame) -> pd.DataFrame:
     """Limpia y valida los datos del DataFrame."""
@@ -72,25 +148,245 @@ def clean_data(df: pd.DataFrame) -> pd.DataFrame:
     
     df = df.dropna(subset=["nombre", "edad", "region"])
     
-    df["edad"] = pd.to_numeric(df["edad"], errors="coerce")
-    df = df.dropna(subset=["edad"])
+    # Los formatos tipados (Parquet / Arrow) ya traen enteros y booleanos
+    if not pd.api.types.is_integer_dtype(df["edad"]):
+        df["edad"] = pd.to_numeric(df["edad"], errors="coerce")
+        df = df.dropna(subset=["edad"])
     df = df[df["edad"] >= 18]
     
     if "tiene_capacitacion" in df.columns:
-        df["tiene_capacitacion"] = df["tiene_capacitacion"].apply(
-            lambda x: str(x).lower() in ["true", "1", "si", "sí", "yes", "verdadero"]
-        )
+        if not pd.api.types.is_bool_dtype(df["tiene_capacitacion"]):
+            df["tiene_capacitacion"] = df["tiene_capacitacion"].apply(
+                lambda x: str(x).lower() in ["true", "1", "si", "sí", "yes", "verdadero"]
+            )
     else:
         df["tiene_capacitacion"] = False
     
     if "fecha_rechazo_count" in df.columns:
-        df["fecha_rechazo_count"] = pd.to_numeric(df["fecha_rechazo_count"], errors="coerce").fillna(0).astype(int)
+        if not pd.api.types.is_integer_dtype(df["fecha_rechazo_count"]):
+            df["fecha_rechazo_count"] = pd.to_numeric(df["fecha_rechazo_count"], errors="coerce").fillna(0).astype(int)
     else:
         df["fecha_rechazo_count"] = 0
     
     return df
 
-def upload_data(file_path: str, file_type: str = None, db: Session = None) -> Tuple[int, int, int, List[str]]:
+def asignar_rango_etario(df: pd.DataFrame) -> pd.DataFrame:
+    """Completa rango_etario a partir de edad para las filas que no lo traen."""
+    df = df.copy()
+    rangos = pd.cut(
+        df["edad"].astype(int),
+        bins=[17, 29, 39, 49, 59, float("inf")],
+        labels=["18-29 años", "30-39 años", "40-49 años", "50-59 años", "60+ años"]
+    ).astype(object)
+    
+    if "rango_etario" in df.columns:
+        vacio = df["rango_etario"].isna() | (df["rango_etario"].astype(str) == "")
+        df["rango_etario"] = df["rango_etario"].where(~vacio, rangos)
+    else:
+        df["rango_etario"] = rangos
+    
+    return df
+
+def _completar_defaults(record: Dict) -> Dict:
+    """Completa con DEFAULTS_VOLUNTARIO las columnas del registro que vienen vacías (None, NaN o "")."""
+    for col, valor in DEFAULTS_VOLUNTARIO.items():
+        if col in record and (pd.isna(record[col]) or record[col] == ""):
+            record[col] = valor
+    return record
+
+def _dataframe_to_records(df: pd.DataFrame) -> List[Dict]:
+    """
+    Convierte el DataFrame en dicts con tipos Python nativos y None en lugar de NaN,
+    con DEFAULTS_VOLUNTARIO en las columnas faltantes o vacías.
+    """
+    df = df.reindex(columns=COLUMNAS_VOLUNTARIO)
+    df = df.astype(object).where(df.notna(), None)
+    records = df.to_dict(orient="records")
+    
+    for record in records:
+        _completar_defaults(record)
+        record["edad"] = int(record["edad"])
+        record["fecha_rechazo_count"] = int(record["fecha_rechazo_count"] or 0)
+        record["score_riesgo_baja"] = int(record["score_riesgo_baja"])
+        record["tiene_capacitacion"] = bool(record["tiene_capacitacion"])
+        record["flag_brecha_cap"] = bool(record["flag_brecha_cap"])
+    
+    return records
+
+def upsert_records(records: List[Dict], db: Session, chunk_size: int = None, progreso: Optional[Progreso] = None) -> Tuple[int, int]:
+    """
+    Inserta o actualiza registros por (nombre, region) con INSERT ... ON CONFLICT.
+    
+    Las claves existentes se consultan una vez por bloque para distinguir
+    inserciones de actualizaciones. Si una clave se repite en los registros,
+    prevalece la última ocurrencia. No hace commit. Si se indica progreso, se
+    llama después de cada bloque.
+    
+    Returns:
+        Tuple con (records_inserted, records_updated)
+    """
+    chunk_size = chunk_size or BULK_CHUNK_SIZE
+    insert = insert_on_conflict(db.get_bind().dialect.name)
+    records_inserted = 0
+    records_updated = 0
+    
+    for start in range(0, len(records), chunk_size):
+        chunk = records[start:start + chunk_size]
+        
+        # Una sola sentencia no puede afectar dos veces la misma fila
+        por_clave = {}
+        for record in chunk:
+            por_clave[(record["nombre"], record["region"])] = record
+        
+        existentes = set(
+            db.query(Voluntario.nombre, Voluntario.region).filter(
+                tuple_(Voluntario.nombre, Voluntario.region).in_(list(por_clave))
+            ).all()
+        )
+        records_updated += len(chunk) - len(por_clave)
+        records_updated += sum(1 for clave in por_clave if clave in existentes)
+        records_inserted += sum(1 for clave in por_clave if clave not in existentes)
+        
+        stmt = insert(Voluntario.__table__)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["nombre", "region"],
+            set_={
+                col: stmt.excluded[col]
+                for col in COLUMNAS_VOLUNTARIO
+                if col not in ["nombre", "region"]
+            } | {"updated_at": datetime.utcnow()}
+        )
+        # executemany: SQLAlchemy agrupa los parámetros en INSERT multi-fila
+        db.execute(stmt, list(por_clave.values()))
+        
+        if progreso:
+            progreso(start + len(chunk), records_inserted, records_updated, [])
+    
+    return records_inserted, records_updated
+
+def _preparar_particiones(regiones, db: Session):
+    """
+    Crea las particiones de las regiones nuevas. Solo si db todavía no abrió su
+    transacción: la creación espera el lock exclusivo de voluntarios, que la
+    propia carga impediría si ya leyó o escribió la tabla.
+    """
+    if particionada() and not db.in_transaction():
+        with etapa("particiones"):
+            asegurar_particiones(set(regiones))
+
+def upsert_por_particion(records: List[Dict], workers: int, progreso: Optional[Progreso] = None) -> Tuple[int, int, List[str]]:
+    """
+    Upsert en paralelo, una región (partición) por tarea, cada una en su propia
+    sesión y transacción. Las regiones no comparten filas del índice único ni del
+    resumen, así que los hilos no se bloquean entre sí. No es atómico: si una
+    región falla, las demás quedan escritas y el error se informa por región.
+    
+    Returns:
+        Tuple con (records_inserted, records_updated, errors)
+    """
+    grupos = agrupar_por_region(records)
+    avance: Dict[str, Tuple[int, int, int]] = {}
+    lock = threading.Lock()
+    
+    def cargar(region: str, grupo: List[Dict]) -> Tuple[int, int]:
+        def progreso_region(procesados: int, inserted: int, updated: int, _errors: List[str]):
+            with lock:
+                avance[region] = (procesados, inserted, updated)
+                totales = [sum(v[i] for v in avance.values()) for i in range(3)]
+            if progreso:
+                progreso(*totales, [])
+        
+        db = SessionLocal()
+        try:
+            resultado = upsert_records(grupo, db, progreso=progreso_region)
+            db.commit()
+            return resultado
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+    
+    records_inserted = 0
+    records_updated = 0
+    errors = []
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="upsert-particion") as pool:
+        futuros = {region: pool.submit(cargar, region, grupo) for region, grupo in grupos.items()}
+        for region, futuro in futuros.items():
+            try:
+                inserted, updated = futuro.result()
+                records_inserted += inserted
+                records_updated += updated
+            except Exception as e:
+                errors.append(f"Error cargando la región {region}: {str(e)}")
+    return records_inserted, records_updated, errors
+
+def _upload_bulk(
+    df: pd.DataFrame,
+    db: Session,
+    progreso: Optional[Progreso] = None,
+    indice: Optional[IndiceDuplicados] = None
+) -> Tuple[int, int, List[str]]:
+    """
+    Carga masiva por columnas: rango etario y scores vectorizados, upsert por bloques.
+    Con la tabla particionada y UPLOAD_PARALELO_PARTICIONES > 1, el upsert se
+    reparte por partición (ver upsert_por_particion).
+    """
+    _preparar_particiones(df["region"], db)
+    errors = []
+    if DEDUP_INGESTA:
+        with etapa("duplicados"):
+            df, errors = consolidar_duplicados(df, db, indice)
+    with etapa("scoring"):
+        df = asignar_rango_etario(df)
+        df = aplicar_inteligencia_predictiva_df(df)
+        records = _dataframe_to_records(df)
+    with etapa("upsert"):
+        if UPLOAD_PARALELO_PARTICIONES > 1 and particionada():
+            records_inserted, records_updated, upsert_errors = upsert_por_particion(records, UPLOAD_PARALELO_PARTICIONES, progreso)
+            errors.extend(upsert_errors)
+        else:
+            records_inserted, records_updated = upsert_records(records, db, progreso=progreso)
+    return records_inserted, records_updated, errors
+
+def _upload_streaming(file_path: str, db: Session, progreso: Optional[Progreso] = None) -> Tuple[int, int, int, List[str]]:
+    """Carga masiva bloque a bloque: lee, mapea, limpia, calcula y escribe un bloque a la vez."""
+    records_processed = 0
+    records_inserted = 0
+    records_updated = 0
+    errors = []
+    # Un solo índice de duplicados para todos los bloques del archivo
+    indice = IndiceDuplicados() if DEDUP_INGESTA else None
+    
+    chunks = load_file_chunks(file_path)
+    while True:
+        with etapa("load_file"):
+            chunk = next(chunks, None)
+        if chunk is None:
+            break
+        with etapa("map_columns"):
+            chunk = map_columns(chunk)
+        with etapa("clean_data"):
+            chunk = clean_data(chunk)
+        inserted, updated, chunk_errors = _upload_bulk(chunk, db, indice=indice)
+        records_processed += len(chunk)
+        records_inserted += inserted
+        records_updated += updated
+        errors.extend(chunk_errors)
+        
+        if progreso:
+            progreso(records_processed, records_inserted, records_updated, errors)
+    
+    return records_processed, records_inserted, records_updated, errors
+
+def upload_data(
+    file_path: str,
+    file_type: str = None,
+    db: Session = None,
+    bulk: bool = False,
+    streaming: bool = False,
+    progreso: Optional[Progreso] = None
+) -> Tuple[int, int, int, List[str]]:
     """
     Función principal para cargar datos desde archivo CSV o XLSX.
     
@@ -98,24 +394,63 @@ def upload_data(file_path: str, file_type: str = None, db: Session = None) -> Tu
         file_path: Ruta al archivo
         file_type: Tipo de archivo (csv/xlsx) - se detecta automáticamente si es None
         db: Sesión de base de datos
+        bulk: Usa la carga masiva por columnas (INSERT ... ON CONFLICT por bloques)
+              en lugar de procesar fila por fila. Requiere el índice único
+              (nombre, region) de schema.sql.
+        streaming: Carga masiva leyendo el archivo por bloques, con memoria acotada
+                   sin importar el tamaño del archivo. Implica bulk.
+        progreso: Callback opcional que recibe el avance acumulado
+                  (records_processed, records_inserted, records_updated, errors)
+                  durante la carga. Los valores son previos al commit final.
     
     Returns:
-        Tuple con (records_processed, records_inserted, records_updated, errors)
+        Tuple con (records_processed, records_inserted, records_updated, errors).
+        Si la carga falla completa (error ERROR_GENERAL), se hace rollback y
+        records_inserted y records_updated son 0.
     """
     errors = []
+    records_processed = 0
     records_inserted = 0
     records_updated = 0
     
     try:
-        df = load_file(file_path)
-        df = map_columns(df)
-        df = clean_data(df)
+        if streaming:
+            records_processed, records_inserted, records_updated, errors = _upload_streaming(file_path, db, progreso)
+            with etapa("commit"):
+                db.commit()
+            return records_processed, records_inserted, records_updated, errors
+        
+        with etapa("load_file"):
+            df = load_file(file_path)
+        with etapa("map_columns"):
+            df = map_columns(df)
+        with etapa("clean_data"):
+            df = clean_data(df)
         
         records_processed = len(df)
         
-        for _, row in df.iterrows():
+        if bulk:
+            records_inserted, records_updated, errors = _upload_bulk(df, db, progreso)
+            with etapa("commit"):
+                db.commit()
+            return records_processed, records_inserted, records_updated, errors
+        
+        _preparar_particiones(df["region"], db)
+        if DEDUP_INGESTA:
+            with etapa("duplicados"):
+                df, errors = consolidar_duplicados(df, db)
+        
+        # Fila por fila las etapas se acumulan y se registran al final
+        segundos_scoring = 0.0
+        segundos_upsert = 0.0
+        # Voluntarios nuevos de este archivo por (nombre, region): la sesión no hace
+        # autoflush, así que la consulta no los ve. Como en la carga masiva, si la
+        # clave se repite prevalece la última ocurrencia.
+        nuevos: Dict[Tuple[str, str], Voluntario] = {}
+        for posicion, (_, row) in enumerate(df.iterrows(), start=1):
             try:
-                voluntario_dict = row.to_dict()
+                inicio = time.perf_counter()
+                voluntario_dict = _completar_defaults(row.to_dict())
                 
                 voluntario_dict["rango_etario"] = voluntario_dict.get("rango_etario")
                 if not voluntario_dict["rango_etario"]:
@@ -132,8 +467,11 @@ def upload_data(file_path: str, file_type: str = None, db: Session = None) -> Tu
                         voluntario_dict["rango_etario"] = "60+ años"
                 
                 voluntario_dict = aplicar_inteligencia_predictiva(voluntario_dict)
+                segundos_scoring += time.perf_counter() - inicio
                 
-                existing = db.query(Voluntario).filter(
+                inicio = time.perf_counter()
+                clave = (voluntario_dict["nombre"], voluntario_dict["region"])
+                existing = nuevos.get(clave) or db.query(Voluntario).filter(
                     Voluntario.nombre == voluntario_dict["nombre"],
                     Voluntario.region == voluntario_dict["region"]
                 ).first()
@@ -146,16 +484,27 @@ def upload_data(file_path: str, file_type: str = None, db: Session = None) -> Tu
                 else:
                     nuevo_voluntario = Voluntario(**voluntario_dict)
                     db.add(nuevo_voluntario)
+                    nuevos[clave] = nuevo_voluntario
                     records_inserted += 1
+                segundos_upsert += time.perf_counter() - inicio
                     
             except Exception as e:
                 errors.append(f"Error procesando fila {_ + 1}: {str(e)}")
+            
+            if progreso and posicion % BULK_CHUNK_SIZE == 0:
+                progreso(posicion, records_inserted, records_updated, errors)
         
-        db.commit()
+        observar_etapa("scoring", segundos_scoring)
+        observar_etapa("upsert", segundos_upsert)
+        with etapa("commit"):
+            db.commit()
         
     except Exception as e:
-        errors.append(f"Error general: {str(e)}")
+        errors.append(f"{ERROR_GENERAL}: {str(e)}")
         db.rollback()
+        # Con el rollback no queda nada escrito
+        records_inserted = 0
+        records_updated = 0
     
     return records_processed, records_inserted, records_updated, errors
 
@@ -0,0 +1,257 @@
+"""
+Detección de voluntarios casi duplicados ("José Pérez" / "Jose Perez ").
+
+Los nombres se comparan por su clave normalizada (sin acentos, minúsculas,
+espacios y puntuación colapsados) y por similitud de Jaccard entre sus
+trigramas de caracteres. Para no comparar todos contra todos, cada nombre se
+resume en una firma MinHash que se divide en bandas (LSH): solo se comparan los
+nombres de la misma región (bloque) que coinciden en al menos una banda.
+
+Se usa en dos lugares:
+- En la carga (DEDUP_INGESTA=true): las filas cuya clave normalizada coincide con
+  un voluntario existente, o con otra fila del archivo, toman su nombre y región
+  y se consolidan como actualización. Las que solo son similares no se fusionan:
+  se informan como "Posible duplicado".
+- En reporte_duplicados.py, que recorre la tabla completa región por región.
+"""
+import os
+import re
+import unicodedata
+import zlib
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from database import Voluntario
+
+DEDUP_INGESTA = os.getenv("DEDUP_INGESTA", "False").lower() == "true"
+# Similitud de Jaccard (trigramas) desde la que dos nombres se consideran posibles duplicados
+DUPLICADOS_UMBRAL = float(os.getenv("DUPLICADOS_UMBRAL", 0.7))
+
+# Firma MinHash: BANDAS bandas de PERMUTACIONES / BANDAS valores. Con 16 x 3 un
+# par con similitud 0.7 es candidato con probabilidad > 0.99 y uno de 0.3 con ~0.35
+PERMUTACIONES = 64
+BANDAS = 16
+_FILAS_BANDA = PERMUTACIONES // BANDAS
+# Hash multiply-shift por permutación: (a * x + b) mod 2^64, bits altos; a impar
+_rng = np.random.default_rng(20240601)
+_A = _rng.integers(0, np.iinfo(np.uint64).max, PERMUTACIONES, dtype=np.uint64, endpoint=True) | np.uint64(1)
+_B = _rng.integers(0, np.iinfo(np.uint64).max, PERMUTACIONES, dtype=np.uint64, endpoint=True)
+# Mezcla los valores de cada banda en un solo entero (clave del bucket)
+_C = _rng.integers(0, np.iinfo(np.uint64).max, _FILAS_BANDA, dtype=np.uint64, endpoint=True) | np.uint64(1)
+
+# Conjuntos por bloque al calcular firmas (acota la matriz PERMUTACIONES x trigramas)
+_BLOQUE_FIRMAS = 2000
+
+_NO_ALFANUMERICO = re.compile(r"[^a-z0-9]+")
+
+
+@lru_cache(maxsize=65536)
+def normalizar_texto(texto) -> str:
+    """Minúsculas, sin acentos y con las palabras separadas por un espacio."""
+    texto = unicodedata.normalize("NFKD", str(texto or ""))
+    texto = "".join(c for c in texto if not unicodedata.combining(c)).lower()
+    return _NO_ALFANUMERICO.sub(" ", texto).strip()
+
+
+def trigramas(clave: str) -> Set[str]:
+    relleno = f" {clave} "
+    return {relleno[i:i + 3] for i in range(len(relleno) - 2)}
+
+
+def jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+def firmas(conjuntos: List[Set[str]]) -> np.ndarray:
+    """Firmas MinHash (una fila por conjunto de trigramas), calculadas por bloques con NumPy."""
+    resultado = np.zeros((len(conjuntos), PERMUTACIONES), dtype=np.uint64)
+    for inicio in range(0, len(conjuntos), _BLOQUE_FIRMAS):
+        grupo = conjuntos[inicio:inicio + _BLOQUE_FIRMAS]
+        largos = np.fromiter((len(g) for g in grupo), dtype=np.int64, count=len(grupo))
+        if not largos.any():
+            continue
+        x = np.fromiter(
+            (zlib.crc32(g.encode()) for gramas in grupo for g in gramas),
+            dtype=np.uint64, count=int(largos.sum())
+        )
+        with np.errstate(over="ignore"):
+            hashes = (_A[:, None] * x[None, :] + _B[:, None]) >> np.uint64(32)
+        # Mínimo por conjunto; los conjuntos vacíos no tienen segmento y quedan en 0
+        no_vacios = np.flatnonzero(largos)
+        desde = (np.cumsum(largos) - largos)[no_vacios]
+        resultado[inicio + no_vacios] = np.minimum.reduceat(hashes, desde, axis=1).T
+    return resultado
+
+
+def firma(gramas: Set[str]) -> np.ndarray:
+    """Firma MinHash de un conjunto de trigramas."""
+    return firmas([gramas])[0]
+
+
+def claves_bandas(valores: np.ndarray) -> List[List[int]]:
+    """Por firma, un entero por banda que resume sus valores."""
+    with np.errstate(over="ignore"):
+        mezcla = (valores.reshape(len(valores), BANDAS, _FILAS_BANDA) * _C).sum(axis=2, dtype=np.uint64)
+    return mezcla.tolist()
+
+
+class Entrada(NamedTuple):
+    id: Optional[int]
+    nombre: str
+    region: str
+    clave: str
+    gramas: frozenset
+
+
+class Par(NamedTuple):
+    a: Entrada
+    b: Entrada
+    similitud: float
+    # exacto (misma clave normalizada) | similar
+    tipo: str
+
+
+class IndiceDuplicados:
+    """Índice de nombres bloqueado por región normalizada, con LSH sobre firmas MinHash."""
+
+    def __init__(self, umbral: float = None):
+        self.umbral = DUPLICADOS_UMBRAL if umbral is None else umbral
+        self.entradas: List[Entrada] = []
+        # (región, clave) -> posición de la primera entrada con esa clave
+        self._claves: Dict[Tuple[str, str], int] = {}
+        # (región, banda, valores de la banda) -> posiciones
+        self._buckets: Dict[Tuple, List[int]] = {}
+        self._regiones_cargadas: Set[str] = set()
+
+    def __len__(self):
+        return len(self.entradas)
+
+    def _indexar(self, entrada: Entrada, region_clave: str, bandas: List[int]):
+        posicion = len(self.entradas)
+        self.entradas.append(entrada)
+        self._claves.setdefault((region_clave, entrada.clave), posicion)
+        for banda, valor in enumerate(bandas):
+            self._buckets.setdefault((region_clave, banda, valor), []).append(posicion)
+
+    def agregar(self, nombre: str, region: str, id: Optional[int] = None, valores: np.ndarray = None) -> Entrada:
+        """Agrega un nombre. valores es su firma, si ya se calculó (ver firmas())."""
+        clave = normalizar_texto(nombre)
+        entrada = Entrada(id, nombre, region, clave, frozenset(trigramas(clave)))
+        if valores is None:
+            valores = firma(entrada.gramas)
+        self._indexar(entrada, normalizar_texto(region), claves_bandas(valores[None, :])[0])
+        return entrada
+
+    def agregar_lote(self, filas: Iterable[Tuple[str, str, Optional[int]]]):
+        """Agrega (nombre, region, id) calculando las firmas en bloque."""
+        entradas = []
+        for nombre, region, id in filas:
+            clave = normalizar_texto(nombre)
+            entradas.append(Entrada(id, nombre, region, clave, frozenset(trigramas(clave))))
+        bandas = claves_bandas(firmas([e.gramas for e in entradas]))
+        for entrada, bandas_entrada in zip(entradas, bandas):
+            self._indexar(entrada, normalizar_texto(entrada.region), bandas_entrada)
+
+    def exacto(self, nombre: str, region: str) -> Optional[Entrada]:
+        """Entrada con la misma clave normalizada en la misma región, si existe."""
+        posicion = self._claves.get((normalizar_texto(region), normalizar_texto(nombre)))
+        return self.entradas[posicion] if posicion is not None else None
+
+    def similares(self, nombre: str, region: str, valores: np.ndarray = None) -> List[Tuple[Entrada, float]]:
+        """Entradas de la región con similitud >= umbral y distinta clave, de mayor a menor."""
+        clave = normalizar_texto(nombre)
+        gramas = trigramas(clave)
+        if valores is None:
+            valores = firma(gramas)
+        region_clave = normalizar_texto(region)
+        candidatos: Set[int] = set()
+        for banda, valor in enumerate(claves_bandas(valores[None, :])[0]):
+            candidatos.update(self._buckets.get((region_clave, banda, valor), ()))
+
+        resultado = []
+        for posicion in candidatos:
+            entrada = self.entradas[posicion]
+            if entrada.clave == clave:
+                continue
+            similitud = jaccard(gramas, entrada.gramas)
+            if similitud >= self.umbral:
+                resultado.append((entrada, similitud))
+        return sorted(resultado, key=lambda r: -r[1])
+
+    def pares(self) -> Iterator[Par]:
+        """Todos los pares de posibles duplicados del índice, cada uno una vez."""
+        vistos: Set[Tuple[int, int]] = set()
+        for posiciones in self._buckets.values():
+            if len(posiciones) < 2:
+                continue
+            for i, p in enumerate(posiciones):
+                for q in posiciones[i + 1:]:
+                    if (p, q) in vistos:
+                        continue
+                    vistos.add((p, q))
+                    a, b = self.entradas[p], self.entradas[q]
+                    if a.clave == b.clave:
+                        yield Par(a, b, 1.0, "exacto")
+                        continue
+                    similitud = jaccard(a.gramas, b.gramas)
+                    if similitud >= self.umbral:
+                        yield Par(a, b, similitud, "similar")
+
+    def cargar_regiones(self, db: Session, regiones: Iterable[str]):
+        """Agrega los voluntarios existentes de las regiones (comparadas normalizadas) aún no cargadas."""
+        pendientes = {normalizar_texto(r) for r in regiones} - self._regiones_cargadas
+        if not pendientes:
+            return
+        en_bd = [r for r in db.execute(select(Voluntario.region).distinct()).scalars() if normalizar_texto(r) in pendientes]
+        if en_bd:
+            query = select(Voluntario.nombre, Voluntario.region, Voluntario.id).where(Voluntario.region.in_(en_bd))
+            self.agregar_lote(db.execute(query).all())
+        self._regiones_cargadas |= pendientes
+
+
+def consolidar_duplicados(df: pd.DataFrame, db: Session, indice: IndiceDuplicados = None) -> Tuple[pd.DataFrame, List[str]]:
+    """
+    Reemplaza nombre y región de las filas cuya clave normalizada ya existe (en la
+    BD o antes en el archivo) por los ya registrados, para que la carga las
+    consolide. Las filas solo similares se cargan tal cual y se informan.
+
+    Args:
+        df: Filas limpias (con nombre y region)
+        indice: Índice a reutilizar entre bloques de una misma carga
+
+    Returns:
+        Tuple con (df consolidado, avisos de posibles duplicados)
+    """
+    indice = indice if indice is not None else IndiceDuplicados()
+    indice.cargar_regiones(db, df["region"].dropna().unique())
+
+    valores = firmas([trigramas(normalizar_texto(nombre)) for nombre in df["nombre"]])
+    nombres, regiones, avisos = [], [], []
+    for nombre, region, firma_fila in zip(df["nombre"], df["region"], valores):
+        existente = indice.exacto(nombre, region)
+        if existente is not None:
+            nombres.append(existente.nombre)
+            regiones.append(existente.region)
+            continue
+        similares = indice.similares(nombre, region, firma_fila)
+        if similares:
+            entrada, similitud = similares[0]
+            referencia = f"id {entrada.id}" if entrada.id is not None else "en el archivo"
+            avisos.append(
+                f"Posible duplicado: '{nombre}' ({region}) ~ '{entrada.nombre}' ({referencia}, similitud {similitud:.2f})"
+            )
+        indice.agregar(nombre, region, valores=firma_fila)
+        nombres.append(nombre)
+        regiones.append(region)
+
+    df = df.copy()
+    df["nombre"] = nombres
+    df["region"] = regiones
+    return df, avisos
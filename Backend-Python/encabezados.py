@@ -0,0 +1,173 @@
+"""
+Resolución de encabezados de planillas a las columnas de la BD.
+
+La tabla de búsqueda se construye una vez al importar, con cada variante de
+COLUMN_MAPPING normalizada: sin acentos, en minúsculas, con espacios y
+puntuación reducidos a "_" y sin conectores ("de", "del", ...). Así "Área de
+Estudio", "REGIÓN " y "area-estudio" resuelven sin listar cada forma.
+
+Se pueden registrar alias propios con registrar_alias() o en un JSON
+{columna: [alias, ...]} indicado en COLUMN_ALIASES_PATH. Con COLUMN_FUZZY=true
+los encabezados sin coincidencia exacta se comparan por similitud y se aceptan
+sobre COLUMN_FUZZY_MIN_SCORE, informando la confianza.
+
+El resultado se guarda por firma de encabezado (la tupla completa), así las
+cargas repetidas con la misma plantilla no vuelven a resolver.
+"""
+import difflib
+import json
+import logging
+import os
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Mapeo de columnas comunes a nombres de BD
+COLUMN_MAPPING = {
+    "nombre": ["nombre", "name", "Nombre", "NOMBRE"],
+    "edad": ["edad", "age", "Edad", "EDAD"],
+    "rango_etario": ["rango_etario", "rango etario", "Rango Etario", "rango"],
+    "region": ["region", "región", "Region", "REGION"],
+    "area_estudio": ["area_estudio", "area estudio", "AreaEstudio", "Especialidad", "area", "Area"],
+    "estado": ["estado", "Estado", "ESTADO", "status"],
+    "razon_no_continuar": ["razon_no_continuar", "razon", "Razon", "motivo"],
+    "tiene_capacitacion": ["tiene_capacitacion", "capacitacion", "Capacitacion", "capacitado"],
+    "programa_asignado": ["programa_asignado", "programa", "Programa", "programa asignado"],
+    "fecha_rechazo_count": ["fecha_rechazo_count", "rechazos", "Rechazos", "rechazo_count"]
+}
+
+COLUMN_ALIASES_PATH = os.getenv("COLUMN_ALIASES_PATH")
+COLUMN_FUZZY = os.getenv("COLUMN_FUZZY", "False").lower() == "true"
+COLUMN_FUZZY_MIN_SCORE = float(os.getenv("COLUMN_FUZZY_MIN_SCORE", 0.85))
+# Firmas de encabezado distintas que se recuerdan
+COLUMN_CACHE_SIZE = int(os.getenv("COLUMN_CACHE_SIZE", 256))
+
+# Palabras que no cambian el significado del encabezado
+CONECTORES = {"de", "del", "la", "el", "los", "las", "en", "y"}
+
+_NO_ALFANUMERICO = re.compile(r"[^a-z0-9]+")
+_CAMEL_CASE = re.compile(r"(?<=[a-z])(?=[A-Z])")
+
+
+class Resolucion(NamedTuple):
+    original: str
+    columna: str
+    # exacto | alias | fuzzy | sin_mapeo
+    metodo: str
+    confianza: float
+
+
+def normalizar(encabezado) -> str:
+    """Forma canónica de un encabezado: sin acentos, minúsculas, palabras unidas por '_'."""
+    texto = unicodedata.normalize("NFKD", str(encabezado))
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+    # CamelCase ("AreaEstudio") se separa antes de pasar a minúsculas
+    texto = _CAMEL_CASE.sub("_", texto).lower()
+    palabras = [p for p in _NO_ALFANUMERICO.split(texto) if p and p not in CONECTORES]
+    return "_".join(palabras)
+
+
+def _clave(normalizado: str) -> str:
+    # Sin separadores, para que "AREAESTUDIO" y "Area Estudio" coincidan
+    return normalizado.replace("_", "")
+
+
+# Tabla clave -> (columna, método)
+_tabla: Dict[str, Tuple[str, str]] = {}
+
+
+def _agregar(variante: str, columna: str, metodo: str):
+    clave = _clave(normalizar(variante))
+    if clave:
+        _tabla[clave] = (columna, metodo)
+
+
+for _columna, _variantes in COLUMN_MAPPING.items():
+    _agregar(_columna, _columna, "exacto")
+    for _variante in _variantes:
+        _agregar(_variante, _columna, "exacto")
+
+
+def registrar_alias(alias: str, columna: str):
+    """Agrega un alias para una columna de la BD y descarta las firmas ya resueltas."""
+    if columna not in COLUMN_MAPPING:
+        raise ValueError(f"Columna desconocida: {columna}")
+    _agregar(alias, columna, "alias")
+    resolver_encabezados.cache_clear()
+
+
+def cargar_alias(path: str):
+    """Registra los alias de un JSON {columna: [alias, ...]}."""
+    with open(path, encoding="utf-8") as f:
+        for columna, aliases in json.load(f).items():
+            for alias in aliases:
+                registrar_alias(alias, columna)
+
+
+def _fuzzy(clave: str) -> Optional[Tuple[str, float]]:
+    mejor, confianza = None, 0.0
+    for candidato in _tabla:
+        ratio = difflib.SequenceMatcher(None, clave, candidato).ratio()
+        if ratio > confianza:
+            mejor, confianza = candidato, ratio
+    if mejor is not None and confianza >= COLUMN_FUZZY_MIN_SCORE:
+        return _tabla[mejor][0], confianza
+    return None
+
+
+def resolver(encabezado) -> Resolucion:
+    """Resuelve un encabezado suelto, sin cache ni conflictos con otras columnas."""
+    normalizado = normalizar(encabezado)
+    clave = _clave(normalizado)
+    if clave in _tabla:
+        columna, metodo = _tabla[clave]
+        return Resolucion(str(encabezado), columna, metodo, 1.0)
+    if COLUMN_FUZZY and clave:
+        encontrado = _fuzzy(clave)
+        if encontrado:
+            return Resolucion(str(encabezado), encontrado[0], "fuzzy", round(encontrado[1], 3))
+    return Resolucion(str(encabezado), normalizado, "sin_mapeo", 0.0)
+
+
+@lru_cache(maxsize=COLUMN_CACHE_SIZE)
+def resolver_encabezados(encabezados: Tuple) -> Tuple[Resolucion, ...]:
+    """
+    Resuelve todos los encabezados de un archivo. Si dos encabezados apuntan a la
+    misma columna, la conserva el de mayor confianza (a igualdad, el primero); los
+    demás quedan sin mapeo con su forma normalizada.
+    """
+    resoluciones = [resolver(e) for e in encabezados]
+
+    ganador: Dict[str, int] = {}
+    for i, r in enumerate(resoluciones):
+        if r.metodo == "sin_mapeo":
+            continue
+        actual = ganador.get(r.columna)
+        if actual is None or r.confianza > resoluciones[actual].confianza:
+            ganador[r.columna] = i
+
+    resultado = []
+    for i, r in enumerate(resoluciones):
+        if r.metodo != "sin_mapeo" and ganador[r.columna] != i:
+            r = Resolucion(r.original, normalizar(r.original), "sin_mapeo", 0.0)
+        elif r.metodo == "fuzzy":
+            logger.info("Encabezado '%s' mapeado a %s por similitud (%.2f)", r.original, r.columna, r.confianza)
+        resultado.append(r)
+    return tuple(resultado)
+
+
+def mapeo_columnas(encabezados: List) -> Dict:
+    """{encabezado original: columna} de los encabezados que cambian de nombre."""
+    resoluciones = resolver_encabezados(tuple(str(e) for e in encabezados))
+    return {
+        encabezado: r.columna
+        for encabezado, r in zip(encabezados, resoluciones)
+        if r.columna != encabezado
+    }
+
+
+if COLUMN_ALIASES_PATH:
+    cargar_alias(COLUMN_ALIASES_PATH)
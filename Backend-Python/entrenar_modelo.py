@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Script para entrenar el modelo de retención con el histórico de la tabla
+voluntarios (etiqueta: estado == "Inactivo").
+
+Reserva una fracción de las filas para evaluar y reporta el AUC del modelo y el
+del score de reglas vigente sobre las mismas filas. El artefacto se guarda en
+MODELO_RETENCION_PATH (o --salida) y se usa al arrancar con MODELO_RETENCION=true.
+Después de publicar un modelo nuevo, rescore.py recalcula la tabla.
+
+Uso:
+    python entrenar_modelo.py
+    python entrenar_modelo.py --l2 5 --fraccion-prueba 0.3 --salida /tmp/modelo.json
+    python entrenar_modelo.py --min-auc 0.65   # no guarda si el AUC queda bajo el umbral
+"""
+import argparse
+import sys
+import time
+
+import pandas as pd
+from sqlalchemy import select
+
+from database import SessionLocal, Voluntario
+from modelo_retencion import COLUMNAS_ENTRADA, MODELO_RETENCION_PATH, entrenar, guardar
+from reglas import motor_actual
+
+def leer_voluntarios() -> pd.DataFrame:
+    """Columnas del modelo, de las reglas y estado de toda la tabla."""
+    columnas = list(dict.fromkeys(COLUMNAS_ENTRADA + [r.campo for r in motor_actual().reglas] + ["estado"]))
+    db = SessionLocal()
+    try:
+        filas = db.execute(select(*[getattr(Voluntario, c) for c in columnas])).all()
+    finally:
+        db.close()
+    return pd.DataFrame(filas, columns=columnas)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--l2", type=float, default=1.0, help="Regularización L2 de los pesos")
+    parser.add_argument("--fraccion-prueba", type=float, default=0.2)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--salida", default=MODELO_RETENCION_PATH)
+    parser.add_argument("--min-auc", type=float, help="AUC mínimo en prueba para guardar el artefacto")
+    args = parser.parse_args()
+
+    print("Leyendo voluntarios...")
+    df = leer_voluntarios()
+    if df.empty or df["estado"].eq("Inactivo").sum() == 0 or df["estado"].ne("Inactivo").sum() == 0:
+        print("❌ Se necesitan voluntarios Inactivo y no Inactivo para entrenar")
+        sys.exit(1)
+
+    inicio = time.perf_counter()
+    modelo, metricas = entrenar(df, l2=args.l2, fraccion_prueba=args.fraccion_prueba, seed=args.seed)
+    print(f"✅ Modelo {modelo.version} entrenado en {time.perf_counter() - inicio:.1f}s")
+    print(f"   Filas entrenamiento / prueba: {metricas['filas_entrenamiento']} / {metricas['filas_prueba']}")
+    print(f"   Tasa de inactivos: {metricas['tasa_inactivos']:.1%}")
+    print(f"   AUC modelo: {metricas['auc_modelo']:.4f}")
+    print(f"   AUC reglas (versión {metricas['reglas_version']}): {metricas['auc_reglas']:.4f}")
+
+    if args.min_auc is not None and not metricas["auc_modelo"] >= args.min_auc:
+        print(f"❌ AUC bajo el mínimo de {args.min_auc}; el artefacto no se guarda")
+        sys.exit(1)
+
+    guardar(modelo, args.salida)
+    print(f"   Artefacto guardado en {args.salida}")
+
+if __name__ == "__main__":
+    main()
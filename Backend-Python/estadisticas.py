@@ -0,0 +1,73 @@
+"""
+Estadísticas del dashboard desde la tabla pre-agregada voluntarios_resumen.
+
+Las consultas agrupan el resumen (una fila por combinación de dimensiones y
+tramo de score), cuyo tamaño no depende de la cantidad de voluntarios, así que
+/api/stats nunca recorre la tabla voluntarios.
+"""
+from typing import Dict, List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database import Voluntario, VoluntariosResumen
+
+# Dimensiones del cubo: columnas de Voluntario presentes en el resumen
+DIMENSIONES = [
+    Voluntario.region.key,
+    Voluntario.estado.key,
+    Voluntario.rango_etario.key,
+    Voluntario.area_estudio.key,
+]
+
+# Tramos del histograma de score: 0-9, 10-19, ..., 90-100
+SCORE_BUCKETS = 10
+
+
+def _histograma_vacio() -> List[int]:
+    return [0] * SCORE_BUCKETS
+
+
+async def calcular_stats(db: AsyncSession, filtros: Optional[Dict[str, str]] = None) -> Dict:
+    """
+    Retorna total, histograma de score y voluntarios con brecha, global y por cada
+    dimensión. filtros restringe el cubo por igualdad en una o más dimensiones.
+    """
+    condiciones = [
+        getattr(VoluntariosResumen, dimension) == valor
+        for dimension, valor in (filtros or {}).items()
+        if valor is not None
+    ]
+
+    resultado = {"total": 0, "con_brecha": 0, "histograma": _histograma_vacio()}
+    for dimension in DIMENSIONES:
+        columna = getattr(VoluntariosResumen, dimension)
+        query = (
+            select(
+                columna,
+                VoluntariosResumen.score_bucket,
+                func.sum(VoluntariosResumen.total).label("total"),
+                func.sum(VoluntariosResumen.con_brecha).label("con_brecha"),
+            )
+            .where(*condiciones)
+            .group_by(columna, VoluntariosResumen.score_bucket)
+            .having(func.sum(VoluntariosResumen.total) > 0)
+        )
+
+        grupos = {}
+        for valor, bucket, total, con_brecha in (await db.execute(query)).all():
+            grupo = grupos.setdefault(valor, {"valor": valor or None, "total": 0, "con_brecha": 0, "histograma": _histograma_vacio()})
+            grupo["total"] += int(total)
+            grupo["con_brecha"] += int(con_brecha)
+            grupo["histograma"][bucket] += int(total)
+
+        resultado[f"por_{dimension}"] = sorted(grupos.values(), key=lambda g: -g["total"])
+
+    # Los totales globales salen de cualquiera de los desgloses
+    for grupo in resultado[f"por_{DIMENSIONES[0]}"]:
+        resultado["total"] += grupo["total"]
+        resultado["con_brecha"] += grupo["con_brecha"]
+        for bucket, total in enumerate(grupo["histograma"]):
+            resultado["histograma"][bucket] += total
+
+    return resultado
@@ -0,0 +1,135 @@
+"""
+Lectura del registro de cambios de score (tabla voluntarios_eventos).
+
+Los eventos los escriben triggers en la misma transacción que el registro, el
+PUT o la carga (ver schema.sql), así que un evento existe si y solo si el cambio
+se confirmó. Los consumidores leen en orden (xid, id) con un cursor "xid:id":
+
+- En PostgreSQL los id se asignan antes del commit, así que un evento con id menor
+  puede aparecer después de uno mayor. Como en rpa_cola.py, solo se entregan los
+  eventos de transacciones con xid menor al xmin del snapshot (todas terminadas):
+  ninguna transacción nueva puede quedar antes del cursor.
+- En SQLite (un solo escritor) xid es 0 y el orden es el de id.
+
+/api/eventos/score responde con long-poll (espera hasta que haya eventos) y
+/api/eventos/score/stream con Server-Sent Events (el id de cada evento es su
+cursor, así Last-Event-ID retoma la conexión donde quedó).
+"""
+import asyncio
+import os
+import time
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+from fastapi import Request
+from sqlalchemy import select, text, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database import EventoScore, engine, get_async_db
+from exportar import json_bytes
+
+# Eventos por respuesta del long-poll y por bloque del stream SSE
+EVENTOS_LIMIT = int(os.getenv("EVENTOS_LIMIT", 1000))
+# Espera máxima de un long-poll, en segundos
+EVENTOS_ESPERA_MAX = float(os.getenv("EVENTOS_ESPERA_MAX", 30))
+# Intervalo entre consultas mientras no hay eventos nuevos
+EVENTOS_POLL_SEGUNDOS = float(os.getenv("EVENTOS_POLL_SEGUNDOS", 0.5))
+# Comentario SSE enviado sin eventos para mantener viva la conexión
+EVENTOS_HEARTBEAT_SEGUNDOS = float(os.getenv("EVENTOS_HEARTBEAT_SEGUNDOS", 15))
+
+COLUMNAS_EVENTO = [
+    EventoScore.id,
+    EventoScore.tipo,
+    EventoScore.voluntario_id,
+    EventoScore.score_anterior,
+    EventoScore.score_nuevo,
+    EventoScore.flag_anterior,
+    EventoScore.flag_nuevo,
+    EventoScore.creado_en,
+]
+
+Cursor = Tuple[int, int]
+CURSOR_INICIAL: Cursor = (0, 0)
+
+
+def leer_cursor(cursor: Optional[str]) -> Cursor:
+    """Convierte "xid:id" en (xid, id); sin cursor, el inicio del registro."""
+    if not cursor:
+        return CURSOR_INICIAL
+    try:
+        xid, id = (int(parte) for parte in cursor.split(":"))
+    except ValueError:
+        raise ValueError(f"Cursor inválido: {cursor!r} (se espera 'xid:id')")
+    return xid, id
+
+
+def formatear_cursor(cursor: Cursor) -> str:
+    return f"{cursor[0]}:{cursor[1]}"
+
+
+async def _limite_xid(db: AsyncSession) -> Optional[int]:
+    if engine.dialect.name != "postgresql":
+        return None
+    return (await db.execute(text("SELECT txid_snapshot_xmin(txid_current_snapshot())"))).scalar()
+
+
+async def leer_eventos(db: AsyncSession, cursor: Cursor, limit: int = None) -> Tuple[List[Dict], Cursor]:
+    """
+    Eventos posteriores a cursor, hasta limit, en orden.
+
+    Returns:
+        Tuple con (eventos, cursor para la próxima lectura)
+    """
+    limite_xid = await _limite_xid(db)
+    query = (
+        select(EventoScore.xid, *COLUMNAS_EVENTO)
+        .where(tuple_(EventoScore.xid, EventoScore.id) > tuple_(*cursor))
+        .order_by(EventoScore.xid, EventoScore.id)
+        .limit(limit or EVENTOS_LIMIT)
+    )
+    if limite_xid is not None:
+        query = query.where(EventoScore.xid < limite_xid)
+
+    eventos = []
+    for fila in (await db.execute(query)).mappings():
+        cursor = (fila["xid"], fila["id"])
+        evento = {c.key: fila[c.key] for c in COLUMNAS_EVENTO}
+        evento["cursor"] = formatear_cursor(cursor)
+        eventos.append(evento)
+    return eventos, cursor
+
+
+async def esperar_eventos(db: AsyncSession, cursor: Cursor, limit: int = None, espera: float = 0) -> Tuple[List[Dict], Cursor]:
+    """Como leer_eventos, pero si no hay eventos consulta de nuevo hasta por espera segundos."""
+    limite = time.monotonic() + min(espera, EVENTOS_ESPERA_MAX)
+    while True:
+        eventos, siguiente = await leer_eventos(db, cursor, limit)
+        if eventos or time.monotonic() >= limite:
+            return eventos, siguiente
+        # Libera la conexión mientras espera
+        await db.rollback()
+        await asyncio.sleep(min(EVENTOS_POLL_SEGUNDOS, max(limite - time.monotonic(), 0)))
+
+
+async def stream_eventos(request: Request, cursor: Cursor, limit: int = None) -> AsyncIterator[bytes]:
+    """Eventos como Server-Sent Events, desde cursor y hasta que el cliente se desconecte."""
+    # Sesión propia: el generador sigue corriendo después de que el handler retorna
+    sesion = get_async_db()
+    db = await anext(sesion)
+    try:
+        ultimo_envio = time.monotonic()
+        while not await request.is_disconnected():
+            eventos, cursor = await leer_eventos(db, cursor, limit)
+            await db.rollback()
+            if eventos:
+                yield b"".join(
+                    b"id: " + evento["cursor"].encode() + b"\nevent: score\ndata: " + json_bytes(evento) + b"\n\n"
+                    for evento in eventos
+                )
+                ultimo_envio = time.monotonic()
+                continue
+            if time.monotonic() - ultimo_envio >= EVENTOS_HEARTBEAT_SEGUNDOS:
+                yield b": ping\n\n"
+                ultimo_envio = time.monotonic()
+            await asyncio.sleep(EVENTOS_POLL_SEGUNDOS)
+    finally:
+        await sesion.aclose()
@@ -0,0 +1,113 @@
+"""
+Respuestas en streaming (NDJSON / CSV) para exportar voluntarios.
+
+Las filas se leen con un cursor del lado del servidor (yield_per) y se envían
+por bloques a medida que llegan, así la memoria del servidor no depende del
+tamaño del resultado.
+
+También arma las respuestas JSON de los listados sin pasar por response_model:
+las filas ya se validaron al escribirse, así que se codifican directo a bytes
+con orjson (o con el serializador de Pydantic si orjson no está instalado).
+"""
+import csv
+import io
+import json
+import os
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from fastapi import Response
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+from sqlalchemy import Result, Select, select
+
+from database import SessionLocal, Voluntario
+from models import VoluntarioResponse
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Filas por bloque leído del cursor y enviado al cliente
+STREAM_BATCH_SIZE = int(os.getenv("STREAM_BATCH_SIZE", 1000))
+
+# Columnas de la respuesta, en el orden de VoluntarioResponse
+COLUMNAS_RESPUESTA = [getattr(Voluntario, nombre) for nombre in VoluntarioResponse.model_fields]
+CLAVES_RESPUESTA = [c.key for c in COLUMNAS_RESPUESTA]
+
+# Serializador de Pydantic, sin validación, cuando orjson no está instalado
+_json_adapter = TypeAdapter(Any)
+
+FORMATOS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+def select_voluntarios() -> Select:
+    """SELECT de las columnas de VoluntarioResponse, sin hidratar objetos ORM."""
+    return select(*COLUMNAS_RESPUESTA)
+
+
+def filas(result: Result) -> List[Dict]:
+    """Filas de un select_voluntarios() como dicts, armados desde las tuplas."""
+    return [dict(zip(CLAVES_RESPUESTA, fila)) for fila in result.all()]
+
+
+def json_bytes(datos) -> bytes:
+    """Codifica datos a JSON sin validarlos."""
+    if orjson is not None:
+        return orjson.dumps(datos)
+    return _json_adapter.dump_json(datos)
+
+
+def respuesta_json(datos, headers: Optional[Dict[str, str]] = None) -> Response:
+    """Respuesta JSON ya codificada: FastAPI no la valida contra response_model."""
+    return Response(content=json_bytes(datos), media_type="application/json", headers=headers)
+
+
+def _json_default(valor):
+    if isinstance(valor, datetime):
+        return valor.isoformat()
+    raise TypeError(f"Tipo no serializable: {type(valor).__name__}")
+
+
+def _iterar_bloques(query: Select) -> Iterator[list]:
+    # Sesión propia: el generador sigue corriendo después de que el handler retorna
+    db = SessionLocal()
+    try:
+        result = db.execute(query.execution_options(yield_per=STREAM_BATCH_SIZE))
+        for bloque in result.mappings().partitions():
+            yield bloque
+    finally:
+        db.close()
+
+
+def _ndjson(query: Select) -> Iterator[bytes]:
+    for bloque in _iterar_bloques(query):
+        if orjson is not None:
+            yield b"".join(orjson.dumps(dict(fila)) + b"\n" for fila in bloque)
+        else:
+            yield "".join(json.dumps(dict(fila), default=_json_default, ensure_ascii=False) + "\n" for fila in bloque).encode()
+
+
+def _csv(query: Select) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow([c.key for c in COLUMNAS_RESPUESTA])
+    for bloque in _iterar_bloques(query):
+        writer.writerows(fila.values() for fila in bloque)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+def stream_voluntarios(query: Select, formato: str) -> StreamingResponse:
+    """Retorna el resultado de query como respuesta NDJSON o CSV en streaming."""
+    generador = _ndjson(query) if formato == "ndjson" else _csv(query)
+    headers = {}
+    if formato == "csv":
+        headers["Content-Disposition"] = 'attachment; filename="voluntarios.csv"'
+    return StreamingResponse(generador, media_type=FORMATOS[formato], headers=headers)
@@ -2,16 +2,17 @@
 """
 Script para inicializar la base de datos
 """
-from database import init_db, engine, Base
+from database import init_db, version_esquema
 import sys
 
 def main():
     print("Inicializando base de datos...")
     try:
-        Base.metadata.create_all(bind=engine)
+        init_db(forzar=True)
         print("✅ Base de datos inicializada correctamente")
         print("   Tabla 'voluntarios' creada con todos los campos requeridos")
         print("   Índices y triggers configurados")
+        print(f"   Versión del esquema: {version_esquema()}")
     except Exception as e:
         print(f"❌ Error al inicializar base de datos: {e}")
         sys.exit(1)
@@ -1,37 +1,49 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, List, Tuple, Union
+
+from modelo_retencion import ModeloRetencion, modelo_actual
+from reglas import DatosColumnares, MotorReglas, columna, motor_actual, por_valor
+
+# Solo para anotaciones: NumPy y pandas se cargan en el camino por columnas (reglas.py)
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+# Campos que usa calcular_flag_brecha
+CAMPOS_FLAG = ["area_estudio", "tiene_capacitacion"]
+
+Motor = Union[ModeloRetencion, MotorReglas]
+
+def motor_vigente() -> Motor:
+    """Modelo de retención si está cargado, si no el motor de reglas vigente."""
+    return modelo_actual() or motor_actual()
+
+def version_reglas() -> str:
+    """
+    Versión vigente del scoring: la del modelo de retención si está cargado, si no
+    la de las reglas (campo "version" de reglas_score.json). Cada fila guarda la
+    versión con que se calculó y rescore.py recalcula las que tienen otra.
+    """
+    return motor_vigente().version
+
+def campos_entrada(motor: Motor = None) -> List[str]:
+    """Campos del registro que usan el score de motor (por defecto el vigente) y el flag."""
+    motor = motor or motor_vigente()
+    return list(dict.fromkeys(motor.campos + CAMPOS_FLAG))
+
 def calcular_score_riesgo(voluntario_data: dict) -> int:
     """
-    Calcula el score de riesgo de baja (0-100).
+    Calcula el score de riesgo de baja (0-100) con las reglas de reglas_score.json.
     
-    Lógica de asignación de puntos:
+    Reglas vigentes (versión 1):
     - Si razon_no_continuar incluye "Falta de Tiempo": +40 puntos
     - Si rango_etario es "18-29 años": +35 puntos
     - Si estado es "Receso" o "Activo sin Asignación": +25 puntos
     - Si fecha_rechazo_count >= 2: +20 puntos
     - Si programa_asignado es NULL o vacío: +15 puntos
     """
-    score = 0
-    
-    razon = str(voluntario_data.get("razon_no_continuar", "")).lower()
-    if "falta de tiempo" in razon or "tiempo" in razon:
-        score += 40
-    
-    rango_etario = str(voluntario_data.get("rango_etario", ""))
-    if "18-29" in rango_etario:
-        score += 35
-    
-    estado = str(voluntario_data.get("estado", ""))
-    if estado in ["Receso", "Sin Asignación"]:
-        score += 25
-    
-    fecha_rechazo_count = int(voluntario_data.get("fecha_rechazo_count", 0))
-    if fecha_rechazo_count >= 2:
-        score += 20
-    
-    programa_asignado = voluntario_data.get("programa_asignado")
-    if not programa_asignado or programa_asignado.strip() == "":
-        score += 15
-    
-    return min(score, 100)
+    return motor_actual().score(voluntario_data)
 
 def calcular_flag_brecha(voluntario_data: dict) -> bool:
     """
@@ -52,12 +64,61 @@ def calcular_flag_brecha(voluntario_data: dict) -> bool:
 def aplicar_inteligencia_predictiva(voluntario_data: dict) -> dict:
     """
     Aplica ambas funciones de inteligencia predictiva y retorna los resultados.
+    Con el modelo de retención cargado, score_riesgo_baja es su probabilidad de
+    baja x 100; si no, el score de reglas.
     """
-    score = calcular_score_riesgo(voluntario_data)
-    flag_brecha = calcular_flag_brecha(voluntario_data)
-    
-    voluntario_data["score_riesgo_baja"] = score
-    voluntario_data["flag_brecha_cap"] = flag_brecha
+    motor = motor_vigente()
+    voluntario_data["score_riesgo_baja"] = motor.score(voluntario_data)
+    voluntario_data["flag_brecha_cap"] = calcular_flag_brecha(voluntario_data)
+    voluntario_data["reglas_version"] = motor.version
     
     return voluntario_data
 
+
+def calcular_score_riesgo_batch(datos: DatosColumnares) -> np.ndarray:
+    """
+    Versión por columnas de calcular_score_riesgo.
+    
+    Args:
+        datos: DataFrame o dict {columna: arreglo}. Las columnas ausentes se
+               tratan como en el dict de calcular_score_riesgo.
+    
+    Returns:
+        Arreglo de enteros con el score de cada fila, idéntico al de
+        calcular_score_riesgo. Los nulos se tratan como valores vacíos.
+    """
+    return motor_actual().score_batch(datos)
+
+def calcular_flag_brecha_batch(datos: DatosColumnares) -> np.ndarray:
+    """
+    Versión por columnas de calcular_flag_brecha.
+    
+    Returns:
+        Arreglo booleano con el flag de cada fila, idéntico al de
+        calcular_flag_brecha. Un tiene_capacitacion nulo cuenta como FALSE.
+    """
+    area_estudio = columna(datos, "area_estudio")
+    es_salud = por_valor(area_estudio, lambda v: str(v).upper() == "SALUD")
+    
+    tiene_capacitacion = columna(datos, "tiene_capacitacion")
+    capacitado = por_valor(tiene_capacitacion, lambda v: bool(v))
+    
+    return es_salud & ~capacitado
+
+def puntuar_columnas(datos: DatosColumnares, motor: Motor = None) -> Tuple[np.ndarray, np.ndarray, str]:
+    """
+    Score, flag y versión de un lote, calculados con un mismo motor (modelo de
+    retención o reglas; por defecto el vigente) aunque las reglas se recarguen
+    durante el cálculo.
+    """
+    motor = motor or motor_vigente()
+    return motor.score_batch(datos), calcular_flag_brecha_batch(datos), motor.version
+
+def aplicar_inteligencia_predictiva_df(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Versión por columnas de aplicar_inteligencia_predictiva para cargas masivas.
+    Retorna una copia del DataFrame con score_riesgo_baja y flag_brecha_cap.
+    """
+    df = df.copy()
+    df["score_riesgo_baja"], df["flag_brecha_cap"], df["reglas_version"] = puntuar_columnas(df)
+    return df
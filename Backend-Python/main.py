@@ -1,22 +1,50 @@
-from fastapi import FastAPI, Depends, HTTPException, UploadFile, File, Query
+from fastapi import FastAPI, Depends, HTTPException, UploadFile, File, Query, Request, Response, Body, Header
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from database import get_db, init_db, Voluntario
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, List, Optional
+from database import get_async_db, Voluntario
+from arranque import estado_listo, preparar
 from models import (
     VoluntarioCreate, 
     VoluntarioResponse, 
     VoluntarioSearch,
-    FileUploadResponse
+    UploadJobResponse,
+    UploadJobStatus,
+    StatsResponse,
+    RegistroBatchResponse,
+    EventosScoreResponse
 )
 from inteligencia_predictiva import aplicar_inteligencia_predictiva
-from data_loader import upload_data
+from reglas import motor_actual
+from upload_jobs import crear_job, obtener_job
+from columnar import EXTENSIONES_COLUMNARES, select_snapshot, stream_parquet
+from exportar import FORMATOS, filas, respuesta_json, select_voluntarios, stream_voluntarios
+from busqueda import aplicar_filtros, resolver_regiones
+from rpa_cola import COLUMNAS_RPA, RPA_COLA, leer_cola
+from eventos import EVENTOS_ESPERA_MAX, EVENTOS_LIMIT, esperar_eventos, formatear_cursor, leer_cursor, stream_eventos
+from cache import query_cache
+from estadisticas import calcular_stats
+from registro_batch import ERROR_DUPLICADO, REGISTRO_BATCH_MAX, registrar_lote
+from metricas import METRICS_ENABLED, MetricasMiddleware, exportar_metricas
 import os
 from dotenv import load_dotenv
 import tempfile
 
 load_dotenv()
 
+# Carga masiva por columnas con INSERT ... ON CONFLICT (ver data_loader.upload_data)
+UPLOAD_BULK = os.getenv("UPLOAD_BULK", "False").lower() == "true"
+# Carga masiva leyendo el archivo por bloques (memoria acotada, implica bulk)
+UPLOAD_STREAMING = os.getenv("UPLOAD_STREAMING", "False").lower() == "true"
+# Tamaño de los bloques con que se copia el archivo subido a disco
+UPLOAD_COPY_CHUNK_BYTES = 1024 * 1024
+# Listados codificados directo a JSON, sin validar cada fila contra VoluntarioResponse
+RESPUESTA_JSON_RAPIDA = os.getenv("RESPUESTA_JSON_RAPIDA", "False").lower() == "true"
+
 app = FastAPI(
     title="Sistema de Inteligencia Predictiva de Voluntariado - Teletón",
     description="MVP del sistema de predicción de retención y optimización de talento",
@@ -31,12 +59,50 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
-# Inicializar BD al arrancar
+# Latencia por endpoint para /metrics
+if METRICS_ENABLED:
+    app.add_middleware(MetricasMiddleware)
+
+# Patrón del parámetro formato de los endpoints con respuesta en streaming
+FORMATO_PATTERN = f"^({'|'.join(FORMATOS)})$"
+
+def _set_next_cursor(response: Response, voluntarios: list, limit: int):
+    """Si la página vino completa, informa en X-Next-Cursor el id desde donde seguir."""
+    if len(voluntarios) == limit:
+        response.headers["X-Next-Cursor"] = str(voluntarios[-1]["id"])
+
+def _responder_lista(response: Response, voluntarios: list, limit: int):
+    """
+    Retorna la página de un listado con su X-Next-Cursor. Con RESPUESTA_JSON_RAPIDA
+    las filas se codifican directo a bytes y no pasan por response_model.
+    """
+    if RESPUESTA_JSON_RAPIDA:
+        response = respuesta_json(voluntarios)
+    _set_next_cursor(response, voluntarios, limit)
+    return response if RESPUESTA_JSON_RAPIDA else voluntarios
+
+def _clave_busqueda(search: VoluntarioSearch, after_id: Optional[int], limit: int) -> tuple:
+    """Clave de cache de una búsqueda: igual para el body y el query string."""
+    filtros = search.model_dump()
+    # Los filtros de texto no distinguen mayúsculas (ILIKE)
+    for campo in ["region", "area_estudio", "programa_asignado"]:
+        if filtros[campo]:
+            filtros[campo] = filtros[campo].lower()
+    return tuple(sorted(filtros.items())) + (("after_id", after_id), ("limit", limit))
+
+# Verificar el esquema al arrancar; el pool se calienta en segundo plano (ver /health/ready)
 @app.on_event("startup")
 async def startup_event():
-    init_db()
+    await preparar()
+
+@app.get("/health/ready")
+async def health_ready():
+    """Readiness: 200 con el esquema verificado, el pool de conexiones caliente y la BD respondiendo; si no, 503."""
+    estado = await estado_listo()
+    return JSONResponse(estado, status_code=200 if estado["listo"] else 503)
 
 @app.get("/")
 async def root():
@@ -45,20 +111,24 @@ async def root():
         "version": "1.0.0",
         "endpoints": {
             "registro": "/api/voluntarios/registro",
+            "registro_batch": "/api/voluntarios/registro/batch",
             "listado": "/api/voluntarios/",
             "busqueda": "/api/voluntarios/search",
-            "rpa_accion_urgente": "/api/rpa/accion_urgente"
+            "rpa_accion_urgente": "/api/rpa/accion_urgente",
+            "estadisticas": "/api/stats",
+            "eventos_score": "/api/eventos/score"
         }
     }
 
 @app.post("/api/voluntarios/registro", response_model=VoluntarioResponse)
 async def registrar_voluntario(
     voluntario: VoluntarioCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     RF-01: Registro de un nuevo voluntario.
     Calcula automáticamente score_riesgo_baja y flag_brecha_cap.
+    Si ya existe un voluntario con el mismo nombre y región responde 409.
     """
     try:
         voluntario_dict = voluntario.dict()
@@ -66,29 +136,87 @@ async def registrar_voluntario(
         
         nuevo_voluntario = Voluntario(**voluntario_dict)
         db.add(nuevo_voluntario)
-        db.commit()
-        db.refresh(nuevo_voluntario)
+        await db.commit()
+        query_cache.invalidar()
+        await db.refresh(nuevo_voluntario)
         
         return nuevo_voluntario
+    except IntegrityError:
+        # Índice único (nombre, region)
+        await db.rollback()
+        raise HTTPException(status_code=409, detail=ERROR_DUPLICADO)
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=400, detail=f"Error al registrar voluntario: {str(e)}")
 
+@app.post("/api/voluntarios/registro/batch", response_model=RegistroBatchResponse)
+async def registrar_voluntarios_batch(
+    voluntarios: List[Any] = Body(...),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Registro de una lista de voluntarios (hasta REGISTRO_BATCH_MAX) en una transacción.
+    Los elementos inválidos o ya existentes (mismo nombre y región) se informan en
+    errores con su índice; el resto del lote se registra igual.
+    """
+    if len(voluntarios) > REGISTRO_BATCH_MAX:
+        raise HTTPException(
+            status_code=413,
+            detail=f"El lote supera el máximo de {REGISTRO_BATCH_MAX} voluntarios"
+        )
+    
+    try:
+        registrados, errores = await registrar_lote(db, voluntarios)
+    except Exception as e:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail=f"Error al registrar voluntarios: {str(e)}")
+    
+    if registrados:
+        query_cache.invalidar()
+    
+    return RegistroBatchResponse(
+        total_recibidos=len(voluntarios),
+        total_registrados=len(registrados),
+        registrados=registrados,
+        errores=errores
+    )
+
 @app.get("/api/voluntarios/", response_model=List[VoluntarioResponse])
 async def listar_voluntarios(
+    response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
-    db: Session = Depends(get_db)
+    after_id: Optional[int] = Query(None, ge=0),
+    formato: Optional[str] = Query(None, pattern=FORMATO_PATTERN),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Retorna la lista completa de voluntarios, incluyendo score_riesgo_baja y flag_brecha_cap.
+    
+    Paginación por cursor: after_id retorna los voluntarios con id mayor, ordenados
+    por id; el header X-Next-Cursor trae el after_id de la página siguiente.
+    skip sigue disponible pero se vuelve lento en páginas profundas.
+    Con formato=ndjson|csv retorna todos los voluntarios desde after_id en streaming.
     """
-    voluntarios = db.query(Voluntario).offset(skip).limit(limit).all()
-    return voluntarios
+    if formato:
+        query = select_voluntarios().order_by(Voluntario.id)
+        if after_id is not None:
+            query = query.where(Voluntario.id > after_id)
+        return stream_voluntarios(query, formato)
+    
+    query = select_voluntarios().order_by(Voluntario.id)
+    if after_id is not None:
+        query = query.where(Voluntario.id > after_id)
+    else:
+        query = query.offset(skip)
+    
+    voluntarios = filas(await db.execute(query.limit(limit)))
+    return _responder_lista(response, voluntarios, limit)
 
 @app.get("/api/voluntarios/search", response_model=List[VoluntarioResponse])
 @app.post("/api/voluntarios/search", response_model=List[VoluntarioResponse])
 async def buscar_voluntarios(
+    response: Response,
     search: Optional[VoluntarioSearch] = None,
     min_score_riesgo: Optional[int] = Query(None, ge=0, le=100),
     region: Optional[str] = Query(None),
@@ -96,112 +224,248 @@ async def buscar_voluntarios(
     brecha_pendiente: Optional[bool] = Query(None),
     estado: Optional[str] = Query(None),
     programa_asignado: Optional[str] = Query(None),
-    db: Session = Depends(get_db)
+    after_id: Optional[int] = Query(None, ge=0),
+    limit: int = Query(1000, ge=1, le=1000),
+    formato: Optional[str] = Query(None, pattern=FORMATO_PATTERN),
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     RF-03.2: Motor de Búsqueda con filtros.
     Acepta parámetros como min_score_riesgo, region, area_estudio, brecha_pendiente.
+    
+    Resultados ordenados por id y paginados por cursor (after_id, limit); el header
+    X-Next-Cursor trae el after_id de la página siguiente. Con formato=ndjson|csv
+    retorna todos los resultados desde after_id en streaming, sin límite.
+    Con la tabla particionada, el filtro region solo recorre las particiones de
+    las regiones que contienen el término.
     """
-    query = db.query(Voluntario)
-    
-    if search:
-        if search.min_score_riesgo is not None:
-            query = query.filter(Voluntario.score_riesgo_baja >= search.min_score_riesgo)
-        if search.region:
-            query = query.filter(Voluntario.region.ilike(f"%{search.region}%"))
-        if search.area_estudio:
-            query = query.filter(Voluntario.area_estudio.ilike(f"%{search.area_estudio}%"))
-        if search.brecha_pendiente is not None:
-            query = query.filter(Voluntario.flag_brecha_cap == search.brecha_pendiente)
-        if search.estado:
-            query = query.filter(Voluntario.estado == search.estado)
-        if search.programa_asignado:
-            query = query.filter(Voluntario.programa_asignado.ilike(f"%{search.programa_asignado}%"))
-    else:
-        if min_score_riesgo is not None:
-            query = query.filter(Voluntario.score_riesgo_baja >= min_score_riesgo)
-        if region:
-            query = query.filter(Voluntario.region.ilike(f"%{region}%"))
-        if area_estudio:
-            query = query.filter(Voluntario.area_estudio.ilike(f"%{area_estudio}%"))
-        if brecha_pendiente is not None:
-            query = query.filter(Voluntario.flag_brecha_cap == brecha_pendiente)
-        if estado:
-            query = query.filter(Voluntario.estado == estado)
-        if programa_asignado:
-            query = query.filter(Voluntario.programa_asignado.ilike(f"%{programa_asignado}%"))
-    
-    voluntarios = query.all()
-    return voluntarios
+    if search is None:
+        search = VoluntarioSearch(
+            min_score_riesgo=min_score_riesgo,
+            region=region,
+            area_estudio=area_estudio,
+            brecha_pendiente=brecha_pendiente,
+            estado=estado,
+            programa_asignado=programa_asignado
+        )
+    
+    if formato:
+        regiones = await resolver_regiones(db, search.region)
+        query = aplicar_filtros(select_voluntarios(), search, regiones).order_by(Voluntario.id)
+        if after_id is not None:
+            query = query.where(Voluntario.id > after_id)
+        return stream_voluntarios(query, formato)
+    
+    async def buscar():
+        regiones = await resolver_regiones(db, search.region)
+        query = aplicar_filtros(select_voluntarios(), search, regiones).order_by(Voluntario.id)
+        if after_id is not None:
+            query = query.where(Voluntario.id > after_id)
+        return filas(await db.execute(query.limit(limit)))
+    
+    voluntarios = await query_cache.obtener_o_calcular("search", _clave_busqueda(search, after_id, limit), buscar)
+    return _responder_lista(response, voluntarios, limit)
+
+@app.get("/api/voluntarios/export.parquet")
+async def exportar_parquet(after_id: Optional[int] = Query(None, ge=0)):
+    """
+    Snapshot de la tabla en Parquet (todas las columnas, con sus tipos), en
+    streaming desde un cursor del lado del servidor. Se puede volver a cargar
+    tal cual en /api/voluntarios/upload.
+    """
+    query = select_snapshot()
+    if after_id is not None:
+        query = query.where(Voluntario.id > after_id)
+    return stream_parquet(query)
 
 @app.get("/api/rpa/accion_urgente", response_model=List[dict])
-async def rpa_accion_urgente(db: Session = Depends(get_db)):
+async def rpa_accion_urgente(
+    response: Response,
+    since: Optional[int] = Query(None, ge=0),
+    region: Optional[str] = Query(None, description="Solo voluntarios de esta región (igualdad exacta)"),
+    db: AsyncSession = Depends(get_async_db)
+):
     """
     RF-04: Retorna lista de IDs de voluntarios que cumplen condiciones de activación RPA.
     Condiciones: score_riesgo_baja > 75 O flag_brecha_cap = TRUE
+    
+    Con RPA_COLA=true (PostgreSQL) se lee de la cola rpa_accion_urgente y el header X-Next-Cursor
+    trae el valor de since para el próximo poll. Con since solo se retornan los
+    voluntarios que entraron (urgente=true) o salieron (urgente=false) del conjunto
+    desde ese poll.
+    
+    Con region la consulta se limita a esa región; con la tabla particionada solo
+    recorre su partición.
     """
-    voluntarios = db.query(Voluntario).filter(
-        (Voluntario.score_riesgo_baja > 75) | (Voluntario.flag_brecha_cap == True)
-    ).all()
-    
-    return [
-        {
-            "id": v.id,
-            "nombre": v.nombre,
-            "region": v.region,
-            "score_riesgo_baja": v.score_riesgo_baja,
-            "flag_brecha_cap": v.flag_brecha_cap,
-            "estado": v.estado,
-            "programa_asignado": v.programa_asignado
-        }
-        for v in voluntarios
-    ]
+    if RPA_COLA:
+        voluntarios, cursor = await query_cache.obtener_o_calcular("rpa", (since, region), lambda: leer_cola(db, since, region))
+        response.headers["X-Next-Cursor"] = str(cursor)
+        return voluntarios
+    
+    if since is not None:
+        raise HTTPException(status_code=400, detail="El parámetro since requiere RPA_COLA=true (PostgreSQL)")
+    
+    async def accion_urgente():
+        query = select(*COLUMNAS_RPA).where(
+            (Voluntario.score_riesgo_baja > 75) | (Voluntario.flag_brecha_cap == True)
+        )
+        if region is not None:
+            query = query.where(Voluntario.region == region)
+        voluntarios = (await db.execute(query)).mappings()
+        return [dict(v) for v in voluntarios]
+    
+    return await query_cache.obtener_o_calcular("rpa", (None, region), accion_urgente)
+
+@app.get("/api/eventos/score", response_model=EventosScoreResponse)
+async def eventos_score(
+    cursor: Optional[str] = Query(None, description="Cursor 'xid:id' de la respuesta anterior"),
+    limit: int = Query(EVENTOS_LIMIT, ge=1, le=10000),
+    espera: float = Query(0, ge=0, le=EVENTOS_ESPERA_MAX, description="Segundos a esperar si no hay eventos"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Cambios de score_riesgo_baja y flag_brecha_cap (y altas / bajas) posteriores a
+    cursor, con los valores anterior y nuevo. Sin cursor se lee desde el inicio del
+    registro. Con espera > 0 la respuesta se retiene (long-poll) hasta que haya
+    eventos o se cumpla el plazo; el cursor retornado se usa en la consulta siguiente.
+    """
+    try:
+        posicion = leer_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    eventos, siguiente = await esperar_eventos(db, posicion, limit, espera)
+    return {"eventos": eventos, "cursor": formatear_cursor(siguiente)}
 
-@app.post("/api/voluntarios/upload", response_model=FileUploadResponse)
+@app.get("/api/eventos/score/stream")
+async def eventos_score_stream(
+    request: Request,
+    cursor: Optional[str] = Query(None, description="Cursor 'xid:id' desde donde empezar"),
+    last_event_id: Optional[str] = Header(None)
+):
+    """
+    Los mismos eventos que /api/eventos/score como Server-Sent Events. El id de cada
+    evento es su cursor: al reconectar, el header Last-Event-ID retoma desde ahí.
+    """
+    try:
+        posicion = leer_cursor(last_event_id or cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return StreamingResponse(
+        stream_eventos(request, posicion),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.get("/api/stats", response_model=StatsResponse)
+async def estadisticas(
+    region: Optional[str] = Query(None),
+    estado: Optional[str] = Query(None),
+    rango_etario: Optional[str] = Query(None),
+    area_estudio: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Estadísticas del dashboard: total, histograma de score_riesgo_baja (tramos de 10
+    puntos) y voluntarios con brecha, global y por region, estado, rango_etario y
+    area_estudio. Los filtros (igualdad exacta) restringen el cubo.
+    Se calcula desde la tabla pre-agregada voluntarios_resumen.
+    """
+    filtros = {
+        "region": region,
+        "estado": estado,
+        "rango_etario": rango_etario,
+        "area_estudio": area_estudio
+    }
+    return await query_cache.obtener_o_calcular(
+        "stats",
+        tuple(sorted(filtros.items())),
+        lambda: calcular_stats(db, filtros)
+    )
+
+@app.post("/api/voluntarios/upload", response_model=UploadJobResponse, status_code=202)
 async def upload_data_file(
     file: UploadFile = File(...),
-    db: Session = Depends(get_db)
+    todas_las_hojas: bool = Query(False, description="Carga todas las hojas del libro, no solo la primera")
 ):
     """
-    RF-01: Carga masiva de datos desde archivo CSV o XLSX.
+    RF-01: Carga masiva de datos desde archivo CSV, XLSX, Parquet, Arrow IPC o un
+    ZIP con varios archivos.
+    La carga se ejecuta como job en segundo plano; el avance se consulta en
+    /api/voluntarios/upload/{job_id}.
     """
     file_ext = os.path.splitext(file.filename)[1].lower()
     
-    if file_ext not in [".csv", ".xlsx", ".xls"]:
+    if file_ext not in [".csv", ".xlsx", ".xls", ".zip", *EXTENSIONES_COLUMNARES]:
         raise HTTPException(
             status_code=400,
-            detail="Formato de archivo no soportado. Use CSV o XLSX."
+            detail="Formato de archivo no soportado. Use CSV, XLSX, Parquet, Arrow o ZIP."
         )
     
     with tempfile.NamedTemporaryFile(delete=False, suffix=file_ext) as tmp_file:
-        content = await file.read()
-        tmp_file.write(content)
         tmp_path = tmp_file.name
+        try:
+            while content := await file.read(UPLOAD_COPY_CHUNK_BYTES):
+                await run_in_threadpool(tmp_file.write, content)
+        except Exception:
+            tmp_file.close()
+            os.unlink(tmp_path)
+            raise
     
     try:
-        records_processed, records_inserted, records_updated, errors = upload_data(
-            tmp_path, 
-            file_type=file_ext,
-            db=db
-        )
-        
-        return FileUploadResponse(
-            message="Carga completada",
-            records_processed=records_processed,
-            records_inserted=records_inserted,
-            records_updated=records_updated,
-            errors=errors
+        job = crear_job(
+            tmp_path,
+            file_ext,
+            file.filename,
+            bulk=UPLOAD_BULK,
+            streaming=UPLOAD_STREAMING,
+            todas_las_hojas=todas_las_hojas
         )
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Error al procesar archivo: {str(e)}")
-    finally:
-        if os.path.exists(tmp_path):
-            os.unlink(tmp_path)
+    except Exception:
+        # Sin job nadie más elimina el archivo
+        os.unlink(tmp_path)
+        raise
+    
+    return UploadJobResponse(
+        message="Carga en proceso",
+        job_id=job.job_id,
+        estado=job.estado
+    )
+
+@app.get("/api/voluntarios/upload/{job_id}", response_model=UploadJobStatus)
+async def estado_upload(job_id: str):
+    """Retorna el estado y avance de un job de carga masiva."""
+    job = obtener_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job de carga no encontrado")
+    return job.to_dict()
+
+@app.get("/api/reglas")
+async def reglas_score():
+    """Reglas de score vigentes y su versión (la que se guarda en reglas_version)."""
+    motor = motor_actual()
+    return {"version": motor.version, "maximo": motor.maximo, "reglas": motor.definicion.get("reglas", [])}
+
+@app.get("/api/cache/stats")
+async def cache_stats():
+    """Contadores del cache de consultas (hits, misses, desalojos, tamaño)."""
+    return query_cache.stats()
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Métricas en formato Prometheus: latencias HTTP y SQL, pool, cache y etapas de carga."""
+    if not METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Métricas desactivadas")
+    contenido, content_type = exportar_metricas()
+    return Response(content=contenido, media_type=content_type)
 
 @app.get("/api/voluntarios/{voluntario_id}", response_model=VoluntarioResponse)
-async def obtener_voluntario(voluntario_id: int, db: Session = Depends(get_db)):
+async def obtener_voluntario(voluntario_id: int, db: AsyncSession = Depends(get_async_db)):
     """Obtiene un voluntario por ID."""
-    voluntario = db.query(Voluntario).filter(Voluntario.id == voluntario_id).first()
+    async def obtener():
+        voluntario = (await db.execute(select_voluntarios().where(Voluntario.id == voluntario_id))).mappings().first()
+        return dict(voluntario) if voluntario else None
+    
+    voluntario = await query_cache.obtener_o_calcular("voluntario", voluntario_id, obtener)
     if not voluntario:
         raise HTTPException(status_code=404, detail="Voluntario no encontrado")
     return voluntario
@@ -210,10 +474,11 @@ async def obtener_voluntario(voluntario_id: int, db: Session = Depends(get_db)):
 async def actualizar_voluntario(
     voluntario_id: int,
     voluntario: VoluntarioCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Actualiza un voluntario existente y recalcula scores."""
-    db_voluntario = db.query(Voluntario).filter(Voluntario.id == voluntario_id).first()
+    """Actualiza un voluntario existente y recalcula scores (409 si el nombre y región ya son de otro voluntario)."""
+    # Por id: la identidad del ORM es (id, region) y la región la trae la fila
+    db_voluntario = (await db.execute(select(Voluntario).where(Voluntario.id == voluntario_id))).scalar_one_or_none()
     if not db_voluntario:
         raise HTTPException(status_code=404, detail="Voluntario no encontrado")
     
@@ -223,8 +488,14 @@ async def actualizar_voluntario(
     for key, value in voluntario_dict.items():
         setattr(db_voluntario, key, value)
     
-    db.commit()
-    db.refresh(db_voluntario)
+    try:
+        await db.commit()
+    except IntegrityError:
+        # El nuevo nombre y región ya son de otro voluntario
+        await db.rollback()
+        raise HTTPException(status_code=409, detail=ERROR_DUPLICADO)
+    query_cache.invalidar()
+    await db.refresh(db_voluntario)
     return db_voluntario
 
 if __name__ == "__main__":
@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Mantenimiento de la tabla voluntarios particionada por región (ver particionar.py),
+una partición a la vez.
+
+Tareas:
+- listar: particiones con sus regiones, filas estimadas y tamaño
+- reindex: REINDEX TABLE CONCURRENTLY de cada partición (sin bloquear escrituras;
+  el espacio extra y la E/S son los de una partición, no los de la tabla)
+- analyze: ANALYZE de cada partición (y de la tabla padre si se procesan todas)
+- rescore: rescore.py restringido a cada región, con un checkpoint por región
+- separar-default: mueve las regiones que quedaron en la partición DEFAULT a
+  particiones propias
+
+Con --region solo se procesan las particiones de esas regiones; con --paralelo N
+las tareas reindex, analyze y rescore corren hasta N particiones a la vez.
+
+separar-default desprende la DEFAULT, copia cada región a una tabla nueva y la
+adjunta como partición, todo en una transacción: las filas conservan su id y los
+triggers no se disparan (el resumen, la cola RPA y los eventos no cambian), pero
+la tabla queda bloqueada mientras dura. Está pensada para una DEFAULT chica.
+
+Uso:
+    python mantenimiento_particiones.py listar
+    python mantenimiento_particiones.py reindex --paralelo 2
+    python mantenimiento_particiones.py rescore --region Maule --region Biobío
+    python mantenimiento_particiones.py separar-default
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import text
+
+from database import SessionLocal, engine
+from particiones import (
+    PARTICION_DEFAULT,
+    ejecutar_sql,
+    es_particionada,
+    listar_particiones,
+    literal,
+    nombre_particion,
+)
+from rescore import rescore
+
+TAREAS = ["listar", "reindex", "analyze", "rescore", "separar-default"]
+
+
+def seleccionar(particiones: List[Dict], regiones: Optional[List[str]]) -> List[Dict]:
+    """Particiones de las regiones pedidas (todas, incluida la DEFAULT, si no se piden)."""
+    if not regiones:
+        return particiones
+    return [p for p in particiones if set(p["regiones"]) & set(regiones)]
+
+
+def regiones_en_default(conn) -> List[str]:
+    return conn.execute(text(f"SELECT DISTINCT region FROM {PARTICION_DEFAULT} ORDER BY region")).scalars().all()
+
+
+def reindexar(particion: Dict) -> str:
+    # REINDEX CONCURRENTLY no puede correr dentro de una transacción
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text(f"REINDEX TABLE CONCURRENTLY {particion['nombre']}"))
+    return "reindexada"
+
+
+def analizar(particion: Dict) -> str:
+    with engine.begin() as conn:
+        conn.execute(text(f"ANALYZE {particion['nombre']}"))
+    return "analizada"
+
+
+def recalcular(region: str, chunk_size: int, checkpoint_dir: str, forzar: bool) -> str:
+    checkpoint = os.path.join(checkpoint_dir, f"rescore.{nombre_particion(region)}.json")
+    db = SessionLocal()
+    try:
+        resultado = rescore(db, chunk_size, checkpoint, forzar, region)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+    return f"{resultado['filas_leidas']} filas leídas, {resultado['filas_actualizadas']} actualizadas"
+
+
+def separar_default(regiones: Optional[List[str]] = None) -> List[str]:
+    """
+    Mueve las filas de la DEFAULT de cada región (o de las indicadas) a una
+    partición propia.
+
+    Returns:
+        Nombres de las particiones creadas
+    """
+    creadas = []
+    with engine.begin() as conn:
+        pendientes = [r for r in regiones_en_default(conn) if not regiones or r in regiones]
+        if not pendientes:
+            return creadas
+        # Desprendida, la DEFAULT ya no tiene los triggers de voluntarios y las
+        # particiones nuevas se pueden adjuntar sin validar sus valores contra ella
+        conn.execute(text(f"ALTER TABLE voluntarios DETACH PARTITION {PARTICION_DEFAULT}"))
+        for region in pendientes:
+            nombre = nombre_particion(region)
+            conn.execute(text(f"CREATE TABLE {nombre} (LIKE voluntarios INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"))
+            conn.execute(text(f"INSERT INTO {nombre} SELECT * FROM {PARTICION_DEFAULT} WHERE region = :region"), {"region": region})
+            conn.execute(text(f"DELETE FROM {PARTICION_DEFAULT} WHERE region = :region"), {"region": region})
+            ejecutar_sql(conn, f"ALTER TABLE voluntarios ATTACH PARTITION {nombre} FOR VALUES IN ({literal(region)})")
+            creadas.append(nombre)
+        conn.execute(text(f"ALTER TABLE voluntarios ATTACH PARTITION {PARTICION_DEFAULT} DEFAULT"))
+    return creadas
+
+
+def _ejecutar(tareas: Dict[str, Callable[[], str]], paralelo: int) -> bool:
+    """Corre cada tarea (nombre -> función) con hasta paralelo a la vez; retorna si todas terminaron bien."""
+    def correr(nombre: str, funcion: Callable[[], str]):
+        inicio = time.perf_counter()
+        try:
+            detalle = funcion()
+            print(f"✅ {nombre}: {detalle} en {time.perf_counter() - inicio:.1f}s")
+            return True
+        except Exception as e:
+            print(f"❌ {nombre}: {e}")
+            return False
+
+    with ThreadPoolExecutor(max_workers=max(paralelo, 1)) as pool:
+        resultados = list(pool.map(lambda item: correr(*item), tareas.items()))
+    return all(resultados)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("tarea", choices=TAREAS)
+    parser.add_argument("--region", action="append", help="Región a procesar (se puede repetir)")
+    parser.add_argument("--paralelo", type=int, default=1, help="Particiones procesadas a la vez")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="rescore: filas por bloque")
+    parser.add_argument("--forzar", action="store_true", help="rescore: recalcula también filas con la versión actual")
+    parser.add_argument("--checkpoint-dir", default=".", help="rescore: carpeta de los checkpoints por región")
+    args = parser.parse_args()
+
+    with engine.connect() as conn:
+        if not es_particionada(conn):
+            print("❌ La tabla voluntarios no está particionada (ver particionar.py)")
+            sys.exit(1)
+        particiones = listar_particiones(conn)
+        hay_default = any(p["default"] for p in particiones)
+        en_default = regiones_en_default(conn) if hay_default else []
+        tamanos = {
+            p["nombre"]: conn.execute(text("SELECT pg_total_relation_size(to_regclass(:nombre))"), {"nombre": p["nombre"]}).scalar()
+            for p in particiones
+        }
+
+    if args.tarea == "listar":
+        for p in particiones:
+            regiones = "DEFAULT: " + ", ".join(en_default) if p["default"] else ", ".join(p["regiones"])
+            print(f"{p['nombre']:<45} {max(p['filas'], 0):>10} filas {tamanos[p['nombre']] / 1e6:9.1f} MB  {regiones}")
+        return
+
+    if args.tarea == "separar-default":
+        if not hay_default:
+            print("❌ La tabla no tiene partición DEFAULT")
+            sys.exit(1)
+        inicio = time.perf_counter()
+        try:
+            creadas = separar_default(args.region)
+        except Exception as e:
+            print(f"❌ Error al separar la partición DEFAULT: {e}")
+            sys.exit(1)
+        print(f"✅ {len(creadas)} particiones creadas desde la DEFAULT en {time.perf_counter() - inicio:.1f}s")
+        for nombre in creadas:
+            print(f"   {nombre}")
+        return
+
+    seleccion = seleccionar(particiones, args.region)
+    if args.tarea == "rescore":
+        # La DEFAULT puede tener varias regiones: se recalcula cada una por separado
+        regiones = [r for p in seleccion for r in p["regiones"]]
+        regiones += [r for r in en_default if not args.region or r in args.region]
+        tareas = {
+            region: (lambda region=region: recalcular(region, args.chunk_size, args.checkpoint_dir, args.forzar))
+            for region in regiones
+        }
+    else:
+        funcion = reindexar if args.tarea == "reindex" else analizar
+        tareas = {p["nombre"]: (lambda p=p: funcion(p)) for p in seleccion}
+        if args.tarea == "analyze" and not args.region:
+            # Las estadísticas de la tabla padre no las recalcula autovacuum
+            tareas["voluntarios"] = lambda: analizar({"nombre": "voluntarios"})
+
+    if not tareas:
+        print("❌ No hay particiones para las regiones indicadas")
+        sys.exit(1)
+
+    unidad = "regiones" if args.tarea == "rescore" else "particiones"
+    print(f"{args.tarea}: {len(tareas)} {unidad}, hasta {args.paralelo} a la vez")
+    if not _ejecutar(tareas, args.paralelo):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
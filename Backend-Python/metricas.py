@@ -0,0 +1,188 @@
+"""
+Métricas de la API en formato Prometheus (expuestas en /metrics).
+
+- Latencia por endpoint: middleware ASGI, etiquetada con la plantilla de la ruta
+  (/api/voluntarios/{voluntario_id}) para acotar la cardinalidad.
+- Tiempo de cada consulta SQL: eventos before/after_cursor_execute del engine.
+- Espera al pedir una conexión al pool: clases de pool que miden _do_get.
+- Etapas de upload_data: context manager etapa().
+- Cache de consultas y estado del pool: se leen al momento del scrape.
+
+Con SLOW_QUERY_MS > 0 las consultas que superan el umbral se registran en el
+logger "slow_query". Las métricas son por proceso; con varios workers cada uno
+expone las suyas.
+"""
+import logging
+import os
+import time
+from contextlib import contextmanager
+
+from prometheus_client import CONTENT_TYPE_LATEST, Histogram, generate_latest
+from prometheus_client.core import GaugeMetricFamily, CounterMetricFamily, REGISTRY
+from sqlalchemy import event
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+from cache import query_cache
+
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "True").lower() == "true"
+# Umbral del log de consultas lentas en milisegundos (0 lo desactiva)
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", 0))
+
+slow_query_logger = logging.getLogger("slow_query")
+
+HTTP_LATENCIA = Histogram(
+    "http_request_duration_seconds",
+    "Latencia de los requests HTTP por endpoint",
+    ["method", "ruta", "status"],
+)
+DB_LATENCIA = Histogram(
+    "db_query_duration_seconds",
+    "Duración de las consultas SQL por tipo de sentencia",
+    ["operacion"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+POOL_ESPERA = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Espera para obtener una conexión del pool",
+    ["engine"],
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30),
+)
+UPLOAD_ETAPA = Histogram(
+    "upload_stage_duration_seconds",
+    "Duración de cada etapa de upload_data",
+    ["etapa"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300),
+)
+
+OPERACIONES = {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH"}
+
+_engines = {}
+
+
+@contextmanager
+def etapa(nombre: str):
+    """Mide la duración del bloque como una etapa de upload_data."""
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        UPLOAD_ETAPA.labels(nombre).observe(time.perf_counter() - inicio)
+
+
+def observar_etapa(nombre: str, segundos: float):
+    """Registra una etapa medida por partes (p. ej. acumulada en el loop fila por fila)."""
+    UPLOAD_ETAPA.labels(nombre).observe(segundos)
+
+
+# --- Base de datos ---
+
+def _operacion(statement: str) -> str:
+    palabras = statement.split(None, 1)
+    operacion = palabras[0].upper() if palabras else ""
+    return operacion if operacion in OPERACIONES else "OTRA"
+
+
+def _antes(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("_inicio_query", []).append(time.perf_counter())
+
+
+def _despues(conn, cursor, statement, parameters, context, executemany):
+    duracion = time.perf_counter() - conn.info["_inicio_query"].pop()
+    DB_LATENCIA.labels(_operacion(statement)).observe(duracion)
+    if SLOW_QUERY_MS and duracion * 1000 >= SLOW_QUERY_MS:
+        slow_query_logger.warning("%.1f ms: %s", duracion * 1000, " ".join(statement.split())[:1000])
+
+
+def _error(contexto):
+    inicios = contexto.connection.info.get("_inicio_query") if contexto.connection is not None else None
+    if inicios:
+        inicios.pop()
+
+
+def instrumentar_engine(engine, nombre: str):
+    """Registra los eventos de timing de consultas en un engine (o en el sync_engine de uno async)."""
+    _engines[nombre] = engine
+    if not METRICS_ENABLED:
+        return
+    event.listen(engine, "before_cursor_execute", _antes)
+    event.listen(engine, "after_cursor_execute", _despues)
+    event.listen(engine, "handle_error", _error)
+
+
+class _EsperaCheckout:
+    """Mide el tiempo que _do_get espera por una conexión libre (o crea una nueva)."""
+    def _do_get(self):
+        inicio = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            POOL_ESPERA.labels(self._nombre_metricas).observe(time.perf_counter() - inicio)
+
+
+class QueuePoolMedido(_EsperaCheckout, QueuePool):
+    _nombre_metricas = "sync"
+
+
+class AsyncQueuePoolMedido(_EsperaCheckout, AsyncAdaptedQueuePool):
+    _nombre_metricas = "async"
+
+
+class _ColectorEstado:
+    """Cache de consultas y ocupación del pool, leídos en cada scrape."""
+    def collect(self):
+        stats = query_cache.stats()
+        for nombre, valor in [("hits", stats["hits"]), ("misses", stats["misses"]), ("evictions", stats["evictions"])]:
+            yield CounterMetricFamily(f"query_cache_{nombre}", f"Cache de consultas: {nombre}", value=valor)
+        yield GaugeMetricFamily("query_cache_entries", "Entradas en el cache de consultas", value=stats["entradas"])
+        yield GaugeMetricFamily("query_cache_rows", "Filas en el cache de consultas", value=stats["filas"])
+
+        en_uso = GaugeMetricFamily("db_pool_checked_out", "Conexiones del pool en uso", labels=["engine"])
+        overflow = GaugeMetricFamily("db_pool_overflow", "Conexiones abiertas sobre pool_size", labels=["engine"])
+        for nombre, engine in _engines.items():
+            pool = engine.pool
+            if isinstance(pool, QueuePool):
+                en_uso.add_metric([nombre], pool.checkedout())
+                overflow.add_metric([nombre], max(0, pool.overflow()))
+        yield en_uso
+        yield overflow
+
+
+REGISTRY.register(_ColectorEstado())
+
+
+def exportar_metricas() -> tuple:
+    """Retorna (contenido, content type) de la exposición de Prometheus."""
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+# --- HTTP ---
+
+class MetricasMiddleware:
+    """Middleware ASGI que mide la latencia de cada request hasta enviar la respuesta completa."""
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = {"codigo": 500}
+
+        async def send_con_status(mensaje):
+            if mensaje["type"] == "http.response.start":
+                status["codigo"] = mensaje["status"]
+            await send(mensaje)
+
+        inicio = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_con_status)
+        finally:
+            HTTP_LATENCIA.labels(scope["method"], _ruta(scope), str(status["codigo"])).observe(time.perf_counter() - inicio)
+
+
+def _ruta(scope) -> str:
+    # El router deja la ruta resuelta en el scope; sin ella (404) no se usa el
+    # path real para no crear una serie por URL
+    ruta = scope.get("route")
+    return getattr(ruta, "path", None) or "sin_ruta"
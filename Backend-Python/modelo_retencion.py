@@ -0,0 +1,306 @@
+"""
+Modelo de retención: regresión logística entrenada sobre el histórico de
+voluntarios, con estado == "Inactivo" como etiqueta.
+
+El modelo se entrena offline con entrenar_modelo.py y se guarda como artefacto
+JSON versionado (coeficientes y codificación de variables). Con
+MODELO_RETENCION=true se carga una vez al importar el módulo y
+inteligencia_predictiva lo usa para score_riesgo_baja (probabilidad de baja x
+100); si el artefacto no existe o no se puede leer, se usan las reglas.
+
+Variables: edad, rango_etario, region, area_estudio, tiene_capacitacion,
+programa_asignado y fecha_rechazo_count. estado (la etiqueta) y
+razon_no_continuar (se completa al dejar el voluntariado) quedan fuera para no
+filtrar la respuesta al modelo.
+
+NumPy y pandas se importan al usarse (lotes y entrenamiento): el score por
+registro no los necesita.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import math
+import os
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+
+from reglas import MAX_LARGO_VERSION, DatosColumnares, columna, motor_actual
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+MODELO_RETENCION = os.getenv("MODELO_RETENCION", "False").lower() == "true"
+MODELO_RETENCION_PATH = os.getenv(
+    "MODELO_RETENCION_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "modelo_retencion.json")
+)
+
+ETIQUETA = "Inactivo"
+NUMERICAS = ["edad", "fecha_rechazo_count"]
+CATEGORICAS = ["rango_etario", "region", "area_estudio", "programa_asignado"]
+BINARIAS = ["tiene_capacitacion"]
+COLUMNAS_ENTRADA = NUMERICAS + CATEGORICAS + BINARIAS
+
+# Tope de fecha_rechazo_count antes de estandarizar
+MAX_RECHAZOS = 5
+# Categorías con menos ejemplos se agrupan con la categoría base (sin columna propia)
+MIN_FRECUENCIA = 20
+
+
+def _categoria(valor) -> str:
+    if valor is None or (isinstance(valor, float) and valor != valor):
+        return ""
+    return str(valor).strip()
+
+
+def _verdadero(valor) -> bool:
+    return bool(valor) and not (isinstance(valor, float) and valor != valor)
+
+
+def _numero(valor, por_defecto: float) -> float:
+    try:
+        numero = float(valor)
+    except (TypeError, ValueError):
+        return por_defecto
+    return por_defecto if numero != numero else numero
+
+
+class ModeloRetencion:
+    """Regresión logística sobre variables codificadas; inmutable una vez cargada."""
+
+    def __init__(self, artefacto: Dict[str, Any]):
+        self.version = str(artefacto["version"])
+        if len(self.version) > MAX_LARGO_VERSION:
+            raise ValueError(f"La versión del modelo supera {MAX_LARGO_VERSION} caracteres: {self.version}")
+        self.artefacto = artefacto
+        self.intercepto = float(artefacto["intercepto"])
+        self.numericas = artefacto["numericas"]          # {columna: {media, desvio, peso}}
+        self.categoricas = artefacto["categoricas"]      # {columna: {categoria: peso}}
+        self.binarias = artefacto["binarias"]            # {columna: peso}
+        # Por registro: (columna, media, peso / desvio, tope)
+        self._numericas = [
+            (nombre, p["media"], p["peso"] / p["desvio"], MAX_RECHAZOS if nombre == "fecha_rechazo_count" else None)
+            for nombre, p in self.numericas.items()
+        ]
+
+    @property
+    def campos(self) -> List[str]:
+        """Campos del registro que usa el modelo."""
+        return list(self.numericas) + list(self.categoricas) + list(self.binarias)
+
+    # --- Por registro: solo sumas sobre dicts, sin NumPy ---
+
+    def logit(self, registro: Dict) -> float:
+        z = self.intercepto
+        for nombre, media, escala, tope in self._numericas:
+            valor = _numero(registro.get(nombre), media)
+            if tope is not None and valor > tope:
+                valor = tope
+            z += escala * (valor - media)
+        for nombre, pesos in self.categoricas.items():
+            z += pesos.get(_categoria(registro.get(nombre)), 0.0)
+        for nombre, peso in self.binarias.items():
+            if _verdadero(registro.get(nombre)):
+                z += peso
+        return z
+
+    def probabilidad(self, registro: Dict) -> float:
+        z = self.logit(registro)
+        if z < -30:
+            return 0.0
+        return 1.0 / (1.0 + math.exp(-z))
+
+    def score(self, registro: Dict) -> int:
+        return int(round(100 * self.probabilidad(registro)))
+
+    # --- Por columnas ---
+
+    def logit_batch(self, datos: DatosColumnares) -> np.ndarray:
+        import numpy as np
+        import pandas as pd
+
+        n = len(datos) if isinstance(datos, pd.DataFrame) else len(next(iter(datos.values()), []))
+        z = np.full(n, self.intercepto)
+        for nombre, p in self.numericas.items():
+            valores = pd.to_numeric(columna(datos, nombre), errors="coerce").fillna(p["media"]).to_numpy(dtype=float)
+            if nombre == "fecha_rechazo_count":
+                valores = np.minimum(valores, MAX_RECHAZOS)
+            z += p["peso"] * (valores - p["media"]) / p["desvio"]
+        for nombre, pesos in self.categoricas.items():
+            valores = columna(datos, nombre).map(_categoria)
+            z += valores.map(pesos).fillna(0.0).to_numpy(dtype=float)
+        for nombre, peso in self.binarias.items():
+            valores = columna(datos, nombre).map(_verdadero)
+            z += peso * valores.to_numpy(dtype=float)
+        return z
+
+    def probabilidad_batch(self, datos: DatosColumnares) -> np.ndarray:
+        import numpy as np
+
+        return 1.0 / (1.0 + np.exp(-np.clip(self.logit_batch(datos), -30, 30)))
+
+    def score_batch(self, datos: DatosColumnares) -> np.ndarray:
+        import numpy as np
+
+        return np.rint(100 * self.probabilidad_batch(datos)).astype(np.int64)
+
+
+# --- Entrenamiento ---
+
+def _matriz(df: pd.DataFrame, codificacion: Dict) -> np.ndarray:
+    """Matriz de diseño (sin intercepto) en el orden de codificacion."""
+    import numpy as np
+    import pandas as pd
+
+    bloques = []
+    for nombre, p in codificacion["numericas"].items():
+        valores = pd.to_numeric(df[nombre], errors="coerce").fillna(p["media"]).to_numpy(dtype=float)
+        if nombre == "fecha_rechazo_count":
+            valores = np.minimum(valores, MAX_RECHAZOS)
+        bloques.append(((valores - p["media"]) / p["desvio"])[:, None])
+    for nombre, categorias in codificacion["categoricas"].items():
+        valores = df[nombre].map(_categoria).to_numpy()
+        bloques.append(np.stack([valores == c for c in categorias], axis=1).astype(float) if categorias else np.zeros((len(df), 0)))
+    for nombre in codificacion["binarias"]:
+        bloques.append(df[nombre].map(_verdadero).to_numpy(dtype=float)[:, None])
+    return np.hstack(bloques)
+
+
+def _codificacion(df: pd.DataFrame) -> Dict:
+    import pandas as pd
+
+    numericas = {}
+    for nombre in NUMERICAS:
+        valores = pd.to_numeric(df[nombre], errors="coerce")
+        if nombre == "fecha_rechazo_count":
+            valores = valores.clip(upper=MAX_RECHAZOS)
+        media = float(valores.mean()) if valores.notna().any() else 0.0
+        desvio = float(valores.std()) if valores.notna().sum() > 1 else 1.0
+        numericas[nombre] = {"media": media, "desvio": desvio or 1.0}
+
+    categoricas = {}
+    for nombre in CATEGORICAS:
+        frecuencias = df[nombre].map(_categoria).value_counts()
+        frecuentes = frecuencias[frecuencias >= MIN_FRECUENCIA]
+        # La categoría más común es la base (absorbida por el intercepto)
+        categoricas[nombre] = [str(c) for c in frecuentes.index[1:]]
+
+    return {"numericas": numericas, "categoricas": categoricas, "binarias": list(BINARIAS)}
+
+
+def _ajustar(X: np.ndarray, y: np.ndarray, l2: float, iteraciones: int = 50) -> np.ndarray:
+    """Regresión logística con regularización L2 por Newton-Raphson (IRLS). Retorna [intercepto, pesos...]."""
+    import numpy as np
+
+    X = np.hstack([np.ones((len(X), 1)), X])
+    beta = np.zeros(X.shape[1])
+    penalizacion = np.full(X.shape[1], l2)
+    penalizacion[0] = 0.0
+    for _ in range(iteraciones):
+        p = 1.0 / (1.0 + np.exp(-np.clip(X @ beta, -30, 30)))
+        gradiente = X.T @ (p - y) + penalizacion * beta
+        hessiano = (X * (p * (1 - p))[:, None]).T @ X + np.diag(penalizacion)
+        paso = np.linalg.solve(hessiano, gradiente)
+        beta -= paso
+        if np.max(np.abs(paso)) < 1e-6:
+            break
+    return beta
+
+
+def auc(y: np.ndarray, scores: np.ndarray) -> float:
+    """Área bajo la curva ROC (Mann-Whitney, con empates promediados)."""
+    import numpy as np
+    import pandas as pd
+
+    y = np.asarray(y, dtype=bool)
+    positivos, negativos = y.sum(), (~y).sum()
+    if positivos == 0 or negativos == 0:
+        return float("nan")
+    rangos = pd.Series(scores).rank(method="average").to_numpy()
+    return float((rangos[y].sum() - positivos * (positivos + 1) / 2) / (positivos * negativos))
+
+
+def entrenar(df: pd.DataFrame, l2: float = 1.0, fraccion_prueba: float = 0.2, seed: int = 42) -> Tuple[ModeloRetencion, Dict]:
+    """
+    Entrena con una partición aleatoria de df y evalúa en el resto.
+
+    Args:
+        df: Voluntarios con COLUMNAS_ENTRADA, estado y las columnas que usan las
+            reglas (para comparar contra el score de reglas)
+        l2: Regularización de los pesos
+        fraccion_prueba: Fracción de filas reservadas para evaluar
+
+    Returns:
+        Tuple con (modelo, métricas de la partición de prueba)
+    """
+    import numpy as np
+
+    df = df.reset_index(drop=True)
+    y = (df["estado"] == ETIQUETA).to_numpy(dtype=float)
+    prueba = np.random.default_rng(seed).random(len(df)) < fraccion_prueba
+    entrenamiento = df[~prueba]
+
+    codificacion = _codificacion(entrenamiento)
+    beta = _ajustar(_matriz(entrenamiento, codificacion), y[~prueba], l2)
+
+    pesos = iter(beta[1:])
+    artefacto = {
+        # Cabe en reglas_version (MAX_LARGO_VERSION)
+        "version": datetime.utcnow().strftime("m%y%m%d%H%M%S"),
+        "entrenado_en": datetime.utcnow().isoformat(timespec="seconds"),
+        "intercepto": float(beta[0]),
+        "numericas": {n: dict(p, peso=float(next(pesos))) for n, p in codificacion["numericas"].items()},
+        "categoricas": {n: {c: float(next(pesos)) for c in cats} for n, cats in codificacion["categoricas"].items()},
+        "binarias": {n: float(next(pesos)) for n in codificacion["binarias"]},
+    }
+    modelo = ModeloRetencion(artefacto)
+
+    metricas = {
+        "filas_entrenamiento": int((~prueba).sum()),
+        "filas_prueba": int(prueba.sum()),
+        "tasa_inactivos": round(float(y.mean()), 4) if len(y) else None,
+        "auc_modelo": auc(y[prueba], modelo.probabilidad_batch(df[prueba])),
+        # Referencia: el score de reglas vigente sobre las mismas filas
+        "auc_reglas": auc(y[prueba], motor_actual().score_batch(df[prueba])),
+        "reglas_version": motor_actual().version,
+    }
+    artefacto["metricas"] = metricas
+    return modelo, metricas
+
+
+def guardar(modelo: ModeloRetencion, path: str = None):
+    path = path or MODELO_RETENCION_PATH
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(modelo.artefacto, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def cargar(path: str = None) -> ModeloRetencion:
+    with open(path or MODELO_RETENCION_PATH, encoding="utf-8") as f:
+        return ModeloRetencion(json.load(f))
+
+
+def _cargar_al_inicio() -> Optional[ModeloRetencion]:
+    if not MODELO_RETENCION:
+        return None
+    try:
+        modelo = cargar()
+    except (OSError, ValueError, KeyError) as e:
+        logger.error("No se pudo cargar el modelo de retención, se usan las reglas: %s", e)
+        return None
+    logger.info("Modelo de retención cargado, versión %s", modelo.version)
+    return modelo
+
+
+modelo = _cargar_al_inicio()
+
+
+def modelo_actual() -> Optional[ModeloRetencion]:
+    """Modelo cargado al inicio, o None si se usan las reglas."""
+    return modelo
+
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, field_validator, model_validator
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 class VoluntarioBase(BaseModel):
@@ -65,3 +65,63 @@ class FileUploadResponse(BaseModel):
     records_updated: int
     errors: list = []
 
+
+class UploadJobResponse(BaseModel):
+    message: str
+    job_id: str
+    estado: str
+
+class UploadJobStatus(BaseModel):
+    job_id: str
+    filename: str
+    estado: str
+    records_processed: int
+    records_inserted: int
+    records_updated: int
+    errors: list = []
+    archivos: List[dict] = []
+    filas_por_segundo: Optional[float] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+class StatsGrupo(BaseModel):
+    valor: Optional[str]
+    total: int
+    con_brecha: int
+    histograma: List[int]
+
+class StatsResponse(BaseModel):
+    total: int
+    con_brecha: int
+    histograma: List[int]
+    por_region: List[StatsGrupo]
+    por_estado: List[StatsGrupo]
+    por_rango_etario: List[StatsGrupo]
+    por_area_estudio: List[StatsGrupo]
+
+class RegistroBatchError(BaseModel):
+    indice: int
+    errores: List[dict]
+
+class RegistroBatchResponse(BaseModel):
+    total_recibidos: int
+    total_registrados: int
+    registrados: List[VoluntarioResponse]
+    errores: List[RegistroBatchError] = []
+
+class EventoScoreResponse(BaseModel):
+    id: int
+    # alta | cambio | baja
+    tipo: str
+    voluntario_id: int
+    score_anterior: Optional[int] = None
+    score_nuevo: Optional[int] = None
+    flag_anterior: Optional[bool] = None
+    flag_nuevo: Optional[bool] = None
+    creado_en: datetime
+    cursor: str
+
+class EventosScoreResponse(BaseModel):
+    eventos: List[EventoScoreResponse]
+    cursor: str
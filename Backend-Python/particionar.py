@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+"""
+Script para convertir la tabla voluntarios en una tabla particionada por región
+(PostgreSQL 13 o superior, PARTITION BY LIST (region)).
+
+En una sola transacción, con la tabla bloqueada:
+1. Crea voluntarios_particionada con las columnas, defaults y CHECK de voluntarios,
+   clave primaria (id, region), una partición por región existente y la DEFAULT.
+2. Copia las filas (mismos id) y reemplaza la tabla original, conservando la
+   secuencia de id.
+3. Recrea sobre la tabla nueva los índices, triggers y comentarios que tenía la
+   original (schema.sql): el resumen, la cola RPA y el registro de eventos siguen
+   funcionando sin cambios.
+
+Los índices únicos tienen que incluir region (uq_voluntarios_nombre_region la
+incluye); si hay uno que no, el script se detiene sin cambiar nada.
+
+Después de correrlo hay que reiniciar el servicio (particiones.particionada() se
+consulta una vez por proceso). Las regiones nuevas reciben su partición al
+cargarse (PARTICIONES_AUTO); ver mantenimiento_particiones.py para el resto.
+
+Uso:
+    python particionar.py
+    python particionar.py --sin-default   # las regiones sin partición fallan al insertar
+"""
+import argparse
+import sys
+import time
+
+from sqlalchemy import text
+
+from database import engine
+from particiones import crear_particion, crear_particion_default, ejecutar_sql, es_particionada, listar_particiones
+
+TABLA_NUEVA = "voluntarios_particionada"
+
+
+def _definiciones(conn):
+    """Índices (salvo la clave primaria), triggers y comentarios de voluntarios, como SQL."""
+    indices = conn.execute(text("""
+        SELECT i.indexrelid::regclass::text AS nombre, i.indisunique AS unico,
+               pg_get_indexdef(i.indexrelid) AS definicion,
+               'region' = ANY (ARRAY(
+                   SELECT a.attname FROM pg_attribute a
+                   WHERE a.attrelid = i.indrelid AND a.attnum = ANY (i.indkey)
+               )) AS incluye_region
+        FROM pg_index i
+        WHERE i.indrelid = 'voluntarios'::regclass AND NOT i.indisprimary
+        ORDER BY 1
+    """)).mappings().all()
+    sin_region = [i["nombre"] for i in indices if i["unico"] and not i["incluye_region"]]
+    if sin_region:
+        raise RuntimeError(f"Índices únicos sin la columna region: {', '.join(sin_region)}")
+
+    triggers = conn.execute(text("""
+        SELECT pg_get_triggerdef(oid) FROM pg_trigger
+        WHERE tgrelid = 'voluntarios'::regclass AND NOT tgisinternal
+        ORDER BY tgname
+    """)).scalars().all()
+
+    comentarios = conn.execute(text("""
+        SELECT format('COMMENT ON TABLE voluntarios IS %L', obj_description('voluntarios'::regclass, 'pg_class'))
+        WHERE obj_description('voluntarios'::regclass, 'pg_class') IS NOT NULL
+        UNION ALL
+        SELECT format('COMMENT ON COLUMN voluntarios.%I IS %L', attname, col_description(attrelid, attnum))
+        FROM pg_attribute
+        WHERE attrelid = 'voluntarios'::regclass AND attnum > 0 AND NOT attisdropped
+          AND col_description(attrelid, attnum) IS NOT NULL
+    """)).scalars().all()
+
+    return [i["definicion"] for i in indices], triggers, comentarios
+
+
+def particionar(conn, default: bool = True) -> dict:
+    """
+    Convierte voluntarios en tabla particionada por región, en la transacción de
+    conn (la tabla se resuelve con el search_path de la conexión).
+
+    Returns:
+        Dict con regiones, filas y particiones (nombres creados)
+    """
+    conn.execute(text("LOCK TABLE voluntarios IN ACCESS EXCLUSIVE MODE"))
+    indices, triggers, comentarios = _definiciones(conn)
+    secuencia = conn.execute(text("SELECT pg_get_serial_sequence('voluntarios', 'id')")).scalar()
+
+    conn.execute(text(f"""
+        CREATE TABLE {TABLA_NUEVA} (
+            LIKE voluntarios INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING STORAGE,
+            PRIMARY KEY (id, region)
+        ) PARTITION BY LIST (region)
+    """))
+    regiones = conn.execute(text("SELECT DISTINCT region FROM voluntarios ORDER BY region")).scalars().all()
+    particiones = [crear_particion(conn, region, TABLA_NUEVA) for region in regiones]
+    if default:
+        particiones.append(crear_particion_default(conn, TABLA_NUEVA))
+
+    filas = conn.execute(text(f"INSERT INTO {TABLA_NUEVA} SELECT * FROM voluntarios")).rowcount
+
+    # La secuencia de id pertenece a la tabla original: se desliga antes del DROP
+    if secuencia:
+        conn.execute(text(f"ALTER SEQUENCE {secuencia} OWNED BY NONE"))
+    conn.execute(text("DROP TABLE voluntarios"))
+    conn.execute(text(f"ALTER TABLE {TABLA_NUEVA} RENAME TO voluntarios"))
+    conn.execute(text(f"ALTER TABLE voluntarios RENAME CONSTRAINT {TABLA_NUEVA}_pkey TO voluntarios_pkey"))
+    if secuencia:
+        conn.execute(text(f"ALTER SEQUENCE {secuencia} OWNED BY voluntarios.id"))
+
+    # Las definiciones nombran la tabla como voluntarios, que ahora es la nueva
+    for sentencia in indices + triggers + comentarios:
+        ejecutar_sql(conn, sentencia)
+    conn.execute(text("ANALYZE voluntarios"))
+
+    return {"regiones": len(regiones), "filas": filas, "particiones": particiones}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sin-default", action="store_true", help="No crea la partición DEFAULT")
+    args = parser.parse_args()
+
+    if engine.dialect.name != "postgresql":
+        print("❌ El particionamiento requiere PostgreSQL")
+        sys.exit(1)
+    with engine.connect() as conn:
+        if es_particionada(conn):
+            particiones = listar_particiones(conn)
+            print(f"✅ La tabla voluntarios ya está particionada ({len(particiones)} particiones)")
+            return
+
+    print("Particionando la tabla voluntarios por región...")
+    inicio = time.perf_counter()
+    try:
+        with engine.begin() as conn:
+            resultado = particionar(conn, default=not args.sin_default)
+    except Exception as e:
+        print(f"❌ Error al particionar: {e}")
+        print("   La tabla quedó sin cambios")
+        sys.exit(1)
+
+    print(f"✅ Tabla particionada en {time.perf_counter() - inicio:.1f}s")
+    print(f"   Filas copiadas: {resultado['filas']}")
+    print(f"   Particiones: {len(resultado['particiones'])} ({resultado['regiones']} regiones"
+          f"{' + DEFAULT' if not args.sin_default else ''})")
+    print("   Reinicie el servicio para que la búsqueda rutee por partición")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Particionamiento de voluntarios por región (PostgreSQL, LIST partitioning).
+
+La tabla se convierte con particionar.py: una partición por región más una
+partición DEFAULT para las regiones que aún no tienen la suya. La clave primaria
+pasa a ser (id, region) y el índice único (nombre, region) ya incluye la clave
+de partición, así que INSERT ... ON CONFLICT sigue igual.
+
+Este módulo concentra lo que el resto del código necesita saber de las particiones:
+- particionada(): si la tabla está particionada (se consulta una vez por proceso;
+  después de particionar.py hay que reiniciar el servicio)
+- listar_particiones(): particiones con sus regiones y filas estimadas
+- asegurar_particiones(): crea la partición de cada región nueva antes de una
+  carga (PARTICIONES_AUTO), así las filas no se acumulan en la DEFAULT
+- agrupar_por_region(): reparte los registros de una carga por partición
+
+El ruteo de la búsqueda (busqueda.resolver_regiones) y del RPA usa region con
+igualdad exacta, que es lo que permite a PostgreSQL descartar particiones.
+En SQLite la tabla nunca está particionada y todo esto es un no-op.
+"""
+import hashlib
+import logging
+import os
+import re
+import unicodedata
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import text
+
+from database import engine
+
+logger = logging.getLogger(__name__)
+
+# Crea la partición de cada región nueva al comenzar una carga masiva
+PARTICIONES_AUTO = os.getenv("PARTICIONES_AUTO", "True").lower() == "true"
+# Espera máxima por el lock de la tabla al crear una partición (ms); si se agota,
+# las filas de esa región van a la partición DEFAULT
+PARTICIONES_LOCK_TIMEOUT_MS = int(os.getenv("PARTICIONES_LOCK_TIMEOUT_MS", 5000))
+
+PREFIJO = "voluntarios_p_"
+PARTICION_DEFAULT = f"{PREFIJO}default"
+
+_PARTICIONES_SQL = """
+SELECT c.relname AS nombre, pg_get_expr(c.relpartbound, c.oid) AS limite, c.reltuples AS filas
+FROM pg_inherits i
+JOIN pg_class c ON c.oid = i.inhrelid
+WHERE i.inhparent = to_regclass(:tabla)
+ORDER BY c.relname
+"""
+
+_LITERAL = re.compile(r"'((?:[^']|'')*)'")
+
+_particionada: Optional[bool] = None
+
+
+def nombre_particion(region: str) -> str:
+    """voluntarios_p_<region sin acentos>_<hash>: estable, válido como identificador y sin colisiones."""
+    base = unicodedata.normalize("NFKD", region).encode("ascii", "ignore").decode().lower()
+    base = re.sub(r"[^a-z0-9]+", "_", base).strip("_")[:30]
+    return f"{PREFIJO}{base}_{hashlib.md5(region.encode('utf-8')).hexdigest()[:6]}"
+
+
+def literal(valor: str) -> str:
+    """Literal SQL de un texto (los límites de partición no aceptan parámetros)."""
+    return "'" + valor.replace("'", "''") + "'"
+
+
+def ejecutar_sql(conn, sentencia: str):
+    """
+    Ejecuta sentencia tal cual en la conexión DBAPI de conn (misma transacción),
+    sin interpretar ':' ni '%' como parámetros: para DDL con textos literales.
+    """
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute(sentencia)
+    finally:
+        cursor.close()
+
+
+def es_particionada(conn, tabla: str = "voluntarios") -> bool:
+    if conn.dialect.name != "postgresql":
+        return False
+    return bool(conn.execute(
+        text("SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:tabla))"),
+        {"tabla": tabla}
+    ).scalar())
+
+
+def particionada() -> bool:
+    """Si voluntarios está particionada en la base del servicio (valor cacheado por proceso)."""
+    global _particionada
+    if _particionada is None:
+        with engine.connect() as conn:
+            _particionada = es_particionada(conn)
+    return _particionada
+
+
+def listar_particiones(conn, tabla: str = "voluntarios") -> List[Dict]:
+    """
+    Particiones de tabla: nombre, regiones (vacío para la DEFAULT), default y
+    filas estimadas (reltuples; -1 si nunca se analizó).
+    """
+    particiones = []
+    for fila in conn.execute(text(_PARTICIONES_SQL), {"tabla": tabla}).mappings():
+        default = fila["limite"] == "DEFAULT"
+        particiones.append({
+            "nombre": fila["nombre"],
+            "regiones": [] if default else [v.replace("''", "'") for v in _LITERAL.findall(fila["limite"])],
+            "default": default,
+            "filas": int(fila["filas"]),
+        })
+    return particiones
+
+
+def crear_particion(conn, region: str, tabla: str = "voluntarios") -> str:
+    """Crea la partición de region (si no existe) y retorna su nombre."""
+    nombre = nombre_particion(region)
+    ejecutar_sql(conn, f"CREATE TABLE IF NOT EXISTS {nombre} PARTITION OF {tabla} FOR VALUES IN ({literal(region)})")
+    return nombre
+
+
+def crear_particion_default(conn, tabla: str = "voluntarios") -> str:
+    conn.execute(text(f"CREATE TABLE IF NOT EXISTS {PARTICION_DEFAULT} PARTITION OF {tabla} DEFAULT"))
+    return PARTICION_DEFAULT
+
+
+def asegurar_particiones(regiones: Iterable[str]) -> List[str]:
+    """
+    Crea la partición de cada región que todavía no tiene una, en una transacción
+    propia y corta (CREATE TABLE ... PARTITION OF toma un lock exclusivo de
+    voluntarios). Las regiones que ya tienen filas en la DEFAULT quedan ahí hasta
+    que mantenimiento_particiones.py separar-default las mueva.
+
+    Returns:
+        Nombres de las particiones creadas
+    """
+    if not PARTICIONES_AUTO or not particionada():
+        return []
+
+    creadas = []
+    with engine.connect() as conn:
+        particiones = listar_particiones(conn)
+        conn.rollback()
+        existentes = {r for p in particiones for r in p["regiones"]}
+        hay_default = any(p["default"] for p in particiones)
+        for region in sorted(set(regiones) - existentes):
+            if not region:
+                continue
+            try:
+                with conn.begin():
+                    conn.execute(text(f"SET LOCAL lock_timeout = {PARTICIONES_LOCK_TIMEOUT_MS}"))
+                    if hay_default and conn.execute(
+                        text(f"SELECT EXISTS (SELECT 1 FROM {PARTICION_DEFAULT} WHERE region = :region)"),
+                        {"region": region}
+                    ).scalar():
+                        continue
+                    creadas.append(crear_particion(conn, region))
+            except Exception as e:
+                # Un lock no disponible o una fila concurrente en la DEFAULT no impiden la carga
+                logger.warning("No se creó la partición de %r, sus filas van a %s: %s", region, PARTICION_DEFAULT, e)
+    if creadas:
+        logger.info("Particiones creadas: %s", ", ".join(creadas))
+    return creadas
+
+
+def agrupar_por_region(records: List[Dict]) -> Dict[str, List[Dict]]:
+    """Registros agrupados por region, en el orden en que aparece cada región."""
+    grupos: Dict[str, List[Dict]] = {}
+    for record in records:
+        grupos.setdefault(record["region"], []).append(record)
+    return grupos
@@ -0,0 +1,110 @@
+"""
+Registro de voluntarios por lotes.
+
+El lote se valida en una sola pasada de Pydantic, se puntúa con las funciones
+por columnas de inteligencia_predictiva y se inserta con un único INSERT
+multi-fila ... ON CONFLICT DO NOTHING RETURNING, confirmado en una sola
+transacción. Los elementos inválidos o que ya existen se informan por índice
+sin hacer fallar el resto del lote.
+"""
+import os
+from typing import Any, Dict, List, Tuple
+
+from pydantic import TypeAdapter, ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database import Voluntario, engine, insert_on_conflict
+from exportar import COLUMNAS_RESPUESTA
+from inteligencia_predictiva import puntuar_columnas
+from models import VoluntarioCreate
+
+# Máximo de voluntarios por request
+REGISTRO_BATCH_MAX = int(os.getenv("REGISTRO_BATCH_MAX", 1000))
+
+_lote_adapter = TypeAdapter(List[VoluntarioCreate])
+
+ERROR_DUPLICADO = "Ya existe un voluntario con ese nombre y región"
+ERROR_DUPLICADO_LOTE = "Nombre y región repetidos en el lote"
+
+
+def _error(campo, mensaje: str) -> Dict[str, Any]:
+    return {"campo": campo, "mensaje": mensaje}
+
+
+def validar_lote(items: List[Any]) -> Tuple[List[Tuple[int, Dict]], Dict[int, List[Dict]]]:
+    """
+    Valida el lote completo con un TypeAdapter. Si hay errores se agrupan por
+    índice y se validan de nuevo solo los elementos válidos.
+
+    Returns:
+        Tuple con ([(indice, datos validados)], {indice: errores})
+    """
+    errores: Dict[int, List[Dict]] = {}
+    try:
+        validos = _lote_adapter.validate_python(items)
+        indices = list(range(len(items)))
+    except ValidationError as e:
+        for error in e.errors():
+            indice, *campo = error["loc"]
+            errores.setdefault(indice, []).append(_error(".".join(map(str, campo)) or None, error["msg"]))
+        indices = [i for i in range(len(items)) if i not in errores]
+        validos = _lote_adapter.validate_python([items[i] for i in indices])
+
+    return [(i, v.model_dump()) for i, v in zip(indices, validos)], errores
+
+
+def puntuar_lote(registros: List[Dict]) -> List[Dict]:
+    """Agrega score_riesgo_baja, flag_brecha_cap y reglas_version con el scoring por columnas."""
+    if not registros:
+        return registros
+    import pandas as pd
+
+    scores, flags, version = puntuar_columnas(pd.DataFrame(registros))
+    for registro, score, flag in zip(registros, scores, flags):
+        registro["score_riesgo_baja"] = int(score)
+        registro["flag_brecha_cap"] = bool(flag)
+        registro["reglas_version"] = version
+    return registros
+
+
+async def registrar_lote(db: AsyncSession, items: List[Any]) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Valida, puntúa e inserta el lote en una transacción.
+
+    Returns:
+        Tuple con (voluntarios registrados en el orden del lote,
+                   [{"indice", "errores"}] de los elementos no registrados)
+    """
+    validos, errores = validar_lote(items)
+
+    # Dentro del lote gana la primera aparición de cada (nombre, region)
+    por_clave: Dict[Tuple[str, str], int] = {}
+    for indice, registro in validos:
+        clave = (registro["nombre"], registro["region"])
+        if clave in por_clave:
+            errores[indice] = [_error(None, ERROR_DUPLICADO_LOTE)]
+        else:
+            por_clave[clave] = indice
+
+    registros = puntuar_lote([registro for indice, registro in validos if indice not in errores])
+
+    insertados: Dict[Tuple[str, str], Dict] = {}
+    if registros:
+        insert = insert_on_conflict(engine.dialect.name)
+        stmt = (
+            insert(Voluntario.__table__)
+            .on_conflict_do_nothing(index_elements=["nombre", "region"])
+            .returning(*COLUMNAS_RESPUESTA)
+        )
+        for fila in (await db.execute(stmt, registros)).mappings():
+            insertados[(fila["nombre"], fila["region"])] = dict(fila)
+        await db.commit()
+
+    registrados = []
+    for clave, indice in por_clave.items():
+        if clave in insertados:
+            registrados.append(insertados[clave])
+        else:
+            errores[indice] = [_error(None, ERROR_DUPLICADO)]
+
+    return registrados, [{"indice": i, "errores": errores[i]} for i in sorted(errores)]
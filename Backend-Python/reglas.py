@@ -0,0 +1,253 @@
+"""
+Motor de reglas del score de riesgo de baja.
+
+Las reglas se definen en un archivo JSON (REGLAS_SCORE_PATH, por defecto
+reglas_score.json) y se compilan una vez en predicados: una función por regla
+para evaluar un dict y una versión por columnas para lotes. El score es la suma
+de los puntos de las reglas que se cumplen, acotada a [0, maximo].
+
+Formato de cada regla:
+    {"nombre": ..., "campo": ..., "operador": ..., "valor": ..., "puntos": ...}
+
+Operadores:
+    contiene      el texto del campo incluye valor
+    igual         el texto del campo es valor
+    en            el texto del campo es uno de los valores de la lista valor
+    vacio         el campo es nulo o solo espacios (no usa valor)
+    mayor_igual, mayor, menor_igual, menor
+                  comparación numérica; los nulos y no numéricos valen
+                  "por_defecto" (0 si no se indica)
+
+"ignorar_mayusculas": true compara texto sin distinguir mayúsculas. Los nulos no
+cumplen contiene, igual ni en.
+
+El archivo se vuelve a leer cuando cambia (se revisa cada REGLAS_RELOAD_SECONDS).
+Cada fila guarda la "version" del archivo con que se calculó; hay que cambiarla
+junto con las reglas para que rescore.py recalcule la tabla.
+
+NumPy y pandas se importan al usarse: el score por registro (registro, PUT) no
+los necesita, así que no pesan en el arranque del servicio.
+"""
+from __future__ import annotations
+
+import json
+import logging
+import operator
+import os
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Mapping, Sequence, Union
+
+if TYPE_CHECKING:
+    import numpy as np
+    import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+REGLAS_SCORE_PATH = os.getenv(
+    "REGLAS_SCORE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "reglas_score.json")
+)
+# Intervalo mínimo entre revisiones del archivo (0 revisa en cada uso)
+REGLAS_RELOAD_SECONDS = float(os.getenv("REGLAS_RELOAD_SECONDS", 5))
+
+# Un DataFrame o un dict {columna: arreglo} con columnas de igual largo
+DatosColumnares = Union["pd.DataFrame", Mapping[str, Sequence]]
+
+# Largo máximo de "version": se guarda en voluntarios.reglas_version, VARCHAR(20)
+MAX_LARGO_VERSION = 20
+
+OPERADORES_TEXTO = {"contiene", "igual", "en", "vacio"}
+OPERADORES_NUMERICOS = {
+    "mayor_igual": operator.ge,
+    "mayor": operator.gt,
+    "menor_igual": operator.le,
+    "menor": operator.lt,
+}
+
+
+def _es_nulo(v) -> bool:
+    return v is None or (v.__class__ is float and v != v)
+
+
+def _largo(datos: DatosColumnares) -> int:
+    import pandas as pd
+
+    if isinstance(datos, pd.DataFrame):
+        return len(datos)
+    return len(next(iter(datos.values()), []))
+
+def columna(datos: DatosColumnares, nombre: str) -> pd.Series:
+    """Retorna la columna como Series (sin índice) o una Series de nulos si no existe."""
+    import pandas as pd
+
+    n = _largo(datos)
+    if nombre not in datos:
+        return pd.Series([None] * n, dtype=object)
+    valores = datos[nombre]
+    if isinstance(valores, pd.Series):
+        return valores.reset_index(drop=True)
+    return pd.Series(valores)
+
+def por_valor(valores: pd.Series, regla: Callable) -> np.ndarray:
+    """
+    Evalúa una regla escalar una vez por valor distinto y la expande a toda la columna.
+    Las columnas de estado, región, programa, etc. tienen pocos valores distintos,
+    así que la regla corre unas pocas veces en lugar de una por fila.
+    Los nulos (None/NaN) se evalúan como None.
+    """
+    import numpy as np
+    import pandas as pd
+
+    codigos, unicos = pd.factorize(valores)
+    resultado = np.fromiter((regla(v) for v in unicos), dtype=bool, count=len(unicos))
+    # El código -1 de factorize (nulos) apunta al último elemento
+    resultado = np.append(resultado, regla(None))
+    return resultado[codigos]
+
+
+class Regla:
+    """
+    Una regla compilada. La condición es una función del valor v del campo armada
+    con las funciones del operador (no se genera ni se evalúa código, así que el
+    archivo de reglas no puede ejecutar nada); el motor la usa en el score por
+    registro y la evalúa una vez por valor distinto en el camino por columnas.
+    """
+
+    def __init__(self, definicion: Dict[str, Any]):
+        for clave in ["nombre", "campo", "operador", "puntos"]:
+            if clave not in definicion:
+                raise ValueError(f"Regla sin '{clave}': {definicion}")
+        self.nombre = definicion["nombre"]
+        self.campo = definicion["campo"]
+        self.operador = definicion["operador"]
+        self.puntos = int(definicion["puntos"])
+        valor = definicion.get("valor")
+
+        if self.operador in OPERADORES_TEXTO:
+            if self.operador != "vacio" and valor is None:
+                raise ValueError(f"Regla '{self.nombre}': el operador {self.operador} requiere valor")
+            ignorar_mayusculas = bool(definicion.get("ignorar_mayusculas"))
+            self.evaluar: Callable[[Any], bool] = self._compilar_texto(valor, ignorar_mayusculas)
+        elif self.operador in OPERADORES_NUMERICOS:
+            comparar = self._comparar = OPERADORES_NUMERICOS[self.operador]
+            limite = self._limite = float(valor)
+            self.por_defecto = float(definicion.get("por_defecto", 0))
+            numero = self._numero
+            self.evaluar = lambda v: comparar(numero(v), limite)
+        else:
+            raise ValueError(f"Regla '{self.nombre}': operador desconocido '{self.operador}'")
+
+    def _compilar_texto(self, valor, ignorar_mayusculas: bool) -> Callable[[Any], bool]:
+        normalizar = (lambda t: t.lower()) if ignorar_mayusculas else (lambda t: t)
+        if self.operador == "vacio":
+            return lambda v: _es_nulo(v) or str(v).strip() == ""
+        if self.operador == "en":
+            if not isinstance(valor, list):
+                raise ValueError(f"Regla '{self.nombre}': el operador en requiere una lista")
+            opciones = frozenset(normalizar(str(o)) for o in valor)
+            return lambda v: not _es_nulo(v) and normalizar(str(v)) in opciones
+        buscado = normalizar(str(valor))
+        if self.operador == "igual":
+            return lambda v: not _es_nulo(v) and normalizar(str(v)) == buscado
+        return lambda v: not _es_nulo(v) and buscado in normalizar(str(v))
+
+    def _numero(self, valor) -> float:
+        try:
+            numero = float(valor)
+        except (TypeError, ValueError):
+            return self.por_defecto
+        return self.por_defecto if numero != numero else numero
+
+    def evaluar_columna(self, valores: pd.Series) -> np.ndarray:
+        if self.operador in OPERADORES_NUMERICOS:
+            import pandas as pd
+
+            numeros = pd.to_numeric(valores, errors="coerce").fillna(self.por_defecto).to_numpy(dtype=float)
+            return self._comparar(numeros, self._limite)
+        return por_valor(valores, self.evaluar)
+
+
+class MotorReglas:
+    """
+    Conjunto de reglas compilado. Inmutable: una recarga crea un motor nuevo.
+    score() recorre las condiciones (campo, función, puntos) ya compiladas.
+    """
+
+    def __init__(self, definicion: Dict[str, Any]):
+        if "version" not in definicion:
+            raise ValueError("El archivo de reglas no define 'version'")
+        self.version = str(definicion["version"])
+        if len(self.version) > MAX_LARGO_VERSION:
+            raise ValueError(f"'version' supera {MAX_LARGO_VERSION} caracteres: {self.version}")
+        self.maximo = int(definicion.get("maximo", 100))
+        self.definicion = definicion
+        self.reglas: List[Regla] = [Regla(r) for r in definicion.get("reglas", [])]
+        self._condiciones = [(regla.campo, regla.evaluar, regla.puntos) for regla in self.reglas]
+
+    def score(self, registro: Mapping) -> int:
+        s = 0
+        for campo, evaluar, puntos in self._condiciones:
+            if evaluar(registro.get(campo)):
+                s += puntos
+        return 0 if s < 0 else min(s, self.maximo)
+
+    @property
+    def campos(self) -> List[str]:
+        """Campos del registro que usan las reglas, sin repetir."""
+        return list(dict.fromkeys(regla.campo for regla in self.reglas))
+
+    def score_batch(self, datos: DatosColumnares) -> np.ndarray:
+        import numpy as np
+
+        score = np.zeros(_largo(datos), dtype=np.int64)
+        for regla in self.reglas:
+            score += regla.puntos * regla.evaluar_columna(columna(datos, regla.campo))
+        return np.clip(score, 0, self.maximo)
+
+
+def cargar_motor(path: str = None) -> MotorReglas:
+    with open(path or REGLAS_SCORE_PATH, encoding="utf-8") as f:
+        return MotorReglas(json.load(f))
+
+
+_motor = cargar_motor()
+_motor_mtime = os.path.getmtime(REGLAS_SCORE_PATH)
+_revisado = time.monotonic()
+_lock = threading.Lock()
+
+
+def recargar(forzar: bool = False) -> MotorReglas:
+    """
+    Recompila las reglas si el archivo cambió. Si el archivo nuevo es inválido se
+    registra el error y se mantiene el motor vigente hasta el próximo cambio.
+    """
+    global _motor, _motor_mtime, _revisado
+    with _lock:
+        _revisado = time.monotonic()
+        try:
+            mtime = os.path.getmtime(REGLAS_SCORE_PATH)
+        except OSError as e:
+            logger.error("No se pudo leer el archivo de reglas de score: %s", e)
+            return _motor
+        if not forzar and mtime == _motor_mtime:
+            return _motor
+
+        _motor_mtime = mtime
+        try:
+            motor = cargar_motor()
+        except (OSError, ValueError) as e:
+            logger.error("Reglas de score inválidas, se mantiene la versión %s: %s", _motor.version, e)
+            return _motor
+        if motor.version == _motor.version and motor.definicion != _motor.definicion:
+            logger.warning("Las reglas de score cambiaron sin cambiar 'version' (%s)", motor.version)
+        _motor = motor
+        logger.info("Reglas de score cargadas, versión %s", motor.version)
+        return _motor
+
+
+def motor_actual() -> MotorReglas:
+    """Motor vigente; revisa el archivo como máximo cada REGLAS_RELOAD_SECONDS."""
+    if time.monotonic() - _revisado >= REGLAS_RELOAD_SECONDS:
+        return recargar()
+    return _motor
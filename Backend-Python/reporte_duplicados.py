@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Script para listar los posibles voluntarios duplicados de toda la tabla.
+
+Recorre la tabla región por región (las regiones se agrupan normalizadas, así
+"Valparaiso" y "Valparaíso" forman un solo bloque), arma el índice MinHash de
+duplicados.py con los voluntarios del bloque y escribe un CSV con cada par:
+"exacto" si los nombres coinciden al normalizarlos y "similar" si su similitud
+de trigramas supera el umbral. Solo el bloque en curso se mantiene en memoria.
+
+Con --clave lista en cambio los (nombre, region) repetidos exactamente, que impiden
+crear el índice único uq_voluntarios_nombre_region de schema.sql: por cada par, la
+fila que se conserva (la actualizada más recientemente, como en la carga, donde
+prevalece la última ocurrencia) y las demás. Con --fusionar además completa los
+campos vacíos de la fila conservada con los de las demás y elimina estas, en una
+sola transacción.
+
+Uso:
+    python reporte_duplicados.py
+    python reporte_duplicados.py --umbral 0.8 --salida /tmp/duplicados.csv
+    python reporte_duplicados.py --region Metropolitana
+    python reporte_duplicados.py --clave --salida clave_repetida.csv
+    python reporte_duplicados.py --clave --fusionar
+"""
+import argparse
+import csv
+import sys
+import time
+from typing import Dict, List
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from database import SessionLocal, Voluntario
+from duplicados import DUPLICADOS_UMBRAL, IndiceDuplicados, normalizar_texto
+
+COLUMNAS_CSV = ["region", "tipo", "similitud", "id_a", "nombre_a", "id_b", "nombre_b"]
+COLUMNAS_CSV_CLAVE = ["nombre", "region", "id_conservado", "ids_repetidos"]
+
+# Columnas que --fusionar no copia de las filas repetidas a la conservada
+_NO_FUSIONAR = {"id", "nombre", "region", "created_at", "updated_at"}
+
+
+def bloques_region(db: Session) -> Dict[str, List[str]]:
+    """{región normalizada: [valores de region en la BD]}"""
+    bloques: Dict[str, List[str]] = {}
+    for region in db.execute(select(Voluntario.region).distinct()).scalars():
+        bloques.setdefault(normalizar_texto(region), []).append(region)
+    return bloques
+
+
+def reporte(db: Session, salida, umbral: float = None, region: str = None) -> Dict[str, int]:
+    """
+    Escribe en salida (archivo abierto) el CSV de pares por región.
+
+    Returns:
+        Dict con voluntarios, regiones, pares_exactos, pares_similares
+    """
+    writer = csv.writer(salida)
+    writer.writerow(COLUMNAS_CSV)
+    totales = {"voluntarios": 0, "regiones": 0, "pares_exactos": 0, "pares_similares": 0}
+
+    bloques = bloques_region(db)
+    if region is not None:
+        bloques = {k: v for k, v in bloques.items() if k == normalizar_texto(region)}
+
+    for clave, valores in sorted(bloques.items()):
+        indice = IndiceDuplicados(umbral)
+        query = (
+            select(Voluntario.nombre, Voluntario.region, Voluntario.id)
+            .where(Voluntario.region.in_(valores))
+            .order_by(Voluntario.id)
+        )
+        indice.agregar_lote(db.execute(query).all())
+
+        for par in indice.pares():
+            writer.writerow([clave, par.tipo, round(par.similitud, 3), par.a.id, par.a.nombre, par.b.id, par.b.nombre])
+            totales["pares_exactos" if par.tipo == "exacto" else "pares_similares"] += 1
+        totales["voluntarios"] += len(indice)
+        totales["regiones"] += 1
+
+    return totales
+
+
+def clave_repetida(db: Session) -> List[List[Voluntario]]:
+    """
+    Voluntarios con (nombre, region) repetido, agrupados por par; en cada grupo
+    primero el que se conserva (updated_at más reciente, luego id mayor).
+    """
+    repetidos = (
+        select(Voluntario.nombre, Voluntario.region)
+        .group_by(Voluntario.nombre, Voluntario.region)
+        .having(func.count() > 1)
+        .subquery()
+    )
+    query = (
+        select(Voluntario)
+        .join(repetidos, (Voluntario.nombre == repetidos.c.nombre) & (Voluntario.region == repetidos.c.region))
+        .order_by(
+            Voluntario.nombre, Voluntario.region,
+            Voluntario.updated_at.desc().nulls_last(), Voluntario.id.desc()
+        )
+    )
+    grupos: Dict[tuple, List[Voluntario]] = {}
+    for voluntario in db.execute(query).scalars():
+        grupos.setdefault((voluntario.nombre, voluntario.region), []).append(voluntario)
+    return list(grupos.values())
+
+
+def reporte_clave(db: Session, salida, fusionar: bool = False) -> Dict[str, int]:
+    """
+    Escribe en salida el CSV de (nombre, region) repetidos. Con fusionar, consolida
+    cada grupo en la fila conservada y elimina las demás (sin commit).
+
+    Returns:
+        Dict con pares y filas_repetidas
+    """
+    writer = csv.writer(salida)
+    writer.writerow(COLUMNAS_CSV_CLAVE)
+    totales = {"pares": 0, "filas_repetidas": 0}
+
+    for conservado, *repetidos in clave_repetida(db):
+        writer.writerow([conservado.nombre, conservado.region, conservado.id, " ".join(str(v.id) for v in repetidos)])
+        totales["pares"] += 1
+        totales["filas_repetidas"] += len(repetidos)
+        if not fusionar:
+            continue
+        for columna in Voluntario.__table__.columns:
+            if columna.key in _NO_FUSIONAR or getattr(conservado, columna.key) not in (None, ""):
+                continue
+            for voluntario in repetidos:
+                if getattr(voluntario, columna.key) not in (None, ""):
+                    setattr(conservado, columna.key, getattr(voluntario, columna.key))
+                    break
+        for voluntario in repetidos:
+            db.delete(voluntario)
+
+    return totales
+
+
+def main_clave(args):
+    salida = args.salida or "clave_repetida.csv"
+    db = SessionLocal()
+    try:
+        with open(salida, "w", newline="", encoding="utf-8") as archivo:
+            resultado = reporte_clave(db, archivo, args.fusionar)
+        if args.fusionar:
+            db.commit()
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error al revisar (nombre, region) repetidos: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+    print(f"✅ Reporte generado: {salida}")
+    print(f"   Pares (nombre, region) repetidos: {resultado['pares']}")
+    if args.fusionar:
+        print(f"   Filas fusionadas y eliminadas: {resultado['filas_repetidas']}")
+    elif resultado["pares"]:
+        print(f"   Filas a eliminar con --fusionar: {resultado['filas_repetidas']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--umbral", type=float, default=DUPLICADOS_UMBRAL)
+    parser.add_argument("--salida", help="CSV de salida (default duplicados.csv, o clave_repetida.csv con --clave)")
+    parser.add_argument("--region", help="Solo esta región")
+    parser.add_argument("--clave", action="store_true", help="Listar (nombre, region) repetidos exactamente")
+    parser.add_argument("--fusionar", action="store_true", help="Con --clave, consolidar cada par en una fila")
+    args = parser.parse_args()
+
+    if args.fusionar and not args.clave:
+        parser.error("--fusionar requiere --clave")
+    if args.clave:
+        main_clave(args)
+        return
+    args.salida = args.salida or "duplicados.csv"
+
+    print(f"Buscando posibles duplicados (umbral {args.umbral})...")
+    inicio = time.perf_counter()
+    db = SessionLocal()
+    try:
+        with open(args.salida, "w", newline="", encoding="utf-8") as salida:
+            resultado = reporte(db, salida, args.umbral, args.region)
+    except Exception as e:
+        print(f"❌ Error al generar el reporte: {e}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+    print(f"✅ Reporte generado en {time.perf_counter() - inicio:.1f}s: {args.salida}")
+    print(f"   Voluntarios revisados: {resultado['voluntarios']} en {resultado['regiones']} regiones")
+    print(f"   Pares con el mismo nombre normalizado: {resultado['pares_exactos']}")
+    print(f"   Pares similares: {resultado['pares_similares']}")
+
+
+if __name__ == "__main__":
+    main()
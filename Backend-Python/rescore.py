@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Script para recalcular score_riesgo_baja y flag_brecha_cap de toda la tabla
+voluntarios cuando cambian las reglas de inteligencia_predictiva.
+
+Recorre la tabla por bloques paginados por id (keyset), recalcula los scores
+por lotes y solo escribe los outputs de las filas cuyo resultado cambió. Las
+filas ya calculadas con la versión de reglas actual se omiten. El avance se guarda
+en un archivo de checkpoint después de cada bloque, así una ejecución
+interrumpida continúa desde el último id procesado.
+
+Con --region recalcula solo esa región: con la tabla particionada, las lecturas y
+los UPDATE solo tocan su partición (ver mantenimiento_particiones.py, que
+recalcula partición por partición).
+
+Uso:
+    python rescore.py
+    python rescore.py --chunk-size 5000 --checkpoint rescore.checkpoint.json
+    python rescore.py --forzar   # recalcula también filas con la versión actual
+    python rescore.py --region Maule --checkpoint rescore.maule.json
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Dict, Optional
+
+import pandas as pd
+from sqlalchemy import bindparam, or_, select, update
+from sqlalchemy.orm import Session
+
+from database import SessionLocal, Voluntario
+from inteligencia_predictiva import Motor, campos_entrada, motor_vigente, puntuar_columnas, version_reglas
+
+CHECKPOINT_DEFAULT = "rescore.checkpoint.json"
+
+
+def columnas_entrada(motor: Motor) -> list:
+    """
+    id, region y los outputs actuales, más los campos que usa motor (modelo o
+    reglas) para el score y el flag. Los campos que no son columnas de la tabla se
+    omiten: el motor los trata como nulos.
+    """
+    tabla = Voluntario.__table__
+    nombres = ["id", "region", "score_riesgo_baja", "flag_brecha_cap"] + campos_entrada(motor)
+    return [tabla.c[n] for n in dict.fromkeys(nombres) if n in tabla.c]
+
+
+def leer_checkpoint(path: str, version: str, region: Optional[str] = None) -> int:
+    """Retorna el último id procesado con la versión de reglas y la región indicadas (0 si no hay)."""
+    if not path or not os.path.exists(path):
+        return 0
+    with open(path, encoding="utf-8") as f:
+        checkpoint = json.load(f)
+    if checkpoint.get("reglas_version") != version or checkpoint.get("region") != region:
+        return 0
+    return int(checkpoint.get("ultimo_id", 0))
+
+
+def guardar_checkpoint(path: str, version: str, ultimo_id: int, region: Optional[str] = None):
+    if not path:
+        return
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"reglas_version": version, "region": region, "ultimo_id": ultimo_id}, f)
+    os.replace(tmp_path, path)
+
+
+def rescore(
+    db: Session,
+    chunk_size: int = 1000,
+    checkpoint_path: str = None,
+    forzar: bool = False,
+    region: Optional[str] = None
+) -> Dict[str, int]:
+    """
+    Recalcula los scores de la tabla voluntarios (o solo de region) por bloques
+    de chunk_size filas.
+
+    Returns:
+        Dict con filas_leidas, filas_actualizadas, ultimo_id
+    """
+    # Las filas a recalcular se eligen con la versión vigente al comenzar; cada
+    # bloque se sella con la versión con que efectivamente se calculó
+    version = version_reglas()
+    ultimo_id = leer_checkpoint(checkpoint_path, version, region)
+    filas_leidas = 0
+    filas_actualizadas = 0
+
+    tabla = Voluntario.__table__
+    # Las sentencias llevan la clave de partición (region): con la tabla
+    # particionada cada UPDATE solo busca el id en su partición
+    en_region = [tabla.c.region == region] if region is not None else []
+    actualizar_outputs = (
+        update(tabla)
+        .where(tabla.c.id == bindparam("_id"), tabla.c.region == bindparam("_region"))
+        .values(
+            score_riesgo_baja=bindparam("_score"),
+            flag_brecha_cap=bindparam("_flag"),
+            reglas_version=bindparam("_version"),
+        )
+    )
+
+    while True:
+        # Columnas y cálculo con el mismo motor, aunque las reglas se recarguen entre bloques
+        motor = motor_vigente()
+        columnas = columnas_entrada(motor)
+        query = select(*columnas).where(Voluntario.id > ultimo_id, *en_region)
+        if not forzar:
+            query = query.where(or_(
+                Voluntario.reglas_version.is_(None),
+                Voluntario.reglas_version != version
+            ))
+        rows = db.execute(query.order_by(Voluntario.id).limit(chunk_size)).all()
+        if not rows:
+            break
+
+        df = pd.DataFrame(rows, columns=[c.key for c in columnas])
+        score, flag, version_bloque = puntuar_columnas(df, motor)
+        cambio = (score != df["score_riesgo_baja"].fillna(-1).to_numpy()) | (flag != df["flag_brecha_cap"].fillna(False).to_numpy())
+
+        cambiadas = [
+            {"_id": int(i), "_region": r, "_score": int(s), "_flag": bool(f), "_version": version_bloque}
+            for i, r, s, f in zip(df["id"][cambio], df["region"][cambio], score[cambio], flag[cambio])
+        ]
+        if cambiadas:
+            db.execute(actualizar_outputs, cambiadas)
+
+        # Las filas sin cambios solo reciben el sello de versión, en una sentencia
+        sin_cambio = [int(i) for i in df["id"][~cambio]]
+        if sin_cambio:
+            db.execute(
+                update(tabla)
+                .where(tabla.c.id.in_(sin_cambio), *en_region)
+                .values(reglas_version=version_bloque)
+            )
+
+        db.commit()
+        ultimo_id = int(df["id"].iloc[-1])
+        guardar_checkpoint(checkpoint_path, version, ultimo_id, region)
+
+        filas_leidas += len(df)
+        filas_actualizadas += len(cambiadas)
+
+    if checkpoint_path and os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+
+    return {"filas_leidas": filas_leidas, "filas_actualizadas": filas_actualizadas, "ultimo_id": ultimo_id}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunk-size", type=int, default=1000)
+    parser.add_argument("--checkpoint", default=CHECKPOINT_DEFAULT)
+    parser.add_argument("--forzar", action="store_true")
+    parser.add_argument("--region", default=None, help="Recalcula solo esta región (igualdad exacta)")
+    args = parser.parse_args()
+
+    alcance = f" en la región {args.region}" if args.region else ""
+    print(f"Recalculando scores{alcance} con reglas versión {version_reglas()}...")
+    inicio = time.perf_counter()
+    db = SessionLocal()
+    try:
+        resultado = rescore(db, args.chunk_size, args.checkpoint, args.forzar, args.region)
+    except Exception as e:
+        db.rollback()
+        print(f"❌ Error al recalcular scores: {e}")
+        print(f"   El avance quedó guardado en {args.checkpoint}")
+        sys.exit(1)
+    finally:
+        db.close()
+
+    print(f"✅ Re-scoring completado en {time.perf_counter() - inicio:.1f}s")
+    print(f"   Filas leídas: {resultado['filas_leidas']}")
+    print(f"   Filas con outputs actualizados: {resultado['filas_actualizadas']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Lectura de la cola de acción urgente RPA (tabla rpa_accion_urgente).
+
+La cola la mantiene el trigger sync_rpa_accion_urgente de schema.sql, que init_db
+también instala. Solo existe en PostgreSQL (el cursor usa txid_current_snapshot):
+con otra base RPA_COLA se ignora y el endpoint consulta voluntarios directo.
+Cada fila guarda el xid de la transacción que cambió la
+pertenencia del voluntario al conjunto urgente. El cursor que reciben los bots
+es el xmin del snapshot de la consulta: toda transacción con xid menor ya
+terminó, así que las filas con xid < cursor no pueden aparecer después y el
+siguiente poll solo necesita las filas con xid >= cursor.
+"""
+import logging
+import os
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import or_, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database import RpaAccionUrgente, Voluntario, engine
+
+logger = logging.getLogger(__name__)
+
+# Lee /api/rpa/accion_urgente de la cola mantenida por trigger (solo PostgreSQL)
+RPA_COLA = os.getenv("RPA_COLA", "False").lower() == "true"
+if RPA_COLA and engine.dialect.name != "postgresql":
+    logger.warning("RPA_COLA requiere PostgreSQL; /api/rpa/accion_urgente consulta voluntarios directo")
+    RPA_COLA = False
+
+COLUMNAS_RPA = [
+    Voluntario.id,
+    Voluntario.nombre,
+    Voluntario.region,
+    Voluntario.score_riesgo_baja,
+    Voluntario.flag_brecha_cap,
+    Voluntario.estado,
+    Voluntario.programa_asignado,
+]
+
+
+async def _cursor_actual(db: AsyncSession) -> int:
+    return (await db.execute(text("SELECT txid_snapshot_xmin(txid_current_snapshot())"))).scalar()
+
+
+async def leer_cola(db: AsyncSession, since: Optional[int] = None, region: Optional[str] = None) -> Tuple[List[Dict], int]:
+    """
+    Sin since retorna el conjunto urgente actual; con since retorna los voluntarios
+    que entraron (urgente=True) o salieron (urgente=False) del conjunto desde ese
+    cursor. Los voluntarios eliminados salen con solo id y urgente.
+
+    Con region solo se retornan los voluntarios de esa región. Los eliminados ya no
+    tienen región y se informan a todos los consumidores.
+
+    Returns:
+        Tuple con (voluntarios, cursor para el próximo poll)
+    """
+    cursor = await _cursor_actual(db)
+
+    query = (
+        select(RpaAccionUrgente.voluntario_id, RpaAccionUrgente.urgente, *COLUMNAS_RPA[1:])
+        .outerjoin(Voluntario, Voluntario.id == RpaAccionUrgente.voluntario_id)
+        .order_by(RpaAccionUrgente.voluntario_id)
+    )
+    if since is None:
+        query = query.where(RpaAccionUrgente.urgente.is_(True))
+    else:
+        query = query.where(RpaAccionUrgente.xid >= since, RpaAccionUrgente.xid < cursor)
+    if region is not None:
+        query = query.where(or_(Voluntario.region == region, Voluntario.id.is_(None)))
+
+    voluntarios = []
+    for fila in (await db.execute(query)).mappings():
+        voluntario = {"id": fila["voluntario_id"], "urgente": fila["urgente"]}
+        if fila["nombre"] is not None:
+            voluntario.update({c.key: fila[c.key] for c in COLUMNAS_RPA[1:]})
+        voluntarios.append(voluntario)
+
+    return voluntarios, cursor
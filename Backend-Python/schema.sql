@@ -15,10 +15,20 @@ CREATE TABLE IF NOT EXISTS voluntarios (
     fecha_rechazo_count INTEGER DEFAULT 0 CHECK (fecha_rechazo_count >= 0),
     score_riesgo_baja INTEGER DEFAULT 0 CHECK (score_riesgo_baja >= 0 AND score_riesgo_baja <= 100),
     flag_brecha_cap BOOLEAN DEFAULT FALSE,
+    reglas_version VARCHAR(20),
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- particionar.py convierte esta tabla en particionada por región (PARTITION BY
+-- LIST (region), PRIMARY KEY (id, region), una partición por región y una DEFAULT).
+-- El resto del script se puede volver a aplicar sobre la tabla particionada: los
+-- índices y triggers de voluntarios se crean en la tabla padre y aplican a todas
+-- las particiones.
+
+-- Migraciones para bases creadas con versiones anteriores del esquema
+ALTER TABLE voluntarios ADD COLUMN IF NOT EXISTS reglas_version VARCHAR(20);
+
 -- Índices para optimizar búsquedas
 CREATE INDEX IF NOT EXISTS idx_voluntarios_region ON voluntarios(region);
 CREATE INDEX IF NOT EXISTS idx_voluntarios_estado ON voluntarios(estado);
@@ -26,6 +36,44 @@ CREATE INDEX IF NOT EXISTS idx_voluntarios_score_riesgo ON voluntarios(score_rie
 CREATE INDEX IF NOT EXISTS idx_voluntarios_flag_brecha ON voluntarios(flag_brecha_cap);
 CREATE INDEX IF NOT EXISTS idx_voluntarios_area_estudio ON voluntarios(area_estudio);
 
+-- Búsqueda por texto sin acentos con índices trigram (SEARCH_BACKEND=trgm en busqueda.py).
+-- Sirven los filtros ILIKE '%termino%' de /api/voluntarios/search, que los índices
+-- btree no pueden usar por el comodín inicial.
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE EXTENSION IF NOT EXISTS unaccent;
+
+-- unaccent() es STABLE y no se puede usar en un índice; este wrapper es IMMUTABLE
+CREATE OR REPLACE FUNCTION f_unaccent(text)
+RETURNS text AS $$
+    SELECT public.unaccent('public.unaccent', $1)
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT;
+
+CREATE INDEX IF NOT EXISTS idx_voluntarios_region_trgm ON voluntarios USING gin (f_unaccent(region) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_voluntarios_area_estudio_trgm ON voluntarios USING gin (f_unaccent(area_estudio) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_voluntarios_programa_trgm ON voluntarios USING gin (f_unaccent(programa_asignado) gin_trgm_ops);
+
+-- Clave de consolidación para la carga masiva (INSERT ... ON CONFLICT (nombre, region)).
+-- Las bases anteriores al índice pueden tener (nombre, region) repetidos: el script
+-- no los borra, se detiene con un error. Listarlos y consolidarlos con
+--     python reporte_duplicados.py --clave [--fusionar]
+-- y volver a ejecutar este script.
+DO $$
+DECLARE
+    repetidos BIGINT;
+BEGIN
+    IF to_regclass('uq_voluntarios_nombre_region') IS NULL THEN
+        SELECT count(*) INTO repetidos
+        FROM (SELECT 1 FROM voluntarios GROUP BY nombre, region HAVING count(*) > 1) r;
+        IF repetidos > 0 THEN
+            RAISE EXCEPTION 'voluntarios tiene % pares (nombre, region) repetidos; no se puede crear uq_voluntarios_nombre_region', repetidos
+                USING HINT = 'Ejecutar python reporte_duplicados.py --clave [--fusionar] y aplicar schema.sql de nuevo';
+        END IF;
+    END IF;
+END
+$$;
+
+CREATE UNIQUE INDEX IF NOT EXISTS uq_voluntarios_nombre_region ON voluntarios(nombre, region);
+
 -- Función para actualizar updated_at automáticamente
 CREATE OR REPLACE FUNCTION update_updated_at_column()
 RETURNS TRIGGER AS $$
@@ -36,13 +84,214 @@ END;
 $$ language 'plpgsql';
 
 -- Trigger para actualizar updated_at
+DROP TRIGGER IF EXISTS update_voluntarios_updated_at ON voluntarios;
 CREATE TRIGGER update_voluntarios_updated_at 
     BEFORE UPDATE ON voluntarios
     FOR EACH ROW
     EXECUTE FUNCTION update_updated_at_column();
 
+-- Conjunto urgente RPA (score_riesgo_baja > 75 O flag_brecha_cap). El índice parcial
+-- sirve la consulta completa de /api/rpa/accion_urgente sin recorrer la tabla.
+CREATE INDEX IF NOT EXISTS idx_voluntarios_rpa_urgente ON voluntarios(id)
+    WHERE score_riesgo_baja > 75 OR flag_brecha_cap = TRUE;
+
+-- Cola de acción urgente RPA (RPA_COLA=true): registra cada entrada y salida del
+-- conjunto urgente con la transacción (xid) en que ocurrió, para que los bots
+-- consulten solo los cambios desde su último poll.
+CREATE TABLE IF NOT EXISTS rpa_accion_urgente (
+    voluntario_id INTEGER PRIMARY KEY,
+    urgente BOOLEAN NOT NULL,
+    xid BIGINT NOT NULL,
+    actualizado_en TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_rpa_accion_urgente_xid ON rpa_accion_urgente(xid);
+
+CREATE OR REPLACE FUNCTION sync_rpa_accion_urgente()
+RETURNS TRIGGER AS $$
+DECLARE
+    urgente_nuevo BOOLEAN := FALSE;
+    urgente_viejo BOOLEAN := FALSE;
+    id_voluntario INTEGER;
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        urgente_viejo := COALESCE(OLD.score_riesgo_baja > 75 OR OLD.flag_brecha_cap, FALSE);
+        id_voluntario := OLD.id;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        urgente_nuevo := COALESCE(NEW.score_riesgo_baja > 75 OR NEW.flag_brecha_cap, FALSE);
+        id_voluntario := NEW.id;
+    END IF;
+
+    IF urgente_nuevo <> urgente_viejo THEN
+        INSERT INTO rpa_accion_urgente (voluntario_id, urgente, xid, actualizado_en)
+        VALUES (id_voluntario, urgente_nuevo, txid_current(), CURRENT_TIMESTAMP)
+        ON CONFLICT (voluntario_id) DO UPDATE
+            SET urgente = EXCLUDED.urgente, xid = EXCLUDED.xid, actualizado_en = EXCLUDED.actualizado_en;
+    END IF;
+
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+DROP TRIGGER IF EXISTS sync_rpa_accion_urgente ON voluntarios;
+CREATE TRIGGER sync_rpa_accion_urgente
+    AFTER INSERT OR DELETE OR UPDATE OF score_riesgo_baja, flag_brecha_cap ON voluntarios
+    FOR EACH ROW
+    EXECUTE FUNCTION sync_rpa_accion_urgente();
+
+-- Carga inicial de la cola con los voluntarios que ya están en el conjunto urgente
+INSERT INTO rpa_accion_urgente (voluntario_id, urgente, xid)
+SELECT id, TRUE, txid_current() FROM voluntarios
+WHERE score_riesgo_baja > 75 OR flag_brecha_cap = TRUE
+ON CONFLICT (voluntario_id) DO NOTHING;
+
+-- Resumen pre-agregado para /api/stats: conteos e histograma de score por
+-- region, estado, rango_etario y area_estudio. Lo mantienen triggers por sentencia
+-- con tablas de transición, así una carga masiva ajusta cada combinación una vez
+-- por sentencia y no una vez por fila.
+CREATE TABLE IF NOT EXISTS voluntarios_resumen (
+    region VARCHAR(100) NOT NULL,
+    estado VARCHAR(50) NOT NULL,
+    rango_etario VARCHAR(50) NOT NULL,
+    area_estudio VARCHAR(100) NOT NULL,
+    score_bucket INTEGER NOT NULL,
+    total BIGINT NOT NULL DEFAULT 0,
+    con_brecha BIGINT NOT NULL DEFAULT 0,
+    PRIMARY KEY (region, estado, rango_etario, area_estudio, score_bucket)
+);
+
+CREATE OR REPLACE FUNCTION sync_voluntarios_resumen()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        INSERT INTO voluntarios_resumen AS r (region, estado, rango_etario, area_estudio, score_bucket, total, con_brecha)
+        SELECT region, estado, COALESCE(rango_etario, ''), COALESCE(area_estudio, ''),
+               LEAST(COALESCE(score_riesgo_baja, 0) / 10, 9),
+               -count(*), -count(*) FILTER (WHERE flag_brecha_cap)
+        FROM viejas
+        GROUP BY 1, 2, 3, 4, 5
+        ON CONFLICT (region, estado, rango_etario, area_estudio, score_bucket) DO UPDATE
+            SET total = r.total + EXCLUDED.total, con_brecha = r.con_brecha + EXCLUDED.con_brecha;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        INSERT INTO voluntarios_resumen AS r (region, estado, rango_etario, area_estudio, score_bucket, total, con_brecha)
+        SELECT region, estado, COALESCE(rango_etario, ''), COALESCE(area_estudio, ''),
+               LEAST(COALESCE(score_riesgo_baja, 0) / 10, 9),
+               count(*), count(*) FILTER (WHERE flag_brecha_cap)
+        FROM nuevas
+        GROUP BY 1, 2, 3, 4, 5
+        ON CONFLICT (region, estado, rango_etario, area_estudio, score_bucket) DO UPDATE
+            SET total = r.total + EXCLUDED.total, con_brecha = r.con_brecha + EXCLUDED.con_brecha;
+    END IF;
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+-- Las tablas de transición exigen un trigger por evento
+DROP TRIGGER IF EXISTS sync_voluntarios_resumen_insert ON voluntarios;
+CREATE TRIGGER sync_voluntarios_resumen_insert
+    AFTER INSERT ON voluntarios
+    REFERENCING NEW TABLE AS nuevas
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION sync_voluntarios_resumen();
+
+DROP TRIGGER IF EXISTS sync_voluntarios_resumen_update ON voluntarios;
+CREATE TRIGGER sync_voluntarios_resumen_update
+    AFTER UPDATE ON voluntarios
+    REFERENCING OLD TABLE AS viejas NEW TABLE AS nuevas
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION sync_voluntarios_resumen();
+
+DROP TRIGGER IF EXISTS sync_voluntarios_resumen_delete ON voluntarios;
+CREATE TRIGGER sync_voluntarios_resumen_delete
+    AFTER DELETE ON voluntarios
+    REFERENCING OLD TABLE AS viejas
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION sync_voluntarios_resumen();
+
+-- Reconstrucción del resumen desde voluntarios (bloquea escrituras mientras corre)
+BEGIN;
+LOCK TABLE voluntarios IN SHARE MODE;
+TRUNCATE voluntarios_resumen;
+INSERT INTO voluntarios_resumen (region, estado, rango_etario, area_estudio, score_bucket, total, con_brecha)
+SELECT region, estado, COALESCE(rango_etario, ''), COALESCE(area_estudio, ''),
+       LEAST(COALESCE(score_riesgo_baja, 0) / 10, 9),
+       count(*), count(*) FILTER (WHERE flag_brecha_cap)
+FROM voluntarios
+GROUP BY 1, 2, 3, 4, 5;
+COMMIT;
+
+-- Registro de cambios de score (voluntarios_eventos): una fila por alta, baja o
+-- cambio de score_riesgo_baja / flag_brecha_cap, con los valores anterior y nuevo,
+-- escrita por trigger en la misma transacción que el cambio. Los consumidores la
+-- leen en orden (xid, id) desde /api/eventos/score (ver eventos.py).
+CREATE TABLE IF NOT EXISTS voluntarios_eventos (
+    id BIGSERIAL PRIMARY KEY,
+    tipo VARCHAR(10) NOT NULL,
+    voluntario_id INTEGER NOT NULL,
+    score_anterior INTEGER,
+    score_nuevo INTEGER,
+    flag_anterior BOOLEAN,
+    flag_nuevo BOOLEAN,
+    xid BIGINT NOT NULL DEFAULT 0,
+    creado_en TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE INDEX IF NOT EXISTS idx_voluntarios_eventos_cursor ON voluntarios_eventos(xid, id);
+
+-- Por sentencia con tablas de transición, como el resumen: una carga masiva
+-- escribe sus eventos con un solo INSERT ... SELECT
+CREATE OR REPLACE FUNCTION registrar_voluntarios_eventos()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO voluntarios_eventos (tipo, voluntario_id, score_nuevo, flag_nuevo, xid)
+        SELECT 'alta', id, score_riesgo_baja, flag_brecha_cap, txid_current()
+        FROM nuevas
+        ORDER BY id;
+    ELSIF TG_OP = 'UPDATE' THEN
+        INSERT INTO voluntarios_eventos (tipo, voluntario_id, score_anterior, score_nuevo, flag_anterior, flag_nuevo, xid)
+        SELECT 'cambio', n.id, v.score_riesgo_baja, n.score_riesgo_baja, v.flag_brecha_cap, n.flag_brecha_cap, txid_current()
+        FROM nuevas n
+        JOIN viejas v ON v.id = n.id
+        WHERE v.score_riesgo_baja IS DISTINCT FROM n.score_riesgo_baja
+           OR v.flag_brecha_cap IS DISTINCT FROM n.flag_brecha_cap
+        ORDER BY n.id;
+    ELSE
+        INSERT INTO voluntarios_eventos (tipo, voluntario_id, score_anterior, flag_anterior, xid)
+        SELECT 'baja', id, score_riesgo_baja, flag_brecha_cap, txid_current()
+        FROM viejas
+        ORDER BY id;
+    END IF;
+    RETURN NULL;
+END;
+$$ language 'plpgsql';
+
+DROP TRIGGER IF EXISTS registrar_voluntarios_eventos_insert ON voluntarios;
+CREATE TRIGGER registrar_voluntarios_eventos_insert
+    AFTER INSERT ON voluntarios
+    REFERENCING NEW TABLE AS nuevas
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION registrar_voluntarios_eventos();
+
+DROP TRIGGER IF EXISTS registrar_voluntarios_eventos_update ON voluntarios;
+CREATE TRIGGER registrar_voluntarios_eventos_update
+    AFTER UPDATE ON voluntarios
+    REFERENCING OLD TABLE AS viejas NEW TABLE AS nuevas
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION registrar_voluntarios_eventos();
+
+DROP TRIGGER IF EXISTS registrar_voluntarios_eventos_delete ON voluntarios;
+CREATE TRIGGER registrar_voluntarios_eventos_delete
+    AFTER DELETE ON voluntarios
+    REFERENCING OLD TABLE AS viejas
+    FOR EACH STATEMENT
+    EXECUTE FUNCTION registrar_voluntarios_eventos();
+
 -- Comentarios en las columnas
 COMMENT ON TABLE voluntarios IS 'Tabla principal de voluntarios con outputs de IA';
 COMMENT ON COLUMN voluntarios.score_riesgo_baja IS 'OUTPUT de la IA - Score de riesgo de baja (0-100)';
 COMMENT ON COLUMN voluntarios.flag_brecha_cap IS 'OUTPUT de la IA - Flag de brecha de capacitación';
+COMMENT ON COLUMN voluntarios.reglas_version IS 'Versión de las reglas de scoring con que se calcularon los OUTPUT de la IA';
 
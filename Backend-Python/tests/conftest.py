@@ -0,0 +1,28 @@
+"""
+Configuración común de las pruebas: los módulos del backend se importan desde
+Backend-Python con una base SQLite temporal (database crea el engine al importarse).
+Las pruebas que necesitan PostgreSQL usan TEST_DATABASE_URL y se omiten sin ella.
+"""
+import os
+import sys
+import tempfile
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(prefix='teleton_tests_'), 'test.db')}"
+
+
+@pytest.fixture
+def db():
+    """Sesión sobre la base SQLite de pruebas, con el esquema recién creado (tablas vacías)."""
+    from database import Base, SessionLocal, engine, init_db
+
+    Base.metadata.drop_all(bind=engine)
+    init_db(forzar=True)
+    sesion = SessionLocal()
+    try:
+        yield sesion
+    finally:
+        sesion.close()
@@ -0,0 +1,118 @@
+"""
+Búsqueda por texto con SEARCH_BACKEND=trgm (busqueda.py) en PostgreSQL: los
+filtros usan los índices GIN pg_trgm de schema.sql y no distinguen acentos.
+
+Requiere TEST_DATABASE_URL de una base PostgreSQL de pruebas con las extensiones
+pg_trgm y unaccent disponibles. Todo se crea en un schema temporal dentro de una
+transacción que se revierte al terminar.
+"""
+import os
+import re
+
+import pytest
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.schema import CreateTable
+
+import busqueda
+from database import Voluntario
+from models import VoluntarioSearch
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+
+SCHEMA_SQL = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "schema.sql")
+
+INDICES_TRGM = {
+    "region": "idx_voluntarios_region_trgm",
+    "area_estudio": "idx_voluntarios_area_estudio_trgm",
+    "programa_asignado": "idx_voluntarios_programa_trgm",
+}
+
+# (filtro, término sin acentos, valor con acentos que debe encontrar)
+CASOS = [
+    ("region", "valparaiso", "Valparaíso"),
+    ("area_estudio", "psicologia", "Psicología"),
+    ("programa_asignado", "programa 37", "Programa 37"),
+]
+
+POBLAR_SQL = """
+INSERT INTO voluntarios (nombre, edad, region, area_estudio, estado, programa_asignado)
+SELECT
+    'test ' || i,
+    18 + (i % 60),
+    (ARRAY['Metropolitana', 'Valparaíso', 'Biobío', 'Maule', 'Ñuble', 'Aysén'])[1 + (i % 6)],
+    (ARRAY['Salud', 'Educación', 'Psicología', 'Kinesiología'])[1 + (i / 7 % 4)],
+    'Activo',
+    'Programa ' || (i % 500)
+FROM generate_series(1, 5000) AS i
+"""
+
+def sentencias_trgm() -> list:
+    """f_unaccent y los índices trigram de voluntarios, tal como están en schema.sql."""
+    with open(SCHEMA_SQL, encoding="utf-8") as f:
+        schema = f.read()
+    funcion = re.search(r"CREATE OR REPLACE FUNCTION f_unaccent\(text\).*?STRICT;", schema, re.S).group(0)
+    indices = re.findall(r"CREATE INDEX IF NOT EXISTS idx_voluntarios_\w+_trgm ON .*?;", schema)
+    return [funcion] + indices
+
+
+@pytest.fixture(scope="module")
+def conexion():
+    if not TEST_DATABASE_URL:
+        pytest.skip("Requiere TEST_DATABASE_URL (PostgreSQL)")
+    engine = create_engine(TEST_DATABASE_URL)
+    if engine.dialect.name != "postgresql":
+        pytest.skip("TEST_DATABASE_URL no es PostgreSQL")
+    with engine.connect() as conn:
+        disponibles = set(conn.execute(text(
+            "SELECT name FROM pg_available_extensions WHERE name IN ('pg_trgm', 'unaccent')"
+        )).scalars())
+        if len(disponibles) < 2:
+            pytest.skip("Requiere las extensiones pg_trgm y unaccent")
+
+        transaccion = conn.begin()
+        try:
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS unaccent"))
+            conn.execute(text("CREATE SCHEMA test_busqueda"))
+            conn.execute(text("SET LOCAL search_path TO test_busqueda, public"))
+            conn.execute(CreateTable(Voluntario.__table__))
+            for sentencia in sentencias_trgm():
+                conn.exec_driver_sql(sentencia)
+            conn.execute(text(POBLAR_SQL))
+            conn.execute(text("ANALYZE voluntarios"))
+            # Con pocas filas el planificador preferiría recorrer la tabla
+            conn.execute(text("SET LOCAL enable_seqscan = off"))
+            yield conn
+        finally:
+            transaccion.rollback()
+    engine.dispose()
+
+
+def indices_del_plan(nodo: dict):
+    if "Index Name" in nodo:
+        yield nodo["Index Name"]
+    for hijo in nodo.get("Plans", []):
+        yield from indices_del_plan(hijo)
+
+
+def test_schema_define_un_indice_trgm_por_filtro():
+    indices = " ".join(sentencias_trgm())
+    for indice in INDICES_TRGM.values():
+        assert indice in indices
+
+
+@pytest.mark.parametrize("columna, termino, esperado", CASOS)
+def test_filtro_trgm_usa_indice_y_no_distingue_acentos(conexion, monkeypatch, columna, termino, esperado):
+    monkeypatch.setattr(busqueda, "SEARCH_BACKEND", "trgm")
+    query = busqueda.aplicar_filtros(
+        select(Voluntario.id, getattr(Voluntario, columna)),
+        VoluntarioSearch(**{columna: termino})
+    )
+    sql = str(query.compile(conexion, compile_kwargs={"literal_binds": True}))
+
+    plan = conexion.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+    indices = set(indices_del_plan(plan[0]["Plan"]))
+    assert INDICES_TRGM[columna] in indices, f"el plan no usa {INDICES_TRGM[columna]} ({indices or 'Seq Scan'})"
+
+    valores = {fila[1] for fila in conexion.execute(query)}
+    assert any(esperado in v for v in valores), f"'{termino}' no encontró '{esperado}'"
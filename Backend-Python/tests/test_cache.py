@@ -0,0 +1,61 @@
+"""
+Cache de consultas: las lecturas repetidas salen del cache y cada escritura
+(registro, PUT, carga masiva) lo invalida, así la lectura siguiente ve el cambio.
+"""
+import time
+
+from fastapi.testclient import TestClient
+
+import main
+from cache import query_cache
+
+VOLUNTARIO = {"nombre": "Ana", "edad": 30, "region": "Maule", "estado": "Activo"}
+
+
+def _nombres(cliente: TestClient, region: str = "Maule"):
+    respuesta = cliente.get("/api/voluntarios/search", params={"region": region})
+    assert respuesta.status_code == 200
+    return sorted(v["nombre"] for v in respuesta.json())
+
+
+def _esperar_job(cliente: TestClient, job_id: str) -> dict:
+    limite = time.monotonic() + 30
+    while time.monotonic() < limite:
+        estado = cliente.get(f"/api/voluntarios/upload/{job_id}").json()
+        if estado["estado"] in ("completado", "error"):
+            return estado
+        time.sleep(0.05)
+    raise AssertionError(f"El job {job_id} no terminó")
+
+
+def test_registro_y_put_invalidan_el_cache(db):
+    query_cache.invalidar()
+    cliente = TestClient(main.app)
+
+    assert _nombres(cliente) == []
+    hits = query_cache.hits
+    assert _nombres(cliente) == []
+    assert query_cache.hits == hits + 1
+
+    creado = cliente.post("/api/voluntarios/registro", json=VOLUNTARIO).json()
+    assert _nombres(cliente) == ["Ana"]
+    assert cliente.get(f"/api/voluntarios/{creado['id']}").json()["edad"] == 30
+
+    respuesta = cliente.put(f"/api/voluntarios/{creado['id']}", json={**VOLUNTARIO, "edad": 45})
+    assert respuesta.status_code == 200
+    assert cliente.get(f"/api/voluntarios/{creado['id']}").json()["edad"] == 45
+
+
+def test_carga_masiva_invalida_el_cache(db):
+    query_cache.invalidar()
+    cliente = TestClient(main.app)
+    assert _nombres(cliente) == []
+
+    respuesta = cliente.post(
+        "/api/voluntarios/upload",
+        files={"file": ("carga.csv", b"nombre,edad,region\nAna,30,Maule\nBeto,40,Maule\n", "text/csv")}
+    )
+    assert respuesta.status_code == 202
+    assert _esperar_job(cliente, respuesta.json()["job_id"])["estado"] == "completado"
+
+    assert _nombres(cliente) == ["Ana", "Beto"]
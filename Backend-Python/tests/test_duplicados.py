@@ -0,0 +1,73 @@
+"""
+Detección de casi duplicados: misma clave normalizada (exacto), nombres similares
+dentro de la región y consolidación en la carga con DEDUP_INGESTA.
+"""
+import pandas as pd
+
+import data_loader
+from data_loader import _upload_bulk
+from database import Voluntario
+from duplicados import IndiceDuplicados, consolidar_duplicados, normalizar_texto
+
+
+def test_normalizar_texto():
+    assert normalizar_texto("  José   PÉREZ-Soto ") == "jose perez soto"
+
+
+def test_indice_exacto_y_similares_por_region():
+    indice = IndiceDuplicados()
+    indice.agregar_lote([("José Pérez", "Maule", 1), ("Ana Rojas", "Maule", 2), ("Jose Perez", "Biobío", 3)])
+
+    assert indice.exacto("jose perez ", "MAULE").id == 1
+    assert indice.exacto("Jose Perez", "Ñuble") is None
+
+    similares = indice.similares("José Péreza", "Maule")
+    assert [e.id for e, _ in similares] == [1]
+    assert similares[0][1] >= indice.umbral
+    assert indice.similares("Carlos Muñoz", "Maule") == []
+
+
+def test_pares_encuentra_exactos_y_similares():
+    indice = IndiceDuplicados()
+    indice.agregar_lote([
+        ("María González", "Maule", 1),
+        ("Maria Gonzalez", "Maule", 2),
+        ("María Gonzales", "Maule", 3),
+        ("Pedro Soto", "Maule", 4),
+        ("Maria Gonzalez", "Biobío", 5),
+    ])
+
+    pares = {(p.a.id, p.b.id): p.tipo for p in indice.pares()}
+
+    assert pares[(1, 2)] == "exacto"
+    assert pares[(1, 3)] == pares[(2, 3)] == "similar"
+    assert not any(4 in par or 5 in par for par in pares)
+
+
+def test_consolidar_toma_el_nombre_registrado(db):
+    db.add(Voluntario(nombre="José Pérez", edad=30, region="Maule", estado="Activo", score_riesgo_baja=0))
+    db.commit()
+    df = pd.DataFrame({
+        "nombre": ["jose perez", "Ana Rojas", "ANA ROJAS", "José Péreza"],
+        "region": ["Maule"] * 4,
+    })
+
+    consolidado, avisos = consolidar_duplicados(df, db)
+
+    assert list(consolidado["nombre"]) == ["José Pérez", "Ana Rojas", "Ana Rojas", "José Péreza"]
+    assert len(avisos) == 1 and avisos[0].startswith("Posible duplicado: 'José Péreza'")
+
+
+def test_carga_con_dedup_actualiza_en_lugar_de_duplicar(db, monkeypatch):
+    monkeypatch.setattr(data_loader, "DEDUP_INGESTA", True)
+    _upload_bulk(pd.DataFrame({"nombre": ["José Pérez"], "edad": [30], "region": ["Maule"]}), db)
+    db.commit()
+
+    insertados, actualizados, _ = _upload_bulk(
+        pd.DataFrame({"nombre": ["JOSE PEREZ "], "edad": [31], "region": ["Maule"]}), db
+    )
+    db.commit()
+
+    assert (insertados, actualizados) == (0, 1)
+    voluntario = db.query(Voluntario).one()
+    assert (voluntario.nombre, voluntario.edad) == ("José Pérez", 31)
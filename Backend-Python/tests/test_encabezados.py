@@ -0,0 +1,66 @@
+"""
+Resolución de encabezados: variantes normalizadas, alias registrados, similitud
+con COLUMN_FUZZY y conflictos entre encabezados que apuntan a la misma columna.
+"""
+import pytest
+
+import encabezados
+from encabezados import mapeo_columnas, registrar_alias, resolver, resolver_encabezados
+
+
+@pytest.fixture(autouse=True)
+def tabla_aislada(monkeypatch):
+    # Los alias y el modo fuzzy de una prueba no quedan para las demás
+    monkeypatch.setattr(encabezados, "_tabla", dict(encabezados._tabla))
+    resolver_encabezados.cache_clear()
+    yield
+    resolver_encabezados.cache_clear()
+
+
+@pytest.mark.parametrize("encabezado, columna", [
+    ("Área de Estudio", "area_estudio"),
+    ("REGIÓN ", "region"),
+    ("area-estudio", "area_estudio"),
+    ("AreaEstudio", "area_estudio"),
+    ("AREAESTUDIO", "area_estudio"),
+    ("Rango Etario", "rango_etario"),
+])
+def test_variantes_resuelven_exacto(encabezado, columna):
+    assert resolver(encabezado) == (encabezado, columna, "exacto", 1.0)
+
+
+def test_alias_registrado():
+    assert resolver("Comuna de Origen").metodo == "sin_mapeo"
+
+    registrar_alias("Comuna de Origen", "region")
+
+    assert resolver("comuna origen") == ("comuna origen", "region", "alias", 1.0)
+    assert mapeo_columnas(["Comuna de Origen", "nombre"]) == {"Comuna de Origen": "region"}
+
+
+def test_alias_de_columna_desconocida():
+    with pytest.raises(ValueError):
+        registrar_alias("Teléfono", "telefono")
+
+
+def test_fuzzy_solo_con_column_fuzzy(monkeypatch):
+    assert resolver("Programma Asignado").metodo == "sin_mapeo"
+
+    monkeypatch.setattr(encabezados, "COLUMN_FUZZY", True)
+    resolucion = resolver("Programma Asignado")
+
+    assert (resolucion.columna, resolucion.metodo) == ("programa_asignado", "fuzzy")
+    assert encabezados.COLUMN_FUZZY_MIN_SCORE <= resolucion.confianza < 1
+    assert resolver("Teléfono").metodo == "sin_mapeo"
+
+
+def test_conflicto_conserva_el_de_mayor_confianza(monkeypatch):
+    monkeypatch.setattr(encabezados, "COLUMN_FUZZY", True)
+
+    resoluciones = resolver_encabezados(("Programma Asignado", "Programa", "Region"))
+
+    assert [(r.columna, r.metodo) for r in resoluciones] == [
+        ("programma_asignado", "sin_mapeo"),
+        ("programa_asignado", "exacto"),
+        ("region", "exacto"),
+    ]
@@ -0,0 +1,66 @@
+"""
+/api/eventos/score: los eventos se leen en orden (xid, id), la paginación con el
+cursor no repite ni salta eventos y un cursor inválido responde 400. Los triggers
+de PostgreSQL que instala init_db son los de schema.sql.
+"""
+import os
+
+from fastapi.testclient import TestClient
+
+import main
+from database import _EVENTOS_POSTGRES, Voluntario
+
+SCHEMA_SQL = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "schema.sql")
+
+
+def _normalizar(sql: str) -> str:
+    return " ".join(sql.split())
+
+
+def test_triggers_postgres_son_los_de_schema_sql():
+    with open(SCHEMA_SQL, encoding="utf-8") as f:
+        schema = _normalizar(f.read())
+    for sentencia in _EVENTOS_POSTGRES:
+        assert _normalizar(sentencia) + ";" in schema
+
+
+def _leer_todo(cliente: TestClient, cursor: str = None, limit: int = 2):
+    eventos = []
+    while True:
+        params = {"limit": limit, **({"cursor": cursor} if cursor else {})}
+        cuerpo = cliente.get("/api/eventos/score", params=params).json()
+        if not cuerpo["eventos"]:
+            return eventos, cursor
+        eventos.extend(cuerpo["eventos"])
+        cursor = cuerpo["cursor"]
+
+
+def test_cursor_recorre_los_eventos_en_orden(db):
+    cliente = TestClient(main.app)
+    db.add_all(Voluntario(nombre=f"v{i}", edad=30, region="Maule", estado="Activo", score_riesgo_baja=i) for i in range(5))
+    db.commit()
+
+    eventos, cursor = _leer_todo(cliente)
+    assert [e["tipo"] for e in eventos] == ["alta"] * 5
+    posiciones = [tuple(map(int, e["cursor"].split(":"))) for e in eventos]
+    assert posiciones == sorted(set(posiciones))
+
+    voluntario = db.query(Voluntario).filter_by(nombre="v2").one()
+    voluntario.score_riesgo_baja = 90
+    # Sin cambio de score ni flag no hay evento
+    db.query(Voluntario).filter_by(nombre="v3").one().edad = 31
+    db.delete(db.query(Voluntario).filter_by(nombre="v4").one())
+    db.commit()
+
+    nuevos, _ = _leer_todo(cliente, cursor)
+    assert [(e["tipo"], e["voluntario_id"]) for e in nuevos] == [
+        ("cambio", voluntario.id),
+        ("baja", eventos[4]["voluntario_id"]),
+    ]
+    assert (nuevos[0]["score_anterior"], nuevos[0]["score_nuevo"]) == (2, 90)
+
+
+def test_cursor_invalido_responde_400(db):
+    respuesta = TestClient(main.app).get("/api/eventos/score", params={"cursor": "abc"})
+
+    assert respuesta.status_code == 400
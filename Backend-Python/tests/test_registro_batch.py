@@ -0,0 +1,50 @@
+"""
+/api/voluntarios/registro/batch: los elementos inválidos, repetidos en el lote o
+ya registrados se informan por índice y el resto del lote se registra.
+"""
+from fastapi.testclient import TestClient
+
+import main
+from registro_batch import ERROR_DUPLICADO, ERROR_DUPLICADO_LOTE
+
+
+def _voluntario(nombre: str, region: str = "Maule", **extra) -> dict:
+    return {"nombre": nombre, "edad": 30, "region": region, **extra}
+
+
+def test_lote_informa_errores_por_indice(db):
+    cliente = TestClient(main.app)
+    cliente.post("/api/voluntarios/registro", json=_voluntario("Existente"))
+
+    lote = [
+        _voluntario("Ana"),
+        _voluntario("Beto", edad=12),
+        _voluntario("Ana"),
+        _voluntario("Existente"),
+        {"region": "Maule"},
+        _voluntario("Carla", estado="Receso", razon_no_continuar="Falta de tiempo"),
+    ]
+    respuesta = cliente.post("/api/voluntarios/registro/batch", json=lote)
+
+    assert respuesta.status_code == 200
+    cuerpo = respuesta.json()
+    assert (cuerpo["total_recibidos"], cuerpo["total_registrados"]) == (6, 2)
+    assert [v["nombre"] for v in cuerpo["registrados"]] == ["Ana", "Carla"]
+    assert all(v["id"] and v["score_riesgo_baja"] is not None for v in cuerpo["registrados"])
+
+    errores = {e["indice"]: e["errores"] for e in cuerpo["errores"]}
+    assert sorted(errores) == [1, 2, 3, 4]
+    assert errores[1][0]["campo"] == "edad"
+    assert errores[2] == [{"campo": None, "mensaje": ERROR_DUPLICADO_LOTE}]
+    assert errores[3] == [{"campo": None, "mensaje": ERROR_DUPLICADO}]
+    assert {e["campo"] for e in errores[4]} == {"nombre", "edad"}
+
+
+def test_lote_sobre_el_maximo_responde_413(db, monkeypatch):
+    monkeypatch.setattr(main, "REGISTRO_BATCH_MAX", 2)
+
+    respuesta = TestClient(main.app).post(
+        "/api/voluntarios/registro/batch", json=[_voluntario(f"v{i}") for i in range(3)]
+    )
+
+    assert respuesta.status_code == 413
@@ -0,0 +1,102 @@
+"""
+rescore.py: lee las columnas que usa el motor vigente (reglas o modelo de
+retención), sella cada fila con su versión, omite las ya selladas y retoma una
+ejecución interrumpida desde el checkpoint.
+"""
+import os
+
+import pandas as pd
+import pytest
+
+import modelo_retencion
+from database import Voluntario
+from inteligencia_predictiva import puntuar_columnas, version_reglas
+from modelo_retencion import ModeloRetencion, entrenar
+from reglas import MAX_LARGO_VERSION
+from rescore import guardar_checkpoint, leer_checkpoint, rescore
+
+# Modelo mínimo que solo usa edad (no es un campo de las reglas)
+MODELO_EDAD = {
+    "version": "mprueba",
+    "intercepto": -1.0,
+    "numericas": {"edad": {"media": 40.0, "desvio": 10.0, "peso": 1.5}},
+    "categoricas": {},
+    "binarias": {},
+}
+
+
+def test_rescore_con_modelo_lee_sus_campos(db, monkeypatch):
+    modelo = ModeloRetencion(MODELO_EDAD)
+    monkeypatch.setattr(modelo_retencion, "modelo", modelo)
+    db.add(Voluntario(nombre="Ana", edad=70, region="Maule", estado="Activo", score_riesgo_baja=0))
+    db.commit()
+
+    rescore(db, forzar=True)
+
+    voluntario = db.query(Voluntario).one()
+    assert voluntario.score_riesgo_baja == modelo.score({"edad": 70}) > 0
+    assert voluntario.reglas_version == "mprueba"
+
+
+def test_version_del_modelo_cabe_en_reglas_version():
+    df = pd.DataFrame({
+        "edad": [20 + i % 50 for i in range(200)],
+        "fecha_rechazo_count": [i % 4 for i in range(200)],
+        "rango_etario": ["18-29 años"] * 200,
+        "region": ["Maule"] * 200,
+        "area_estudio": ["Salud"] * 200,
+        "programa_asignado": [None] * 200,
+        "tiene_capacitacion": [i % 2 == 0 for i in range(200)],
+        "estado": ["Inactivo" if i % 3 == 0 else "Activo" for i in range(200)],
+    })
+    modelo, _ = entrenar(df)
+    assert len(modelo.version) <= MAX_LARGO_VERSION
+    ModeloRetencion(modelo.artefacto)
+
+
+def _voluntarios(db, n: int):
+    db.add_all(Voluntario(nombre=f"v{i}", edad=20 + i, region="Maule", estado="Receso", score_riesgo_baja=0) for i in range(n))
+    db.commit()
+
+
+def test_rescore_omite_las_filas_con_la_version_vigente(db):
+    _voluntarios(db, 5)
+
+    assert rescore(db, chunk_size=2)["filas_leidas"] == 5
+    assert rescore(db, chunk_size=2)["filas_leidas"] == 0
+    assert rescore(db, chunk_size=2, forzar=True)["filas_leidas"] == 5
+    assert {v.reglas_version for v in db.query(Voluntario)} == {version_reglas()}
+
+
+def test_rescore_interrumpido_continua_desde_el_checkpoint(db, monkeypatch, tmp_path):
+    _voluntarios(db, 5)
+    checkpoint = str(tmp_path / "rescore.json")
+    bloques = []
+
+    def falla_en_el_segundo_bloque(df, motor):
+        bloques.append(list(df["id"]))
+        if len(bloques) == 2:
+            raise RuntimeError("conexión perdida")
+        return puntuar_columnas(df, motor)
+
+    monkeypatch.setattr("rescore.puntuar_columnas", falla_en_el_segundo_bloque)
+    with pytest.raises(RuntimeError):
+        rescore(db, chunk_size=2, checkpoint_path=checkpoint)
+    db.rollback()
+    assert leer_checkpoint(checkpoint, version_reglas()) == bloques[0][-1]
+
+    monkeypatch.setattr("rescore.puntuar_columnas", puntuar_columnas)
+    resultado = rescore(db, chunk_size=2, checkpoint_path=checkpoint, forzar=True)
+
+    # Con forzar se releerían todas: el checkpoint hace saltar el primer bloque
+    assert resultado["filas_leidas"] == 3
+    assert not os.path.exists(checkpoint)
+
+
+def test_checkpoint_de_otra_version_se_ignora(tmp_path):
+    checkpoint = str(tmp_path / "rescore.json")
+    guardar_checkpoint(checkpoint, "v1", 42)
+
+    assert leer_checkpoint(checkpoint, "v1") == 42
+    assert leer_checkpoint(checkpoint, "v2") == 0
+    assert leer_checkpoint(checkpoint, "v1", region="Maule") == 0
@@ -0,0 +1,56 @@
+"""
+voluntarios_resumen: los triggers que instala init_db lo mantienen igual a
+agrupar voluntarios, y los de PostgreSQL son los mismos de schema.sql.
+"""
+import os
+
+import pandas as pd
+from sqlalchemy import select
+
+from data_loader import _upload_bulk
+from database import _RESUMEN_POSTGRES, Voluntario, VoluntariosResumen, engine, select_resumen
+
+SCHEMA_SQL = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "schema.sql")
+
+
+def _normalizar(sql: str) -> str:
+    return " ".join(sql.split())
+
+
+def _resumen_igual_a_voluntarios():
+    with engine.connect() as conn:
+        calculado = sorted(tuple(r) for r in conn.execute(select_resumen()))
+        mantenido = sorted(tuple(r) for r in conn.execute(select(VoluntariosResumen.__table__)) if r.total)
+    return calculado == mantenido
+
+
+def test_triggers_postgres_son_los_de_schema_sql():
+    with open(SCHEMA_SQL, encoding="utf-8") as f:
+        schema = _normalizar(f.read())
+    for sentencia in _RESUMEN_POSTGRES:
+        assert _normalizar(sentencia) + ";" in schema
+
+
+def test_resumen_sigue_altas_cambios_y_bajas(db):
+    for i in range(30):
+        db.add(Voluntario(
+            nombre=f"v{i}", edad=20 + i, region=f"R{i % 3}", estado="Activo",
+            area_estudio=None if i % 4 else "Salud", score_riesgo_baja=(i * 7) % 101, flag_brecha_cap=i % 2 == 0
+        ))
+    db.commit()
+    voluntario = db.query(Voluntario).filter_by(nombre="v1").one()
+    voluntario.region, voluntario.score_riesgo_baja = "R9", 100
+    db.delete(db.query(Voluntario).filter_by(nombre="v5").one())
+    db.commit()
+
+    assert _resumen_igual_a_voluntarios()
+
+
+def test_resumen_sigue_el_upsert_masivo(db):
+    df = pd.DataFrame({"nombre": ["a", "b", "c"], "edad": [20, 35, 50], "region": ["Maule"] * 3})
+    _upload_bulk(df, db)
+    _upload_bulk(df.assign(edad=[21, 36, 51]), db)
+    db.commit()
+
+    assert db.query(Voluntario).count() == 3
+    assert _resumen_igual_a_voluntarios()
@@ -0,0 +1,41 @@
+"""
+/api/rpa/accion_urgente: la consulta directa conserva su respuesta y el trigger de
+la cola que instala init_db es el de schema.sql.
+"""
+import os
+
+from fastapi.testclient import TestClient
+
+import main
+from cache import query_cache
+from database import _RPA_POSTGRES, Voluntario
+from rpa_cola import COLUMNAS_RPA
+
+SCHEMA_SQL = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "schema.sql")
+
+
+def _normalizar(sql: str) -> str:
+    return " ".join(sql.split())
+
+
+def test_trigger_postgres_es_el_de_schema_sql():
+    with open(SCHEMA_SQL, encoding="utf-8") as f:
+        schema = _normalizar(f.read())
+    for sentencia in _RPA_POSTGRES:
+        assert _normalizar(sentencia) + ";" in schema
+
+
+def test_consulta_directa_retorna_los_voluntarios_sin_cambios(db, monkeypatch):
+    monkeypatch.setattr(main, "RPA_COLA", False)
+    query_cache.invalidar()
+    db.add_all([
+        Voluntario(nombre="Ana", edad=22, region="Maule", estado="Receso", score_riesgo_baja=90),
+        Voluntario(nombre="Beto", edad=40, region="Maule", estado="Activo", score_riesgo_baja=10),
+    ])
+    db.commit()
+
+    respuesta = TestClient(main.app).get("/api/rpa/accion_urgente")
+
+    assert respuesta.status_code == 200
+    assert [v["nombre"] for v in respuesta.json()] == ["Ana"]
+    assert set(respuesta.json()[0]) == {c.key for c in COLUMNAS_RPA}
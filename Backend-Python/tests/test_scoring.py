@@ -0,0 +1,82 @@
+"""
+Equivalencia del scoring por columnas (calcular_*_batch) con el scoring por dict,
+con registros aleatorios que combinan valores con mayúsculas, espacios, vacíos,
+None y claves ausentes.
+"""
+import random
+
+import pandas as pd
+import pytest
+
+from inteligencia_predictiva import (
+    calcular_flag_brecha,
+    calcular_flag_brecha_batch,
+    calcular_score_riesgo,
+    calcular_score_riesgo_batch,
+)
+
+VALORES = {
+    "razon_no_continuar": [None, "", "Falta de Tiempo", "falta de TIEMPO", "tiempo", "Cambio de ciudad", "Tiempos"],
+    "rango_etario": [None, "", "18-29 años", "30-39 años", "40-49 años", "60+ años", "18-29"],
+    "estado": [None, "Activo", "Receso", "Sin Asignación", "Inactivo", "receso"],
+    "fecha_rechazo_count": [0, 1, 2, 3, 5],
+    "programa_asignado": [None, "", "   ", "OTL", "Abre", "Servicios"],
+    "area_estudio": [None, "", "Salud", "SALUD", "salud ", "Educación"],
+    "tiene_capacitacion": [None, True, False, 0, 1],
+}
+
+CASOS = 500
+SEMILLAS = range(5)
+
+
+def generar_registros(n: int, seed: int, con_ausentes: bool = True):
+    rnd = random.Random(seed)
+    registros = []
+    for _ in range(n):
+        registro = {}
+        for columna, valores in VALORES.items():
+            if con_ausentes and rnd.random() < 0.05:
+                continue
+            registro[columna] = rnd.choice(valores)
+        registros.append(registro)
+    return registros
+
+
+@pytest.mark.parametrize("seed", SEMILLAS)
+def test_batch_sobre_dataframe_equivale_a_por_dict(seed):
+    # En un DataFrame una clave ausente equivale a la columna en None: sin ausentes
+    registros = generar_registros(CASOS, seed, con_ausentes=False)
+    df = pd.DataFrame(registros)
+
+    assert list(calcular_score_riesgo_batch(df)) == [calcular_score_riesgo(r) for r in registros]
+    assert list(calcular_flag_brecha_batch(df)) == [calcular_flag_brecha(r) for r in registros]
+
+
+@pytest.mark.parametrize("seed", SEMILLAS)
+def test_batch_con_columnas_ausentes_equivale_a_por_dict(seed):
+    # Cada registro como columnas sueltas: las claves ausentes faltan también en el batch
+    for registro in generar_registros(CASOS, seed):
+        columnas = {k: [v] for k, v in registro.items()}
+        if not columnas:
+            continue
+        assert calcular_score_riesgo_batch(columnas)[0] == calcular_score_riesgo(registro), registro
+        assert calcular_flag_brecha_batch(columnas)[0] == calcular_flag_brecha(registro), registro
+
+
+def test_reglas_no_ejecutan_el_contenido_del_archivo(tmp_path):
+    from reglas import MotorReglas
+
+    marca = tmp_path / "ejecutado"
+    codigo = f"__import__('pathlib').Path({str(marca)!r}).touch()"
+    motor = MotorReglas({
+        "version": "prueba",
+        "reglas": [
+            {"nombre": "valor", "campo": "estado", "operador": "igual", "valor": f"' or {codigo} or '", "puntos": 10},
+            {"nombre": "campo", "campo": f"x') or {codigo} or ('", "operador": "vacio", "puntos": 5},
+            {"nombre": "numero", "campo": "edad", "operador": "mayor", "valor": "1e3", "puntos": 1},
+        ],
+    })
+
+    assert motor.score({"estado": "Activo", "edad": 30}) == 5
+    assert list(motor.score_batch(pd.DataFrame({"estado": ["Activo"], "edad": [30]}))) == [5]
+    assert not marca.exists()
@@ -0,0 +1,44 @@
+"""
+Jobs de carga: el archivo temporal no queda en disco si el job no se crea y un
+job que no se pudo encolar no queda registrado como pendiente.
+"""
+import os
+
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+import upload_jobs
+
+
+def test_upload_elimina_el_temporal_si_no_se_crea_el_job(monkeypatch):
+    rutas = []
+
+    def crear_job_fallido(tmp_path, *args, **kwargs):
+        rutas.append(tmp_path)
+        raise RuntimeError("pool cerrado")
+
+    monkeypatch.setattr(main, "crear_job", crear_job_fallido)
+
+    with pytest.raises(RuntimeError):
+        TestClient(main.app).post(
+            "/api/voluntarios/upload",
+            files={"file": ("carga.csv", b"nombre,region\nAna,Maule\n", "text/csv")}
+        )
+
+    assert len(rutas) == 1
+    assert not os.path.exists(rutas[0])
+
+
+def test_crear_job_no_registra_un_job_que_no_se_encolo(monkeypatch, tmp_path):
+    class PoolCerrado:
+        def submit(self, *args):
+            raise RuntimeError("cannot schedule new futures after shutdown")
+
+    monkeypatch.setattr(upload_jobs, "_executor", PoolCerrado())
+    antes = dict(upload_jobs._jobs)
+
+    with pytest.raises(RuntimeError):
+        upload_jobs.crear_job(str(tmp_path / "carga.csv"), ".csv", "carga.csv")
+
+    assert dict(upload_jobs._jobs) == antes
@@ -0,0 +1,49 @@
+"""
+Carga masiva (upsert_records): cuenta inserciones y actualizaciones por
+(nombre, region) y, si una clave se repite, prevalece la última fila.
+"""
+from data_loader import upsert_records
+from database import Voluntario
+
+
+def _registro(nombre: str, region: str, edad: int, **extra) -> dict:
+    registro = {
+        "nombre": nombre, "edad": edad, "rango_etario": None, "region": region,
+        "area_estudio": None, "estado": "Activo", "razon_no_continuar": None,
+        "tiene_capacitacion": False, "programa_asignado": None, "fecha_rechazo_count": 0,
+        "score_riesgo_baja": 0, "flag_brecha_cap": False,
+    }
+    registro.update(extra)
+    return registro
+
+
+def test_upsert_cuenta_inserciones_y_actualizaciones(db):
+    insertados, actualizados = upsert_records(
+        [_registro("Ana", "Maule", 20), _registro("Beto", "Maule", 30), _registro("Ana", "Biobío", 40)], db
+    )
+    db.commit()
+    assert (insertados, actualizados) == (3, 0)
+
+    insertados, actualizados = upsert_records(
+        [_registro("Ana", "Maule", 21), _registro("Carla", "Maule", 50)], db
+    )
+    db.commit()
+    assert (insertados, actualizados) == (1, 1)
+    assert db.query(Voluntario).count() == 4
+    assert db.query(Voluntario).filter_by(nombre="Ana", region="Maule").one().edad == 21
+    assert db.query(Voluntario).filter_by(nombre="Ana", region="Biobío").one().edad == 40
+
+
+def test_upsert_clave_repetida_prevalece_la_ultima_fila(db):
+    registros = [
+        _registro("Ana", "Maule", 20, estado="Activo"),
+        _registro("Ana", "Maule", 25, estado="Receso"),
+        _registro("Ana", "Maule", 30, estado="Inactivo"),
+    ]
+    # Bloques de 2: la clave se repite dentro del bloque y entre bloques
+    insertados, actualizados = upsert_records(registros, db, chunk_size=2)
+    db.commit()
+
+    assert (insertados, actualizados) == (1, 2)
+    voluntario = db.query(Voluntario).one()
+    assert (voluntario.edad, voluntario.estado) == (30, "Inactivo")
@@ -0,0 +1,162 @@
+"""
+Ejecución de cargas masivas como jobs en segundo plano.
+
+Cada carga se ejecuta en un pool de threads fuera del event loop de FastAPI,
+con su propia sesión de BD. El estado y el avance de cada job quedan en memoria
+del proceso para consultarlos mientras corre.
+
+El stack de carga (data_loader, carga_multiple: pandas, openpyxl, pyarrow) se
+importa en el primer job, no al arrancar el servicio.
+"""
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from cache import query_cache
+from database import SessionLocal
+
+UPLOAD_WORKERS = int(os.getenv("UPLOAD_WORKERS", 2))
+# Jobs terminados que se conservan para consulta (se descartan los más antiguos)
+UPLOAD_JOBS_MAX = int(os.getenv("UPLOAD_JOBS_MAX", 100))
+
+_executor = ThreadPoolExecutor(max_workers=UPLOAD_WORKERS, thread_name_prefix="upload")
+_jobs: "OrderedDict[str, UploadJob]" = OrderedDict()
+_jobs_lock = threading.Lock()
+
+
+class UploadJob:
+    """Estado de una carga masiva. Los contadores se actualizan desde el thread del job."""
+
+    def __init__(self, filename: str):
+        self.job_id = uuid.uuid4().hex
+        self.filename = filename
+        self.estado = "pendiente"
+        self.records_processed = 0
+        self.records_inserted = 0
+        self.records_updated = 0
+        self.errors: List[str] = []
+        # Reporte por archivo y hoja de las cargas de ZIP o varias hojas
+        self.archivos: List[Dict] = []
+        self.created_at = datetime.utcnow()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+        self._inicio: Optional[float] = None
+        self._fin: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def actualizar(self, records_processed: int, records_inserted: int, records_updated: int, errors: List[str]):
+        with self._lock:
+            self.records_processed = records_processed
+            self.records_inserted = records_inserted
+            self.records_updated = records_updated
+            self.errors = list(errors)
+
+    def to_dict(self) -> Dict:
+        with self._lock:
+            segundos = None
+            if self._inicio is not None:
+                segundos = (self._fin or time.perf_counter()) - self._inicio
+            return {
+                "job_id": self.job_id,
+                "filename": self.filename,
+                "estado": self.estado,
+                "records_processed": self.records_processed,
+                "records_inserted": self.records_inserted,
+                "records_updated": self.records_updated,
+                "errors": list(self.errors),
+                "archivos": list(self.archivos),
+                "filas_por_segundo": round(self.records_processed / segundos, 1) if segundos else None,
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+            }
+
+
+def _ejecutar(job: UploadJob, tmp_path: str, file_ext: str, bulk: bool, streaming: bool, todas_las_hojas: bool):
+    with job._lock:
+        job.estado = "en_proceso"
+        job.started_at = datetime.utcnow()
+        job._inicio = time.perf_counter()
+
+    db = SessionLocal()
+    try:
+        from carga_multiple import upload_multiple
+        from data_loader import ERROR_GENERAL, upload_data
+
+        if file_ext == ".zip" or todas_las_hojas:
+            *resultado, archivos = upload_multiple(
+                tmp_path,
+                db=db,
+                nombre=job.filename,
+                todas_las_hojas=todas_las_hojas or file_ext == ".zip",
+                progreso=job.actualizar
+            )
+            with job._lock:
+                job.archivos = archivos
+        else:
+            resultado = upload_data(
+                tmp_path,
+                file_type=file_ext,
+                db=db,
+                bulk=bulk,
+                streaming=streaming,
+                progreso=job.actualizar
+            )
+        job.actualizar(*resultado)
+        # Los loaders informan la falla completa (con rollback) como error, sin excepción
+        if any(e.startswith(ERROR_GENERAL) for e in job.errors):
+            estado = "error"
+        else:
+            estado = "completado"
+            query_cache.invalidar()
+    except Exception as e:
+        job.actualizar(job.records_processed, job.records_inserted, job.records_updated, job.errors + [f"Error al procesar archivo: {str(e)}"])
+        estado = "error"
+    finally:
+        db.close()
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+    with job._lock:
+        job.estado = estado
+        job.finished_at = datetime.utcnow()
+        job._fin = time.perf_counter()
+
+
+def crear_job(
+    tmp_path: str,
+    file_ext: str,
+    filename: str,
+    bulk: bool = False,
+    streaming: bool = False,
+    todas_las_hojas: bool = False
+) -> UploadJob:
+    """
+    Registra un job de carga y lo encola en el pool. El job elimina tmp_path al terminar.
+    Los ZIP y los libros con todas_las_hojas se cargan con carga_multiple.
+    """
+    job = UploadJob(filename)
+    with _jobs_lock:
+        _jobs[job.job_id] = job
+        terminados = [j for j in _jobs.values() if j.finished_at is not None]
+        for viejo in terminados[:max(0, len(terminados) - UPLOAD_JOBS_MAX)]:
+            del _jobs[viejo.job_id]
+
+    try:
+        _executor.submit(_ejecutar, job, tmp_path, file_ext, bulk, streaming, todas_las_hojas)
+    except Exception:
+        # No se encoló (p. ej. el pool ya se cerró): no queda como job pendiente
+        with _jobs_lock:
+            _jobs.pop(job.job_id, None)
+        raise
+    return job
+
+
+def obtener_job(job_id: str) -> Optional[UploadJob]:
+    with _jobs_lock:
+        return _jobs.get(job_id)